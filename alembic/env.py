@@ -1,3 +1,4 @@
+import logging
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -10,6 +11,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from app.models import Base
 from app.config import settings
+from app.core import tenancy
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -19,6 +21,7 @@ config = context.config
 # This line sets up loggers basically.
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
+logger = logging.getLogger("alembic.env")
 
 # Establecer la URL de la base de datos desde settings
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
@@ -35,6 +38,27 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def destinos() -> list:
+    """
+    (colegio, url, esquema) a migrar. Sin TENANCY_ENABLED, solo DATABASE_URL; con él,
+    cada colegio de TENANTS (su esquema en la base principal, con su propia tabla
+    alembic_version, o su base propia). `alembic -x colegio=norte upgrade head`
+    migra uno solo.
+    """
+    url_principal = config.get_main_option("sqlalchemy.url")
+    if not settings.TENANCY_ENABLED:
+        return [(None, url_principal, None)]
+    elegido = context.get_x_argument(as_dictionary=True).get("colegio")
+    colegios = tenancy.colegios()
+    if elegido is not None and elegido not in colegios:
+        raise SystemExit(f"Colegio desconocido: {elegido}")
+    return [
+        (codigo, destino["url"] or url_principal, destino["esquema"])
+        for codigo, destino in colegios.items()
+        if elegido is None or codigo == elegido
+    ]
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -47,16 +71,20 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = config.get_main_option("sqlalchemy.url")
-    context.configure(
-        url=url,
-        target_metadata=target_metadata,
-        literal_binds=True,
-        dialect_opts={"paramstyle": "named"},
-    )
+    for codigo, url, esquema in destinos():
+        context.configure(
+            url=url,
+            target_metadata=target_metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+            version_table_schema=esquema,
+        )
 
-    with context.begin_transaction():
-        context.run_migrations()
+        with context.begin_transaction():
+            if esquema:
+                context.execute(f'CREATE SCHEMA IF NOT EXISTS "{esquema}"')
+                context.execute(f'SET search_path TO "{esquema}", public')
+            context.run_migrations()
 
 
 def run_migrations_online() -> None:
@@ -66,19 +94,28 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
+    for codigo, url, esquema in destinos():
+        if codigo is not None:
+            logger.info("Migrando colegio %s", codigo)
+        connectable = engine_from_config(
+            {**config.get_section(config.config_ini_section, {}), "sqlalchemy.url": url},
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        with connectable.connect() as connection:
+            if esquema:
+                # Las migraciones usan nombres sin esquema: search_path las lleva al del colegio
+                connection.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{esquema}"')
+                connection.exec_driver_sql(f'SET search_path TO "{esquema}", public')
+                connection.commit()
+            context.configure(
+                connection=connection, target_metadata=target_metadata,
+                version_table_schema=esquema,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
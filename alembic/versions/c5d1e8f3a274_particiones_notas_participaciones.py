@@ -0,0 +1,75 @@
+"""particiones notas participaciones
+
+Revision ID: c5d1e8f3a274
+Revises: 82ff0b1ffd62
+Create Date: 2026-10-19 15:12:08.731204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d1e8f3a274'
+down_revision: Union[str, None] = '82ff0b1ffd62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Solo PostgreSQL soporta particionado declarativo; en otros motores las tablas quedan igual.
+TABLAS = ('notas', 'participaciones')
+
+
+def _es_postgres() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _indices_y_claves(tabla: str) -> None:
+    op.create_foreign_key(f'{tabla}_curso_materia_id_fkey', tabla, 'cursos_materia', ['curso_materia_id'], ['id'])
+    op.create_foreign_key(f'{tabla}_estudiante_id_fkey', tabla, 'estudiantes', ['estudiante_id'], ['id'])
+    op.create_index(op.f(f'ix_{tabla}_curso_materia_id'), tabla, ['curso_materia_id'], unique=False)
+    op.create_index(op.f(f'ix_{tabla}_estudiante_id'), tabla, ['estudiante_id'], unique=False)
+
+
+def upgrade() -> None:
+    if not _es_postgres():
+        return
+    conexion = op.get_bind()
+    for tabla in TABLAS:
+        anio_min, anio_max = conexion.execute(sa.text(
+            f"SELECT EXTRACT(YEAR FROM MIN(fecha))::int, EXTRACT(YEAR FROM MAX(fecha))::int FROM {tabla}"
+        )).first()
+        actual = date.today().year
+        anios = range(min(anio_min or actual, actual), max(anio_max or actual, actual + 1) + 1)
+
+        op.execute(f"ALTER TABLE {tabla} RENAME TO {tabla}_sin_particion")
+        # La clave de partición debe formar parte de la clave primaria
+        op.execute(
+            f"CREATE TABLE {tabla} (LIKE {tabla}_sin_particion INCLUDING DEFAULTS, "
+            f"PRIMARY KEY (id, fecha)) PARTITION BY RANGE (fecha)"
+        )
+        for anio in anios:
+            op.execute(
+                f"CREATE TABLE {tabla}_{anio} PARTITION OF {tabla} "
+                f"FOR VALUES FROM ('{anio}-01-01') TO ('{anio + 1}-01-01')"
+            )
+        op.execute(f"CREATE TABLE {tabla}_default PARTITION OF {tabla} DEFAULT")
+        op.execute(f"INSERT INTO {tabla} SELECT * FROM {tabla}_sin_particion")
+        op.execute(f"ALTER SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id")
+        op.execute(f"DROP TABLE {tabla}_sin_particion")
+        _indices_y_claves(tabla)
+
+
+def downgrade() -> None:
+    if not _es_postgres():
+        return
+    for tabla in TABLAS:
+        op.execute(f"ALTER TABLE {tabla} RENAME TO {tabla}_particionada")
+        op.execute(f"CREATE TABLE {tabla} (LIKE {tabla}_particionada INCLUDING DEFAULTS, PRIMARY KEY (id))")
+        op.execute(f"INSERT INTO {tabla} SELECT * FROM {tabla}_particionada")
+        op.execute(f"ALTER SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id")
+        # Borra la tabla padre con sus particiones; las ya desacopladas quedan como tablas sueltas
+        op.execute(f"DROP TABLE {tabla}_particionada")
+        _indices_y_claves(tabla)
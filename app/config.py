@@ -10,6 +10,106 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # Réplicas de solo lectura (URLs separadas por comas). Vacío = todo va al primario.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_CHECK_SECONDS: int = 30
+    # Tras escribir, las lecturas del mismo usuario van al primario durante esta ventana
+    # (el registro es por proceso: con varios workers requiere sesiones pegajosas).
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Varios colegios por despliegue: "codigo=esquema" o "codigo=url" separados por comas.
+    # Cada colegio tiene su propio pool (tamaño, desborde y espera en segundos).
+    TENANCY_ENABLED: bool = False
+    TENANTS: str = ""
+    TENANT_DEFAULT: str = ""
+    TENANT_POOL_SIZE: int = 5
+    TENANT_MAX_OVERFLOW: int = 5
+    TENANT_POOL_TIMEOUT: int = 10
+
+    # Máximo de ids aceptados por los endpoints /batch
+    BATCH_MAX_IDS: int = 100
+    # Validación por lotes (POST .../validar-lote): filas máximas por petición
+    VALIDACION_MAX_FILAS: int = 50000
+
+    # Compresión de respuestas (gzip/brotli)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    # Cuerpos desde este tamaño se comprimen en el threadpool, fuera del event loop
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 64 * 1024
+    COMPRESSION_CACHE_ENTRIES: int = 256
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Conexiones que cada worker abre al arrancar (0 = sin precalentar el pool)
+    WARMUP_POOL_CONNECTIONS: int = 2
+
+    # Caché de entidades por proceso y bus de invalidación entre workers.
+    # Backend del bus: "auto" (postgres si la BD lo es, si no "file"), "postgres", "file" o "none".
+    ENTITY_CACHE_ENABLED: bool = False
+    ENTITY_CACHE_TTL_SECONDS: int = 300
+    ENTITY_CACHE_MAX_ENTRIES: int = 10000
+    CACHE_INVALIDATION_BACKEND: str = "auto"
+    CACHE_INVALIDATION_CHANNEL: str = "aula_digital_invalidation"
+    CACHE_INVALIDATION_FILE: str = "/tmp/aula_digital_invalidation.log"
+    CACHE_INVALIDATION_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+
+    # Rosters (listas de alumnos) por curso-periodo en memoria, LRU
+    ROSTER_CACHE_MAX_ENTRIES: int = 2000
+
+    # Eventos en vivo (SSE): eventos en cola por conexión, intervalo de keep-alive y
+    # caché curso_materia -> curso_periodo
+    SSE_QUEUE_SIZE: int = 100
+    SSE_KEEPALIVE_SECONDS: int = 15
+    SSE_CURSO_PERIODO_CACHE_MAX_ENTRIES: int = 10000
+
+    # Feed /sync para clientes offline: máximo de cambios por página
+    SYNC_MAX_PAGE_SIZE: int = 2000
+
+    # Boletines generados (archivos direccionados por su SHA-256)
+    BOLETINES_DIR: str = "storage/boletines"
+    BOLETINES_HILOS: int = 4
+
+    # Consultas lentas: umbral, EXPLAIN en segundo plano (ANALYZE solo para SELECT) y huellas en memoria
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 300
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500
+
+    # Perfilado bajo demanda (cabecera X-Profile con JWT de admin o muestreo); apagado no se instala
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "storage/perfiles"
+    PROFILING_MAX_PROFILES: int = 50
+    PROFILING_MAX_SQL: int = 500
+    PROFILING_TOP_FUNCTIONS: int = 40
+
+    # Archivo frío de periodos cerrados (Arrow IPC; compresión zstd, lz4 o none)
+    ARCHIVO_DIR: str = "storage/archivo"
+    ARCHIVO_COMPRESSION: str = "zstd"
+    ARCHIVO_TABLAS_ABIERTAS: int = 16
+
+    # Cola de trabajos: hilos por tipo ("tipo=n,...,default=n"), reintentos y sondeo
+    JOBS_WORKER_ENABLED: bool = True
+    JOBS_CONCURRENCY: str = "boletines=2,default=1"
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_BACKOFF_BASE_SECONDS: int = 10
+    JOBS_BACKOFF_MAX_SECONDS: int = 600
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_LOCK_TIMEOUT_SECONDS: int = 3600
+    JOBS_LOCK_CHECK_INTERVAL_SECONDS: int = 60
+
+    # Auditoría: "async" (cola + INSERT por lotes), "sync" (escritura inmediata) u "off"
+    AUDIT_MODE: str = "async"
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    @property
+    def replica_urls(self) -> list:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,196 @@
+# app/core/consultas_lentas.py
+"""
+Registro de consultas lentas.
+
+database.py instala `instalar(engine)` en el primario y en cada réplica: los eventos
+del engine miden cada sentencia y, si supera SLOW_QUERY_THRESHOLD_MS, la registran
+en el log (SQL normalizado, huella de los parámetros, ruta de la petición) y en un
+agregado por huella de SQL (cantidad, total y máximo) que expone
+GET /api/v1/consultas-lentas. El agregado es por proceso.
+
+El plan (EXPLAIN, o EXPLAIN ANALYZE solo para SELECT si SLOW_QUERY_EXPLAIN_ANALYZE)
+se obtiene en un hilo aparte con una conexión propia del pool, como mucho una vez
+por huella cada SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, así no alarga la petición ni
+toca su transacción.
+"""
+import hashlib
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from sqlalchemy import event
+from ..config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# scope ASGI de la petición en curso (lo fija RutaActualMiddleware)
+scope_actual = ContextVar("scope_actual", default=None)
+
+_LITERALES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%\(\w+\)s|(?<![:\w]):\w+|\$\d+|%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),  # listas IN de largo variable
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalizar(sql: str) -> str:
+    for patron, reemplazo in _LITERALES:
+        sql = patron.sub(reemplazo, sql)
+    return sql.strip()
+
+
+def huella(texto: str) -> str:
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def huella_parametros(parametros) -> str:
+    """Huella de la forma de los parámetros (nombres y tipos, no valores)."""
+    if isinstance(parametros, dict):
+        forma = sorted((clave, type(valor).__name__) for clave, valor in parametros.items())
+    elif isinstance(parametros, (list, tuple)):
+        forma = [type(valor).__name__ for valor in parametros]
+    else:
+        forma = type(parametros).__name__
+    return huella(repr(forma))
+
+
+def ruta_actual() -> str:
+    scope = scope_actual.get()
+    if scope is None:
+        return None
+    ruta = scope.get("route")
+    return f"{scope.get('method')} {getattr(ruta, 'path', None) or scope.get('path')}"
+
+
+class RegistroConsultasLentas:
+    def __init__(self, max_huellas: int):
+        self.max_huellas = max_huellas
+        self._agregado = OrderedDict()
+        self._lock = threading.Lock()
+        self._explicar = queue.Queue(maxsize=100)
+        self._hilo = None
+
+    def registrar(self, engine, sql: str, parametros, duracion_ms: float, executemany: bool) -> None:
+        normalizado = normalizar(sql)
+        clave = huella(normalizado)
+        ruta = ruta_actual()
+        ahora = time.monotonic()
+        with self._lock:
+            fila = self._agregado.pop(clave, None)
+            if fila is None:
+                fila = {"huella": clave, "sql": normalizado, "cantidad": 0, "total_ms": 0.0, "max_ms": 0.0,
+                        "rutas": {}, "plan": None, "plan_en": None, "_plan_pedido": None}
+            fila["cantidad"] += 1
+            fila["total_ms"] += duracion_ms
+            fila["max_ms"] = max(fila["max_ms"], duracion_ms)
+            fila["ultima_vez"] = datetime.utcnow()
+            if ruta:
+                fila["rutas"][ruta] = fila["rutas"].get(ruta, 0) + 1
+            self._agregado[clave] = fila
+            while len(self._agregado) > self.max_huellas:
+                self._agregado.popitem(last=False)
+            pedir_plan = (
+                settings.SLOW_QUERY_EXPLAIN and not executemany
+                and (fila["_plan_pedido"] is None
+                     or ahora - fila["_plan_pedido"] > settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS)
+            )
+            if pedir_plan:
+                fila["_plan_pedido"] = ahora
+
+        logger.warning("Consulta lenta %.1f ms [%s] ruta=%s params=%s: %s", duracion_ms, clave, ruta,
+                       huella_parametros(parametros), normalizado[:500])
+        if pedir_plan:
+            self._encolar_plan(engine, clave, sql, parametros)
+
+    def _encolar_plan(self, engine, clave, sql, parametros) -> None:
+        if self._hilo is None:
+            with self._lock:
+                if self._hilo is None:
+                    self._hilo = threading.Thread(target=self._explicar_en_fondo, name="explain-consultas-lentas",
+                                                  daemon=True)
+                    self._hilo.start()
+        try:
+            self._explicar.put_nowait((engine, clave, sql, parametros))
+        except queue.Full:
+            pass
+
+    def _explicar_en_fondo(self) -> None:
+        while True:
+            engine, clave, sql, parametros = self._explicar.get()
+            try:
+                plan = explicar(engine, sql, parametros)
+            except Exception as e:
+                plan = f"EXPLAIN falló: {e}"
+            with self._lock:
+                if clave in self._agregado:
+                    self._agregado[clave]["plan"] = plan
+                    self._agregado[clave]["plan_en"] = datetime.utcnow()
+
+    def estadisticas(self, limite: int) -> list:
+        with self._lock:
+            filas = [
+                {clave: valor for clave, valor in fila.items() if not clave.startswith("_")}
+                | {"promedio_ms": fila["total_ms"] / fila["cantidad"], "rutas": dict(fila["rutas"])}
+                for fila in self._agregado.values()
+            ]
+        filas.sort(key=lambda fila: fila["total_ms"], reverse=True)
+        return filas[:limite]
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._agregado.clear()
+
+
+def explicar(engine, sql: str, parametros) -> str:
+    """Plan de la sentencia con una conexión DBAPI propia (sin pasar por los eventos del engine)."""
+    postgres = engine.dialect.name == "postgresql"
+    es_select = sql.lstrip().lower().startswith(("select", "with"))
+    if postgres:
+        prefijo = "EXPLAIN (ANALYZE, BUFFERS) " if settings.SLOW_QUERY_EXPLAIN_ANALYZE and es_select else "EXPLAIN "
+    elif engine.dialect.name == "sqlite":
+        prefijo = "EXPLAIN QUERY PLAN "
+    else:
+        prefijo = "EXPLAIN "
+    conexion = engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        try:
+            cursor.execute(prefijo + sql, parametros)
+            filas = cursor.fetchall()
+        finally:
+            cursor.close()
+        conexion.rollback()
+    finally:
+        conexion.close()
+    if postgres:
+        return "\n".join(fila[0] for fila in filas)
+    return "\n".join(" | ".join(str(valor) for valor in fila) for fila in filas)
+
+
+registro = RegistroConsultasLentas(settings.SLOW_QUERY_MAX_FINGERPRINTS)
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info["consulta_inicio"] = time.perf_counter()
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info.pop("consulta_inicio", None)
+    if inicio is None:
+        return
+    duracion_ms = (time.perf_counter() - inicio) * 1000
+    if duracion_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        registro.registrar(conn.engine, statement, parameters, duracion_ms, executemany)
+
+
+def instalar(engine) -> None:
+    if not settings.SLOW_QUERY_LOG_ENABLED or event.contains(engine, "before_cursor_execute", _antes):
+        return
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
@@ -0,0 +1,72 @@
+# app/core/warmup.py
+import logging
+import time
+from sqlalchemy import text
+from ..config import settings
+from ..database import engine, replicas, tenants
+from ..services.particiones import asegurar_anio_actual
+from .security import create_access_token, get_password_hash, verify_token
+from .tenancy import codigos
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _abrir_conexiones(engine_objetivo, cantidad: int) -> int:
+    """Abre `cantidad` conexiones a la vez y las devuelve al pool, que las conserva abiertas."""
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexion = engine_objetivo.connect()
+            conexion.execute(text("SELECT 1"))
+            conexiones.append(conexion)
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+    return len(conexiones)
+
+
+def warm_up(app) -> dict:
+    """
+    Paga al arrancar los costos que si no recaerían en las primeras peticiones:
+    conexiones del pool, backend de bcrypt, firma/verificación JWT, esquema OpenAPI
+    y, en PostgreSQL, las particiones del año en curso y el siguiente. Con varios
+    colegios abre el pool y crea las particiones de cada uno.
+    Devuelve un informe con la duración de cada paso en milisegundos.
+    """
+    inicio_total = time.perf_counter()
+    pasos = {}
+
+    def medir(nombre, funcion):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcion()
+            pasos[nombre] = {"ms": round((time.perf_counter() - inicio) * 1000, 1), "ok": True}
+            if resultado is not None:
+                pasos[nombre]["resultado"] = resultado
+        except Exception as e:
+            pasos[nombre] = {"ms": round((time.perf_counter() - inicio) * 1000, 1), "ok": False, "error": str(e)}
+            logger.warning("Warm-up '%s' falló: %s", nombre, e)
+
+    if settings.TENANCY_ENABLED:
+        for codigo in codigos():
+            medir(f"pool_{codigo}", lambda c=codigo: _abrir_conexiones(
+                tenants.engine(c), min(settings.WARMUP_POOL_CONNECTIONS, settings.TENANT_POOL_SIZE)))
+    else:
+        medir("pool_primario", lambda: _abrir_conexiones(engine, settings.WARMUP_POOL_CONNECTIONS))
+    for i, replica in enumerate(replicas.replicas):
+        medir(f"pool_replica_{i}", lambda r=replica: _abrir_conexiones(r["engine"], settings.WARMUP_POOL_CONNECTIONS))
+    medir("bcrypt", lambda: get_password_hash("warmup") and None)
+    medir("jwt", lambda: verify_token(create_access_token({"sub": "warmup"})) and None)
+    medir("openapi", lambda: len(app.openapi()["paths"]))
+    if engine.dialect.name == "postgresql":
+        for codigo in codigos():
+            medir("particiones" if codigo is None else f"particiones_{codigo}",
+                  lambda c=codigo: asegurar_anio_actual(c))
+
+    informe = {
+        "total_ms": round((time.perf_counter() - inicio_total) * 1000, 1),
+        "pasos": pasos,
+    }
+    logger.info("Worker listo en %.1f ms: %s", informe["total_ms"],
+                ", ".join(f"{nombre}={paso['ms']}ms" for nombre, paso in pasos.items()))
+    return informe
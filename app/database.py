@@ -1,16 +1,231 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError, jwt
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
+from .core import consultas_lentas, tenancy
 
 engine = create_engine(settings.DATABASE_URL)
+consultas_lentas.instalar(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+METODOS_LECTURA = {"GET", "HEAD"}
+
+
+class ReplicaRouter:
+    """
+    Reparte las lecturas entre las réplicas en round-robin.
+    Una réplica que falla el chequeo de salud se omite hasta el siguiente chequeo;
+    si no queda ninguna sana se usa el primario.
+    """
+
+    def __init__(self, urls, intervalo_chequeo: int):
+        self.intervalo_chequeo = intervalo_chequeo
+        self.replicas = [
+            {
+                "engine": engine_replica,
+                "session": sessionmaker(autocommit=False, autoflush=False, bind=engine_replica),
+                "sana": True,
+                "ultimo_chequeo": 0.0,
+            }
+            for engine_replica in (create_engine(url, pool_pre_ping=True) for url in urls)
+        ]
+        for replica in self.replicas:
+            consultas_lentas.instalar(replica["engine"])
+        self._turno = itertools.count()
+        self._lock = threading.Lock()
+
+    def _chequear(self, replica) -> bool:
+        ahora = time.monotonic()
+        if ahora - replica["ultimo_chequeo"] < self.intervalo_chequeo:
+            return replica["sana"]
+        replica["ultimo_chequeo"] = ahora
+        try:
+            with replica["engine"].connect() as conexion:
+                conexion.execute(text("SELECT 1"))
+            replica["sana"] = True
+        except SQLAlchemyError:
+            replica["sana"] = False
+        return replica["sana"]
+
+    def elegir(self):
+        """Devuelve el sessionmaker de la siguiente réplica sana o None."""
+        if not self.replicas:
+            return None
+        with self._lock:
+            inicio = next(self._turno)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(inicio + i) % len(self.replicas)]
+            if self._chequear(replica):
+                return replica["session"]
+        return None
+
+    def estado(self) -> list:
+        return [{"url": r["engine"].url.render_as_string(hide_password=True), "sana": r["sana"]} for r in self.replicas]
+
+
+replicas = ReplicaRouter(settings.replica_urls, settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+def _fijar_search_path(esquema: str, conexion_dbapi, registro) -> None:
+    cursor = conexion_dbapi.cursor()
+    cursor.execute(f'SET search_path TO "{esquema}", public')
+    cursor.close()
+    # Sin commit, el rollback con que el pool recicla la conexión desharía el SET
+    conexion_dbapi.commit()
+
+
+class TenantRouter:
+    """
+    Un engine por colegio, creado al primer uso. Cada uno tiene su propio pool
+    (TENANT_POOL_SIZE + TENANT_MAX_OVERFLOW conexiones), así un colegio grande agota
+    solo las suyas y espera TENANT_POOL_TIMEOUT sin frenar a los demás. Los colegios
+    por esquema apuntan a DATABASE_URL y fijan search_path al abrir cada conexión.
+    """
+
+    def __init__(self):
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def engine(self, codigo: str):
+        engine_colegio = self._engines.get(codigo)
+        if engine_colegio is not None:
+            return engine_colegio
+        destino = tenancy.colegios().get(codigo)
+        if destino is None:
+            raise KeyError(f"Colegio desconocido: {codigo}")
+        with self._lock:
+            if codigo not in self._engines:
+                engine_colegio = create_engine(
+                    destino["url"] or settings.DATABASE_URL,
+                    pool_size=settings.TENANT_POOL_SIZE,
+                    max_overflow=settings.TENANT_MAX_OVERFLOW,
+                    pool_timeout=settings.TENANT_POOL_TIMEOUT,
+                    pool_pre_ping=True,
+                )
+                if destino["esquema"]:
+                    event.listen(engine_colegio, "connect",
+                                 lambda conexion, registro, esquema=destino["esquema"]:
+                                 _fijar_search_path(esquema, conexion, registro))
+                consultas_lentas.instalar(engine_colegio)
+                self._engines[codigo] = engine_colegio
+            return self._engines[codigo]
+
+    def sesion(self, codigo: str) -> Session:
+        # Mismo sessionmaker que el primario, así valen sus eventos (caché, auditoría, SSE...)
+        db = SessionLocal(bind=self.engine(codigo))
+        db.info["colegio"] = codigo
+        return db
+
+    def estado(self) -> list:
+        return [{"colegio": codigo, "pool": engine_colegio.pool.status()}
+                for codigo, engine_colegio in list(self._engines.items())]
+
+    def dispose(self) -> None:
+        with self._lock:
+            for engine_colegio in self._engines.values():
+                engine_colegio.dispose()
+            self._engines.clear()
+
+
+tenants = TenantRouter()
+
+
+def sesion_de(codigo) -> Session:
+    """Sesión del colegio indicado, o de la base principal si `codigo` es None."""
+    return SessionLocal() if codigo is None else tenants.sesion(codigo)
+
+# Momento de la última escritura confirmada por cada usuario. Es por proceso: con
+# varios workers, read-your-writes solo se cumple si la lectura cae en el mismo
+# worker que hizo la escritura (p. ej. con sesiones pegajosas en el balanceador).
+# Solo guarda los usuarios que escribieron dentro de la ventana.
+_ultimas_escrituras = {}
+_proxima_poda = 0.0
+_lock_escrituras = threading.Lock()
+
+
+def registrar_escritura(usuario_id: int) -> None:
+    global _proxima_poda
+    ahora = time.monotonic()
+    with _lock_escrituras:
+        _ultimas_escrituras[usuario_id] = ahora
+        if ahora >= _proxima_poda:
+            limite = ahora - settings.READ_YOUR_WRITES_SECONDS
+            for vencido in [uid for uid, momento in _ultimas_escrituras.items() if momento < limite]:
+                del _ultimas_escrituras[vencido]
+            _proxima_poda = ahora + settings.READ_YOUR_WRITES_SECONDS
+
+
+def escribio_recientemente(usuario_id) -> bool:
+    ultima = _ultimas_escrituras.get(usuario_id)
+    return ultima is not None and time.monotonic() - ultima < settings.READ_YOUR_WRITES_SECONDS
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _marcar_escritura(session, flush_context):
+    session.info["escritura"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _registrar_escritura(session):
+    # get_current_user deja el id del usuario autenticado en session.info
+    if session.info.pop("escritura", False) and session.info.get("usuario_id") is not None:
+        registrar_escritura(session.info["usuario_id"])
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_escritura(session):
+    session.info.pop("escritura", None)
+
+
+def _usuario_del_token(request: Request):
+    # Solo se usa para decidir el enrutamiento; la autenticación la hace get_current_user
+    autorizacion = request.headers.get("Authorization", "")
+    if not autorizacion.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.get_unverified_claims(autorizacion[7:]).get("user_id")
+    except JWTError:
+        return None
+
 # Dependency
 def get_db():
-    db = SessionLocal()
+    codigo = tenancy.tenant_actual.get()
+    if settings.TENANCY_ENABLED and codigo is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se pudo determinar el colegio"
+        )
+    db = sesion_de(codigo)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Sesión para lecturas. En peticiones GET/HEAD usa una réplica sana, salvo que el
+    usuario haya escrito hace poco (read-your-writes). En cualquier otro caso devuelve
+    la misma sesión del primario que get_db, que no abre conexión hasta usarse.
+    Con varios colegios las réplicas no se usan: replican solo la base principal.
+    """
+    if settings.TENANCY_ENABLED or request.method not in METODOS_LECTURA or escribio_recientemente(_usuario_del_token(request)):
+        yield db
+        return
+
+    sesion_replica = replicas.elegir()
+    if sesion_replica is None:
+        yield db
+        return
+
+    db_replica = sesion_replica()
+    db_replica.info["replica"] = True  # p. ej. para no llenar cachés con datos atrasados
+    try:
+        yield db_replica
+    finally:
+        db_replica.close()
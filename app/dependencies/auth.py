@@ -1,10 +1,13 @@
 # app/dependencies/auth.py
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
 from ..database import get_db
 from ..models import Usuario, RolUsuario
+from ..config import settings
 from ..core.security import verify_token
+from ..core.tenancy import tenant_actual
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
@@ -12,6 +15,8 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> Usuario:
+    # Siempre en el primario: con una réplica atrasada un usuario recién registrado
+    # no existiría y uno desactivado seguiría entrando
     payload = verify_token(token)
     user_email = payload.get("sub")
     
@@ -21,6 +26,13 @@ async def get_current_user(
             detail="Token inválido"
         )
     
+    # Un token emitido para otro colegio (o sin colegio) no vale aquí
+    if settings.TENANCY_ENABLED and payload.get("colegio") != tenant_actual.get():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="El token no corresponde a este colegio"
+        )
+    
     user = db.query(Usuario).filter(Usuario.email == user_email).first()
     
     if not user:
@@ -35,8 +47,21 @@ async def get_current_user(
             detail="Usuario inactivo"
         )
     
+    # Permite atribuir las escrituras de esta sesión al usuario (read-your-writes)
+    db.info["usuario_id"] = user.id
     return user
 
+async def get_current_user_stream(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="JWT para clientes EventSource, que no pueden enviar cabeceras"),
+    db: Session = Depends(get_db)
+) -> Usuario:
+    """
+    Igual que get_current_user, pero acepta el token también en el parámetro `access_token`.
+    """
+    token = access_token or await oauth2_scheme(request)
+    return await get_current_user(token=token, db=db)
+
 async def get_current_admin(current_user: Usuario = Depends(get_current_user)) -> Usuario:
     """
     Verifica si el usuario es administrador.
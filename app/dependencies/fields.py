@@ -0,0 +1,49 @@
+# app/dependencies/fields.py
+from typing import Dict, List, Optional
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+def sparse_fields(columnas: Dict[str, object]):
+    """
+    Crea una dependencia que lee el parámetro `fields` (ej. `fields=id,nombre,apellido`)
+    y lo valida contra los campos disponibles. Devuelve None si no se envía.
+    El campo `id` se incluye siempre.
+    """
+    disponibles = ", ".join(columnas)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Campos a devolver, separados por comas: {disponibles}")
+    ) -> Optional[List[str]]:
+        if not fields:
+            return None
+        campos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+        desconocidos = [campo for campo in campos if campo not in columnas]
+        if desconocidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos no válidos: {', '.join(desconocidos)}"
+            )
+        return list(dict.fromkeys(["id"] + campos))
+
+    return dependency
+
+def select_fields(db: Session, columnas: Dict[str, object], campos: List[str]):
+    """Query que selecciona solo las columnas pedidas, etiquetadas con el nombre del campo."""
+    return db.query(*[columnas[campo].label(campo) for campo in campos])
+
+def fields_response(data, campos: List[str]) -> JSONResponse:
+    """
+    Serializa filas (o un dict) recortadas a los campos pedidos.
+    Se devuelve un JSONResponse para que el response_model completo no exija los campos omitidos.
+    """
+    if isinstance(data, list):
+        contenido = [{campo: fila[campo] for campo in campos} for fila in map(_como_dict, data)]
+    else:
+        fila = _como_dict(data)
+        contenido = {campo: fila[campo] for campo in campos}
+    return JSONResponse(content=jsonable_encoder(contenido))
+
+def _como_dict(fila) -> dict:
+    return fila if isinstance(fila, dict) else fila._asdict()
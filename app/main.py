@@ -1,9 +1,22 @@
 # app/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, estudiantes, profesores, usuarios, tutores
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from .routers import auth, estudiantes, profesores, usuarios, tutores, horarios, boletines, jobs, auditoria, cursos_periodo, eventos, estadisticas, periodos, sync, perfiles, consultas_lentas
 from .config import settings
+from .dependencies.auth import get_current_admin
+from .models import Usuario
+from .core.warmup import warm_up
+from .services.invalidation import bus as invalidation_bus
+from .services.jobs import job_worker
+from .services.auditoria import audit_log
+from .middleware.compression import CompressionMiddleware, CompressedCache
+from .middleware.profiling import ProfilingMiddleware
+from .middleware.contexto import RutaActualMiddleware, TenantMiddleware
 
 # Configuración de la documentación de Swagger UI
 description = """
@@ -12,7 +25,24 @@ description = """
 API para la gestión de estudiantes, profesores y notas.
 """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uvicorn no acepta conexiones hasta que termina el arranque, así el worker
+    # entra al balanceador ya con el pool, bcrypt, JWT y OpenAPI precalentados.
+    app.state.startup_report = await run_in_threadpool(warm_up, app)
+    invalidation_bus.start()
+    audit_log.start()
+    if settings.JOBS_WORKER_ENABLED:
+        job_worker.start()
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    job_worker.stop()
+    audit_log.stop()
+    invalidation_bus.stop()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     description=description,
     version="1.0.0",
@@ -30,6 +60,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresión gzip/brotli para las listas grandes que viajan por redes móviles.
+# Los cuerpos comprimidos se guardan en un LRU para no recomprimir respuestas repetidas.
+compressed_cache = CompressedCache(settings.COMPRESSION_CACHE_ENTRIES, settings.COMPRESSION_CACHE_MAX_BYTES)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+    cache=compressed_cache,
+    threadpool_size=settings.COMPRESSION_THREADPOOL_MIN_SIZE,
+)
+
+# Ruta de cada petición para atribuirle sus consultas lentas
+if settings.SLOW_QUERY_LOG_ENABLED:
+    app.add_middleware(RutaActualMiddleware)
+
+# Perfilado bajo demanda de peticiones lentas; sin PROFILING_ENABLED no se instala
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILING_SAMPLE_RATE)
+
+# Colegio de cada petición; va por fuera del resto para que todos lo vean
+if settings.TENANCY_ENABLED:
+    app.add_middleware(TenantMiddleware)
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_agotado(request, exc):
+    # El pool (del colegio, con TENANCY_ENABLED) no liberó una conexión a tiempo
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Base de datos ocupada, intente nuevamente"},
+        headers={"Retry-After": "1"},
+    )
+
 # Configuración de seguridad para Swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
@@ -38,4 +101,27 @@ app.include_router(auth.router)
 app.include_router(usuarios.router)
 app.include_router(estudiantes.router)
 app.include_router(profesores.router)
-app.include_router(tutores.router)
\ No newline at end of file
+app.include_router(tutores.router)
+app.include_router(periodos.router)
+app.include_router(horarios.router)
+app.include_router(cursos_periodo.router)
+app.include_router(eventos.router)
+app.include_router(boletines.router)
+app.include_router(estadisticas.router)
+app.include_router(jobs.router)
+app.include_router(sync.router)
+app.include_router(auditoria.router)
+app.include_router(perfiles.router)
+app.include_router(consultas_lentas.router)
+
+@app.get("/health", include_in_schema=False)
+async def health():
+    """Readiness del worker (sin autenticación: solo dice si está listo)."""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"ready": False})
+    return {"ready": True}
+
+@app.get("/health/arranque", include_in_schema=False)
+async def health_arranque(current_user: Usuario = Depends(get_current_admin)):
+    """Informe de tiempos de arranque, con los errores de los pasos que fallaron. Solo administradores."""
+    return {"ready": getattr(app.state, "ready", False), "startup": getattr(app.state, "startup_report", None)}
\ No newline at end of file
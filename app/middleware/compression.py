@@ -0,0 +1,175 @@
+# app/middleware/compression.py
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él solo se negocia gzip
+    brotli = None
+
+TIPOS_COMPRIMIBLES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+class CompressedCache:
+    """
+    LRU de cuerpos ya comprimidos, indexado por (codificación, hash del cuerpo original).
+    Las respuestas calientes (listas que no cambian entre peticiones) se comprimen una sola vez.
+    """
+
+    def __init__(self, max_entradas: int, max_bytes: int):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            valor = self._entradas.get(clave)
+            if valor is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def put(self, clave, valor: bytes) -> None:
+        if self.max_entradas <= 0 or len(valor) > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._entradas:
+                return
+            self._entradas[clave] = valor
+            self.bytes += len(valor)
+            while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                _, antiguo = self._entradas.popitem(last=False)
+                self.bytes -= len(antiguo)
+
+    def estado(self) -> dict:
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self.bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
+
+
+def elegir_codificacion(accept_encoding: str):
+    """
+    Devuelve 'br', 'gzip' o None según Accept-Encoding: la aceptable de mayor q
+    (br si empatan); None si ninguna tiene q > 0 o el cliente prefiere identity.
+    """
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        partes = [p.strip() for p in parte.split(";")]
+        nombre, q = partes[0], 1.0
+        for param in partes[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if nombre:
+            aceptadas[nombre] = q
+    comodin = aceptadas.get("*", 0.0)
+    elegida, mejor_q = None, 0.0
+    for nombre in (("br", "gzip") if brotli is not None else ("gzip",)):
+        q = aceptadas.get(nombre, comodin)
+        if q > mejor_q:
+            elegida, mejor_q = nombre, q
+    if elegida is not None and aceptadas.get("identity", 0.0) > mejor_q:
+        return None
+    return elegida
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime con brotli o gzip las respuestas no streaming
+    cuyo cuerpo supera `minimum_size`. Las respuestas en streaming (FileResponse,
+    StreamingResponse) y las que ya traen Content-Encoding pasan sin tocar.
+    Los cuerpos desde `threadpool_size` se comprimen en el threadpool para no
+    frenar el event loop.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, cache: CompressedCache = None, threadpool_size: int = 64 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.threadpool_size = threadpool_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        partes = []
+        en_streaming = False
+
+        async def send_wrapper(message):
+            nonlocal inicio, en_streaming
+            if message["type"] == "http.response.start":
+                inicio = message
+                return
+            if message["type"] != "http.response.body" or inicio is None:
+                await send(message)
+                return
+            if en_streaming:
+                await send(message)
+                return
+
+            partes.append(message.get("body", b""))
+            if message.get("more_body", False):
+                # Streaming: se envía tal cual, sin comprimir
+                en_streaming = True
+                await send(inicio)
+                await send({"type": "http.response.body", "body": b"".join(partes), "more_body": True})
+                return
+
+            await self._enviar(send, inicio, b"".join(partes), codificacion)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _comprimible(self, headers: Headers, cuerpo: bytes) -> bool:
+        if len(cuerpo) < self.minimum_size or "content-encoding" in headers:
+            return False
+        tipo = headers.get("content-type", "")
+        return tipo.startswith(TIPOS_COMPRIMIBLES)
+
+    def _comprimir(self, cuerpo: bytes, codificacion: str) -> bytes:
+        if codificacion == "br":
+            return brotli.compress(cuerpo, quality=self.brotli_quality)
+        return gzip.compress(cuerpo, compresslevel=self.gzip_level, mtime=0)
+
+    async def _enviar(self, send, inicio, cuerpo: bytes, codificacion: str) -> None:
+        headers = MutableHeaders(raw=inicio["headers"])
+        if self._comprimible(headers, cuerpo):
+            clave = (codificacion, hashlib.blake2b(cuerpo, digest_size=16).digest())
+            comprimido = self.cache.get(clave) if self.cache is not None else None
+            if comprimido is None:
+                if len(cuerpo) >= self.threadpool_size:
+                    comprimido = await run_in_threadpool(self._comprimir, cuerpo, codificacion)
+                else:
+                    comprimido = self._comprimir(cuerpo, codificacion)
+                if self.cache is not None:
+                    self.cache.put(clave, comprimido)
+            cuerpo = comprimido
+            headers["Content-Encoding"] = codificacion
+            headers["Content-Length"] = str(len(cuerpo))
+            headers.add_vary_header("Accept-Encoding")
+        await send(inicio)
+        await send({"type": "http.response.body", "body": cuerpo})
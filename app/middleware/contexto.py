@@ -0,0 +1,56 @@
+# app/middleware/contexto.py
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import JSONResponse
+from ..core import tenancy
+from ..core.consultas_lentas import scope_actual
+
+
+class RutaActualMiddleware:
+    """
+    Deja el scope ASGI de la petición en un ContextVar para que el registro de
+    consultas lentas sepa qué ruta las disparó (FastAPI completa scope["route"]).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = scope_actual.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            scope_actual.reset(token)
+
+
+class TenantMiddleware:
+    """
+    Resuelve el colegio de la petición (ver core/tenancy.py) y lo deja en
+    `tenant_actual` para get_db, las cachés y los canales SSE. Un colegio que no
+    está en TENANTS responde 404 antes de tocar la base. Solo se instala con
+    TENANCY_ENABLED.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            codigo = tenancy.resolver(Headers(scope=scope),
+                                      QueryParams(scope.get("query_string", b"")).get("access_token"))
+        except ValueError as e:
+            await JSONResponse(status_code=400, content={"detail": str(e)})(scope, receive, send)
+            return
+        if codigo is not None and codigo not in tenancy.colegios():
+            await JSONResponse(status_code=404, content={"detail": "Colegio no encontrado"})(scope, receive, send)
+            return
+        token = tenancy.tenant_actual.set(codigo)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            tenancy.tenant_actual.reset(token)
@@ -0,0 +1,131 @@
+# app/middleware/profiling.py
+import cProfile
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from ..config import settings
+from ..core.tenancy import tenant_actual
+from ..database import sesion_de
+from ..models import Usuario, RolUsuario
+from ..services import perfiles
+
+CABECERA = "x-profile"
+
+# (inicio de la petición, lista de consultas) mientras se perfila; None el resto del tiempo
+_linea_sql = ContextVar("linea_sql", default=None)
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if _linea_sql.get() is not None:
+        conn.info.setdefault("perfil_inicio", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    actual = _linea_sql.get()
+    if actual is None or not conn.info.get("perfil_inicio"):
+        return
+    inicio_peticion, consultas = actual
+    inicio = conn.info["perfil_inicio"].pop()
+    if len(consultas) >= settings.PROFILING_MAX_SQL:
+        return
+    consultas.append({
+        "inicio_ms": round((inicio - inicio_peticion) * 1000, 3),
+        "duracion_ms": round((time.perf_counter() - inicio) * 1000, 3),
+        "sql": statement[:2000],
+        "executemany": executemany,
+        "filas": cursor.rowcount,
+    })
+
+
+def _es_admin(authorization: str) -> bool:
+    if not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        email = jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return False
+    db = sesion_de(tenant_actual.get())
+    try:
+        rol = db.query(Usuario.rol).filter(Usuario.email == email, Usuario.is_active.is_(True)).scalar()
+    finally:
+        db.close()
+    return rol == RolUsuario.ADMINISTRATIVO
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila peticiones bajo demanda: las que traen la cabecera
+    `X-Profile: 1` con un JWT de administrador, y una fracción `sample_rate` al azar.
+    Captura un perfil cProfile del hilo del event loop mientras dura la petición y la
+    línea de tiempo de sus consultas SQL (también las que corren en el threadpool),
+    y lo guarda con services/perfiles.py. La respuesta lleva `X-Profile-Id`.
+
+    Se perfila una petición a la vez; las demás, mientras tanto, pasan sin perfilar.
+    cProfile ve todo lo que corre en el event loop en ese lapso, incluidas otras
+    peticiones concurrentes. Solo se instala con PROFILING_ENABLED, así que
+    deshabilitado no tiene costo.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self._ocupado = threading.Lock()
+        if not event.contains(Engine, "before_cursor_execute", _antes_de_ejecutar):
+            event.listen(Engine, "before_cursor_execute", _antes_de_ejecutar)
+            event.listen(Engine, "after_cursor_execute", _despues_de_ejecutar)
+
+    async def _solicitado(self, headers: Headers) -> bool:
+        if headers.get(CABECERA) in ("1", "true"):
+            return await run_in_threadpool(_es_admin, headers.get("authorization", ""))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._solicitado(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+        if not self._ocupado.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        perfil_id = perfiles.nuevo_id()
+        estado = {"status": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                estado["status"] = message["status"]
+                MutableHeaders(raw=message["headers"])["X-Profile-Id"] = perfil_id
+            await send(message)
+
+        consultas = []
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        token = _linea_sql.set((inicio, consultas))
+        try:
+            perfil.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                perfil.disable()
+                duracion = time.perf_counter() - inicio
+                _linea_sql.reset(token)
+        finally:
+            self._ocupado.release()
+
+        await run_in_threadpool(perfiles.guardar, perfil_id, perfil, {
+            "metodo": scope["method"],
+            "ruta": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "status": estado["status"],
+            "duracion_ms": round(duracion * 1000, 3),
+            "sql_total_ms": round(sum(consulta["duracion_ms"] for consulta in consultas), 3),
+            "sql_consultas": len(consultas),
+            "creado_en": datetime.utcnow(),
+            "sql": consultas,
+        })
@@ -1,5 +1,5 @@
 # app/models/__init__.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Time, Float, ForeignKey, Enum, UniqueConstraint, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 import enum
@@ -23,6 +23,7 @@ class Usuario(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    cambio_seq = Column(BigInteger, index=True)  # secuencia del feed /sync (services/sync.py)
 
     # Relación uno a uno con los perfiles específicos
     estudiante = relationship("Estudiante", back_populates="usuario", uselist=False)
@@ -39,6 +40,8 @@ class Tutor(Base):
     lugar_trabajo = Column(String)
     correo = Column(String, unique=True)
     telefono = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    cambio_seq = Column(BigInteger, index=True)
     
     # Relación uno a muchos con estudiantes
     estudiantes = relationship("Estudiante", back_populates="tutor")
@@ -47,10 +50,12 @@ class Estudiante(Base):
     __tablename__ = "estudiantes"
     id = Column(Integer, primary_key=True)
     usuario_id = Column(Integer, ForeignKey('usuarios.id'), unique=True, nullable=False)
-    tutor_id = Column(Integer, ForeignKey('tutores.id'), nullable=False)  # Aquí está la clave foránea
+    tutor_id = Column(Integer, ForeignKey('tutores.id'), nullable=False, index=True)  # Aquí está la clave foránea
 
     direccion = Column(String)
     fecha_nacimiento = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    cambio_seq = Column(BigInteger, index=True)
     
     # Relación
     usuario = relationship("Usuario", back_populates="estudiante")
@@ -64,9 +69,12 @@ class Profesor(Base):
     carnet_identidad = Column(String, unique=True)
     especialidad = Column(String)
     nivel_academico = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    cambio_seq = Column(BigInteger, index=True)
     
     # Relación con usuario
     usuario = relationship("Usuario", back_populates="profesor")
+    cursos_materia = relationship("CursoMateria", back_populates="profesor")
 
 class Administrativo(Base):
     __tablename__ = "administrativos"
@@ -74,4 +82,203 @@ class Administrativo(Base):
     usuario_id = Column(Integer, ForeignKey('usuarios.id'), unique=True, nullable=False)
     
     # Relación con usuario
-    usuario = relationship("Usuario", back_populates="administrativo")
\ No newline at end of file
+    usuario = relationship("Usuario", back_populates="administrativo")
+
+class Materia(Base):
+    __tablename__ = "materias"
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String, nullable=False)
+    descripcion = Column(String)
+    area_conocimiento = Column(String)
+    nivel_dificultad = Column(String)
+    horas_semanales = Column(Integer)
+    is_active = Column(Boolean, default=True)
+
+class Curso(Base):
+    __tablename__ = "cursos"
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String, nullable=False)
+    sigla = Column(String, unique=True)
+    nivel = Column(String)
+    capacidad_maxima = Column(Integer)
+    descripcion = Column(String)
+    is_active = Column(Boolean, default=True)
+
+    periodos = relationship("CursoPeriodo", back_populates="curso")
+
+class Periodo(Base):
+    __tablename__ = "periodos"
+    id = Column(Integer, primary_key=True)
+    bimestre = Column(Integer, nullable=False)
+    anio = Column(Integer, nullable=False)
+    fecha_inicio = Column(Date)
+    fecha_fin = Column(Date)
+    descripcion = Column(String)
+    is_active = Column(Boolean, default=True)
+    archivado_en = Column(DateTime)  # notas y participaciones movidas al archivo frío (services/archivo.py)
+
+    cursos = relationship("CursoPeriodo", back_populates="periodo")
+
+class CursoPeriodo(Base):
+    __tablename__ = "cursos_periodo"
+    id = Column(Integer, primary_key=True)
+    curso_id = Column(Integer, ForeignKey('cursos.id'), nullable=False, index=True)
+    periodo_id = Column(Integer, ForeignKey('periodos.id'), nullable=False, index=True)
+    aula = Column(String)
+    turno = Column(String)
+    capacidad_actual = Column(Integer, default=0, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+    curso = relationship("Curso", back_populates="periodos")
+    periodo = relationship("Periodo", back_populates="cursos")
+    materias = relationship("CursoMateria", back_populates="curso_periodo")
+
+class CursoMateria(Base):
+    __tablename__ = "cursos_materia"
+    id = Column(Integer, primary_key=True)
+    materia_id = Column(Integer, ForeignKey('materias.id'), nullable=False)
+    curso_periodo_id = Column(Integer, ForeignKey('cursos_periodo.id'), nullable=False, index=True)
+    profesor_id = Column(Integer, ForeignKey('profesores.id'), index=True)
+    horario = Column(String)  # descripción libre; los bloques estructurados están en bloques_horario
+    aula = Column(String)
+    modalidad = Column(String)
+
+    materia = relationship("Materia")
+    curso_periodo = relationship("CursoPeriodo", back_populates="materias")
+    profesor = relationship("Profesor", back_populates="cursos_materia")
+    bloques = relationship("BloqueHorario", back_populates="curso_materia", cascade="all, delete-orphan")
+
+class BloqueHorario(Base):
+    __tablename__ = "bloques_horario"
+    id = Column(Integer, primary_key=True)
+    curso_materia_id = Column(Integer, ForeignKey('cursos_materia.id'), nullable=False, index=True)
+    dia_semana = Column(Integer, nullable=False)  # 1 = lunes ... 7 = domingo
+    hora_inicio = Column(Time, nullable=False)
+    hora_fin = Column(Time, nullable=False)
+
+    curso_materia = relationship("CursoMateria", back_populates="bloques")
+
+class Inscripcion(Base):
+    __tablename__ = "inscripciones"
+    __table_args__ = (UniqueConstraint('estudiante_id', 'curso_periodo_id'),)
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False, index=True)
+    curso_periodo_id = Column(Integer, ForeignKey('cursos_periodo.id'), nullable=False, index=True)
+    fecha_inscripcion = Column(DateTime, default=datetime.utcnow)
+
+    estudiante = relationship("Estudiante")
+    curso_periodo = relationship("CursoPeriodo")
+
+class Nota(Base):
+    # En PostgreSQL está particionada por año de `fecha` (ver services/particiones.py)
+    __tablename__ = "notas"
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False, index=True)
+    curso_materia_id = Column(Integer, ForeignKey('cursos_materia.id'), nullable=False, index=True)
+    valor = Column(Float, nullable=False)
+    fecha = Column(Date, nullable=False)
+    descripcion = Column(String)
+    rendimiento = Column(String)
+
+class Participacion(Base):
+    # En PostgreSQL está particionada por año de `fecha` (ver services/particiones.py)
+    __tablename__ = "participaciones"
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False, index=True)
+    curso_materia_id = Column(Integer, ForeignKey('cursos_materia.id'), nullable=False, index=True)
+    asistencia = Column(Boolean, nullable=False, default=True)
+    participacion_clase = Column(Integer)  # puntaje de participación en clase
+    fecha = Column(Date, nullable=False)
+    observacion = Column(String)
+
+class EstadisticaNota(Base):
+    """Estadísticas de notas por estudiante y materia, mantenidas al escribir (ver services/estadisticas.py)."""
+    __tablename__ = "estadisticas_notas"
+    __table_args__ = (UniqueConstraint('estudiante_id', 'curso_materia_id'),)
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False, index=True)
+    curso_materia_id = Column(Integer, ForeignKey('cursos_materia.id'), nullable=False, index=True)
+    cantidad = Column(Integer, nullable=False, default=0)
+    suma = Column(Float, nullable=False, default=0.0)
+    media = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)  # suma de cuadrados de desviaciones (Welford)
+    suma_xy = Column(Float, nullable=False, default=0.0)  # sum(i * valor_i) en orden de registro, para la tendencia
+    minimo = Column(Float)
+    maximo = Column(Float)
+    ultimo_valor = Column(Float)
+    ultima_fecha = Column(Date)
+    actualizado_en = Column(DateTime, default=datetime.utcnow)
+
+class AsistenciaBitmap(Base):
+    """Asistencia por estudiante y materia en mapas de bits por día, mantenidos al escribir (ver services/asistencia.py)."""
+    __tablename__ = "asistencia_bitmaps"
+    __table_args__ = (UniqueConstraint('estudiante_id', 'curso_materia_id'),)
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False, index=True)
+    curso_materia_id = Column(Integer, ForeignKey('cursos_materia.id'), nullable=False, index=True)
+    desde = Column(Date, nullable=False)  # día del bit 0
+    clases = Column(LargeBinary, nullable=False)  # bit i: hubo clase registrada el día desde + i
+    presentes = Column(LargeBinary, nullable=False)  # bit i: asistió ese día
+    actualizado_en = Column(DateTime, default=datetime.utcnow)
+
+class Boletin(Base):
+    __tablename__ = "boletines"
+    __table_args__ = (UniqueConstraint('estudiante_id', 'curso_periodo_id', 'formato'),)
+    id = Column(Integer, primary_key=True)
+    estudiante_id = Column(Integer, ForeignKey('estudiantes.id'), nullable=False)
+    curso_periodo_id = Column(Integer, ForeignKey('cursos_periodo.id'), nullable=False, index=True)
+    formato = Column(String, nullable=False)  # csv, html o pdf
+    sha256 = Column(String, nullable=False)
+    ruta = Column(String, nullable=False)  # relativa a BOLETINES_DIR
+    tamano = Column(Integer, nullable=False)
+    generado_en = Column(DateTime, default=datetime.utcnow)
+
+class EstadoJob(enum.Enum):
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (Index('ix_jobs_cola', 'estado', 'tipo', 'disponible_en'),)
+    id = Column(Integer, primary_key=True)
+    tipo = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    estado = Column(Enum(EstadoJob), nullable=False, default=EstadoJob.PENDIENTE)
+    intentos = Column(Integer, nullable=False, default=0)
+    max_intentos = Column(Integer, nullable=False, default=3)
+    disponible_en = Column(DateTime, nullable=False, default=datetime.utcnow)  # para reintentos con backoff
+    bloqueado_por = Column(String)
+    bloqueado_en = Column(DateTime)
+    resultado = Column(JSON)
+    error = Column(String)
+    creado_por = Column(Integer, ForeignKey('usuarios.id'))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    terminado_en = Column(DateTime)
+
+class Auditoria(Base):
+    __tablename__ = "auditoria"
+    __table_args__ = (Index('ix_auditoria_entidad', 'entidad', 'entidad_id'),)
+    id = Column(Integer, primary_key=True)
+    usuario_id = Column(Integer, index=True)  # sin FK: el historial sobrevive al borrado del usuario
+    accion = Column(String, nullable=False)  # insert, update o delete
+    entidad = Column(String, nullable=False)  # nombre de la tabla
+    entidad_id = Column(Integer)
+    cambios = Column(JSON)  # {campo: [antes, después]}
+    creado_en = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class SyncSecuencia(Base):
+    """Contador global (una sola fila) de la secuencia de cambios del feed /sync."""
+    __tablename__ = "sync_secuencia"
+    id = Column(Integer, primary_key=True)
+    valor = Column(BigInteger, nullable=False, default=0)
+
+class SyncTombstone(Base):
+    """Marca de borrado para que los clientes offline eliminen la fila local."""
+    __tablename__ = "sync_tombstones"
+    id = Column(Integer, primary_key=True)
+    entidad = Column(String, nullable=False)
+    entidad_id = Column(Integer, nullable=False)
+    cambio_seq = Column(BigInteger, nullable=False, index=True)
+    eliminado_en = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,44 @@
+# app/routers/auditoria.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_read_db
+from ..models import Usuario, Auditoria
+from ..schemas.auditoria import AuditoriaResponse, MetricasAuditoriaResponse
+from ..services.auditoria import audit_log
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/auditoria", tags=["auditoria"])
+
+@router.get("/", response_model=List[AuditoriaResponse])
+async def get_auditoria(
+    entidad: Optional[str] = None,
+    entidad_id: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Listar el historial de cambios, los más recientes primero.
+    Se puede filtrar por entidad (tabla), id de la entidad y usuario que hizo el cambio.
+    Solo accesible para administradores.
+    """
+    consulta = db.query(Auditoria)
+    if entidad:
+        consulta = consulta.filter(Auditoria.entidad == entidad)
+    if entidad_id is not None:
+        consulta = consulta.filter(Auditoria.entidad_id == entidad_id)
+    if usuario_id is not None:
+        consulta = consulta.filter(Auditoria.usuario_id == usuario_id)
+    return consulta.order_by(Auditoria.id.desc()).offset(skip).limit(limit).all()
+
+@router.get("/metricas", response_model=MetricasAuditoriaResponse)
+async def get_metricas_auditoria(current_user: Usuario = Depends(get_current_admin)):
+    """
+    Métricas de la cola de auditoría de este worker: registros encolados, escritos,
+    descartados por cola llena y fallidos al escribir.
+    Solo accesible para administradores.
+    """
+    return audit_log.metricas()
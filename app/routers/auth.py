@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Usuario, Tutor, Estudiante
 from ..schemas.auth import LoginRequest, TokenResponse, UserCreate, UserResponse
+from ..core.tenancy import tenant_actual
 from ..core.security import verify_password, create_access_token, get_password_hash
 from fastapi.security import OAuth2PasswordRequestForm
 from ..models import RolUsuario
@@ -32,6 +33,9 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     
     try:
         db.add(db_user)
+        db.flush()
+        # El primer GET del usuario nuevo no debe ir a una réplica que aún no lo tiene
+        db.info["usuario_id"] = db_user.id
         db.commit()
         db.refresh(db_user)
         
@@ -110,6 +114,8 @@ async def login_for_access_token(
         "user_id": user.id,
         "rol": user.rol.value
     }
+    if tenant_actual.get() is not None:
+        token_data["colegio"] = tenant_actual.get()
     
     return {
         "access_token": create_access_token(token_data),
@@ -174,6 +180,8 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         "user_id": user.id,
         "rol": user.rol.value
     }
+    if tenant_actual.get() is not None:
+        token_data["colegio"] = tenant_actual.get()
     
     return {
         "access_token": create_access_token(token_data),
@@ -0,0 +1,109 @@
+# app/routers/boletines.py
+import os
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..models import Usuario, Estudiante, CursoPeriodo, Boletin, RolUsuario
+from ..schemas.boletines import GeneracionBoletinesRequest, BoletinResponse
+from ..schemas.jobs import JobResponse
+from ..services.boletines import MEDIA_TYPES, formatos_disponibles, ruta_absoluta
+from ..services.jobs import encolar
+from ..dependencies.auth import get_current_user, get_current_admin
+from .jobs import job_response
+
+router = APIRouter(prefix="/api/v1/boletines", tags=["boletines"])
+
+def _validar_formato(formato: str) -> None:
+    if formato not in formatos_disponibles():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato no disponible. Opciones: {', '.join(formatos_disponibles())}"
+        )
+
+@router.post("/generar", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generar_boletines(
+    datos: GeneracionBoletinesRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Encolar la generación de los boletines de un curso-periodo.
+    Responde de inmediato con el trabajo; el avance se consulta en GET /api/v1/jobs/{job_id}.
+    Solo accesible para administradores.
+    """
+    _validar_formato(datos.formato)
+    if not db.query(CursoPeriodo.id).filter(CursoPeriodo.id == datos.curso_periodo_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Curso_Periodo no encontrado"
+        )
+    job = encolar(db, "boletines", datos.model_dump(), creado_por=current_user.id)
+    return job_response(job)
+
+@router.get("/curso-periodo/{curso_periodo_id}", response_model=List[BoletinResponse])
+async def get_boletines_curso_periodo(
+    curso_periodo_id: int,
+    formato: Optional[str] = None,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Listar los boletines ya generados de un curso-periodo.
+    Solo accesible para administradores.
+    """
+    consulta = db.query(Boletin).filter(Boletin.curso_periodo_id == curso_periodo_id)
+    if formato:
+        consulta = consulta.filter(Boletin.formato == formato)
+    return consulta.order_by(Boletin.estudiante_id).all()
+
+@router.get("/estudiantes/{estudiante_id}")
+async def descargar_boletin(
+    estudiante_id: int,
+    curso_periodo_id: int,
+    formato: str = "html",
+    if_none_match: Optional[str] = Header(None),
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Descargar el boletín ya generado de un estudiante.
+    El archivo se envía directamente desde disco; nunca se regenera en la petición.
+    Un estudiante puede descargar el suyo, un administrador cualquiera.
+    """
+    _validar_formato(formato)
+    estudiante = db.query(Estudiante.id, Estudiante.usuario_id).filter(Estudiante.id == estudiante_id).first()
+    if not estudiante:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Estudiante no encontrado"
+        )
+    
+    if current_user.id != estudiante.usuario_id and current_user.rol != RolUsuario.ADMINISTRATIVO:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para ver este boletín"
+        )
+    
+    boletin = db.query(Boletin).filter(
+        Boletin.estudiante_id == estudiante_id,
+        Boletin.curso_periodo_id == curso_periodo_id,
+        Boletin.formato == formato
+    ).first()
+    if not boletin or not os.path.exists(ruta_absoluta(boletin.ruta)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="El boletín todavía no fue generado"
+        )
+    
+    etag = f'"{boletin.sha256}"'
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return FileResponse(
+        ruta_absoluta(boletin.ruta),
+        media_type=MEDIA_TYPES[formato],
+        filename=f"boletin_{estudiante_id}_{curso_periodo_id}.{formato}",
+        headers={"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    )
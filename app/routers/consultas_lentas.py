@@ -0,0 +1,32 @@
+# app/routers/consultas_lentas.py
+from fastapi import APIRouter, Depends, Query, status
+from typing import List
+from ..core.consultas_lentas import registro
+from ..models import Usuario
+from ..schemas.consultas_lentas import ConsultaLentaResponse
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/consultas-lentas", tags=["consultas-lentas"])
+
+@router.get("/", response_model=List[ConsultaLentaResponse])
+async def get_consultas_lentas(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Usuario = Depends(get_current_admin)
+):
+    """
+    Sentencias SQL que superaron SLOW_QUERY_THRESHOLD_MS, agrupadas por huella del SQL
+    normalizado y ordenadas por tiempo total: cantidad, total, promedio, máximo,
+    rutas que las dispararon y el último plan de EXPLAIN.
+    Los datos son del proceso que atiende la petición (cada worker lleva los suyos).
+    Solo accesible para administradores.
+    """
+    return registro.estadisticas(limit)
+
+@router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+async def reiniciar_consultas_lentas(current_user: Usuario = Depends(get_current_admin)):
+    """
+    Vaciar las estadísticas de consultas lentas de este proceso (p. ej. tras un despliegue).
+    Solo accesible para administradores.
+    """
+    registro.reiniciar()
+    return None
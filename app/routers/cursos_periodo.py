@@ -0,0 +1,139 @@
+# app/routers/cursos_periodo.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+from ..database import get_db, get_read_db
+from ..models import Usuario, Estudiante, CursoPeriodo, CursoMateria, Profesor, RolUsuario
+from ..schemas.cursos_periodo import (
+    RosterResponse, EstadisticasRosterResponse, InscripcionRequest, InscripcionResponse,
+)
+from ..services.inscripciones import CupoLlenoError, InscripcionDuplicadaError, desinscribir, inscribir
+from ..services.roster import roster_cache
+from ..dependencies.auth import get_current_user, get_current_admin
+
+router = APIRouter(prefix="/api/v1/cursos-periodo", tags=["cursos-periodo"])
+
+def verificar_acceso_curso_periodo(db: Session, current_user: Usuario, curso_periodo_id: int) -> None:
+    """Administradores ven todo; un profesor solo los curso-periodo donde dicta alguna materia."""
+    if current_user.rol == RolUsuario.ADMINISTRATIVO:
+        return
+    if current_user.rol == RolUsuario.PROFESOR:
+        dicta = db.query(exists().where(
+            CursoMateria.curso_periodo_id == curso_periodo_id,
+            CursoMateria.profesor_id == Profesor.id,
+            Profesor.usuario_id == current_user.id
+        )).scalar()
+        if dicta:
+            return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="No tienes permiso para ver este curso"
+    )
+
+@router.get("/roster/estadisticas", response_model=EstadisticasRosterResponse)
+async def get_estadisticas_roster(current_user: Usuario = Depends(get_current_admin)):
+    """
+    Rosters en la caché de este worker y memoria que ocupan.
+    Solo accesible para administradores.
+    """
+    return roster_cache.estadisticas()
+
+@router.get("/{curso_periodo_id}/roster", response_model=RosterResponse)
+async def get_roster(
+    curso_periodo_id: int,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Lista de estudiantes inscritos en un curso-periodo, ordenada por apellido y nombre.
+    Accesible para administradores y para los profesores que dictan alguna materia del curso-periodo.
+    """
+    verificar_acceso_curso_periodo(db, current_user, curso_periodo_id)
+    
+    if not db.query(CursoPeriodo.id).filter(CursoPeriodo.id == curso_periodo_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Curso_Periodo no encontrado"
+        )
+    
+    roster = roster_cache.obtener(db, curso_periodo_id)
+    return {
+        "curso_periodo_id": curso_periodo_id,
+        "total": len(roster),
+        "estudiantes": [estudiante._asdict() for estudiante in roster.filas()],
+    }
+
+@router.post("/{curso_periodo_id}/inscripciones", response_model=InscripcionResponse, status_code=status.HTTP_201_CREATED)
+async def inscribir_estudiante(
+    curso_periodo_id: int,
+    datos: InscripcionRequest,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Inscribir un estudiante en un curso-periodo respetando el cupo del curso.
+    Un estudiante solo puede inscribirse a sí mismo; un administrador puede inscribir a cualquiera.
+    Responde 409 si no quedan cupos o si el estudiante ya está inscrito.
+    """
+    if current_user.rol == RolUsuario.ESTUDIANTE:
+        estudiante = db.query(Estudiante.id).filter(Estudiante.usuario_id == current_user.id).first()
+        if not estudiante or datos.estudiante_id not in (None, estudiante.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Solo puedes inscribirte a ti mismo"
+            )
+        estudiante_id = estudiante.id
+    elif current_user.rol == RolUsuario.ADMINISTRATIVO:
+        if datos.estudiante_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Debe indicar el estudiante_id"
+            )
+        if not db.query(Estudiante.id).filter(Estudiante.id == datos.estudiante_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Estudiante no encontrado"
+            )
+        estudiante_id = datos.estudiante_id
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para inscribir estudiantes"
+        )
+    
+    if not db.query(CursoPeriodo.id).filter(CursoPeriodo.id == curso_periodo_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Curso_Periodo no encontrado"
+        )
+    
+    try:
+        return inscribir(db, curso_periodo_id, estudiante_id)
+    except InscripcionDuplicadaError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El estudiante ya está inscrito en este curso"
+        )
+    except CupoLlenoError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No quedan cupos en este curso"
+        )
+
+@router.delete("/{curso_periodo_id}/inscripciones/{estudiante_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def desinscribir_estudiante(
+    curso_periodo_id: int,
+    estudiante_id: int,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Anular la inscripción de un estudiante y liberar su cupo.
+    Solo accesible para administradores.
+    """
+    if not desinscribir(db, curso_periodo_id, estudiante_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Inscripción no encontrada"
+        )
+    return None
@@ -0,0 +1,176 @@
+# app/routers/estadisticas.py
+import math
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..models import Usuario, Estudiante, EstadisticaNota, AsistenciaBitmap, CursoMateria, Materia, RolUsuario
+from ..schemas.estadisticas import AsistenciaMateriaResponse, EstadisticaMateriaResponse, RachaAusenciasResponse
+from ..schemas.jobs import JobResponse
+from ..services import asistencia
+from ..services.estadisticas import tendencia, varianza
+from ..services.jobs import encolar
+from ..dependencies.auth import get_current_user, get_current_admin
+from .jobs import job_response
+
+router = APIRouter(prefix="/api/v1/estadisticas", tags=["estadisticas"])
+
+@router.get("/estudiantes/{estudiante_id}", response_model=List[EstadisticaMateriaResponse])
+async def get_estadisticas_estudiante(
+    estudiante_id: int,
+    curso_periodo_id: Optional[int] = None,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Promedio, varianza, tendencia y última nota por materia de un estudiante.
+    Se leen de la tabla de estadísticas mantenida al registrar notas, sin recorrer las notas.
+    Un estudiante puede ver las suyas; administradores y profesores las de cualquiera.
+    """
+    estudiante = db.query(Estudiante.id, Estudiante.usuario_id).filter(Estudiante.id == estudiante_id).first()
+    if not estudiante:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Estudiante no encontrado"
+        )
+    
+    if current_user.id != estudiante.usuario_id and current_user.rol not in (RolUsuario.ADMINISTRATIVO, RolUsuario.PROFESOR):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para ver estas estadísticas"
+        )
+    
+    consulta = (
+        db.query(EstadisticaNota, CursoMateria.curso_periodo_id, Materia.nombre)
+        .join(CursoMateria, EstadisticaNota.curso_materia_id == CursoMateria.id)
+        .join(Materia, CursoMateria.materia_id == Materia.id)
+        .filter(EstadisticaNota.estudiante_id == estudiante_id)
+    )
+    if curso_periodo_id is not None:
+        consulta = consulta.filter(CursoMateria.curso_periodo_id == curso_periodo_id)
+    
+    respuesta = []
+    for estadistica, cp_id, materia in consulta.order_by(CursoMateria.curso_periodo_id, Materia.nombre):
+        var = varianza(estadistica)
+        pendiente = tendencia(estadistica)
+        respuesta.append({
+            "curso_materia_id": estadistica.curso_materia_id,
+            "curso_periodo_id": cp_id,
+            "materia": materia,
+            "cantidad": estadistica.cantidad,
+            "promedio": round(estadistica.media, 2),
+            "varianza": round(var, 2) if var is not None else None,
+            "desviacion": round(math.sqrt(var), 2) if var is not None else None,
+            "tendencia": round(pendiente, 3) if pendiente is not None else None,
+            "minimo": estadistica.minimo,
+            "maximo": estadistica.maximo,
+            "ultimo_valor": estadistica.ultimo_valor,
+            "ultima_fecha": estadistica.ultima_fecha,
+        })
+    return respuesta
+
+@router.post("/reconstruir", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def reconstruir_estadisticas(
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Encolar la reconstrucción completa de las estadísticas a partir de las notas
+    (necesaria tras cargas masivas que no pasan por el ORM).
+    Solo accesible para administradores.
+    """
+    return job_response(encolar(db, "estadisticas", {}, creado_por=current_user.id))
+
+@router.get("/estudiantes/{estudiante_id}/asistencia", response_model=List[AsistenciaMateriaResponse])
+async def get_asistencia_estudiante(
+    estudiante_id: int,
+    curso_periodo_id: Optional[int] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Clases, porcentaje de asistencia y rachas de ausencias por materia de un estudiante,
+    opcionalmente entre `desde` y `hasta`. Se calculan sobre los mapas de bits de
+    asistencia, sin recorrer las participaciones.
+    Un estudiante puede ver la suya; administradores y profesores la de cualquiera.
+    """
+    estudiante = db.query(Estudiante.id, Estudiante.usuario_id).filter(Estudiante.id == estudiante_id).first()
+    if not estudiante:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Estudiante no encontrado"
+        )
+    
+    if current_user.id != estudiante.usuario_id and current_user.rol not in (RolUsuario.ADMINISTRATIVO, RolUsuario.PROFESOR):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para ver esta asistencia"
+        )
+    
+    consulta = (
+        db.query(AsistenciaBitmap, CursoMateria.curso_periodo_id, Materia.nombre)
+        .join(CursoMateria, AsistenciaBitmap.curso_materia_id == CursoMateria.id)
+        .join(Materia, CursoMateria.materia_id == Materia.id)
+        .filter(AsistenciaBitmap.estudiante_id == estudiante_id)
+    )
+    if curso_periodo_id is not None:
+        consulta = consulta.filter(CursoMateria.curso_periodo_id == curso_periodo_id)
+    
+    return [
+        {"curso_materia_id": fila.curso_materia_id, "curso_periodo_id": cp_id, "materia": materia,
+         **asistencia.resumen(fila, desde, hasta)}
+        for fila, cp_id, materia in consulta.order_by(CursoMateria.curso_periodo_id, Materia.nombre)
+    ]
+
+@router.get("/cursos-materia/{curso_materia_id}/ausencias", response_model=List[RachaAusenciasResponse])
+async def get_ausencias_consecutivas(
+    curso_materia_id: int,
+    minimo: int = Query(3, ge=1, description="Ausencias seguidas, hasta la última clase, a partir de las cuales se lista"),
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Estudiantes de una materia que faltaron a sus últimas `minimo` clases o más,
+    de la racha más larga a la más corta.
+    Solo accesible para administradores y profesores.
+    """
+    if current_user.rol not in (RolUsuario.ADMINISTRATIVO, RolUsuario.PROFESOR):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para ver esta información"
+        )
+    
+    if not db.query(CursoMateria.id).filter(CursoMateria.id == curso_materia_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Curso-materia no encontrado"
+        )
+    
+    filas = (
+        db.query(AsistenciaBitmap, Usuario.nombre, Usuario.apellido)
+        .join(Estudiante, AsistenciaBitmap.estudiante_id == Estudiante.id)
+        .join(Usuario, Estudiante.usuario_id == Usuario.id)
+        .filter(AsistenciaBitmap.curso_materia_id == curso_materia_id)
+    )
+    respuesta = []
+    for fila, nombre, apellido in filas:
+        datos = asistencia.resumen(fila)
+        if datos["racha_ausencias"] >= minimo:
+            respuesta.append({"estudiante_id": fila.estudiante_id, "nombre": nombre, "apellido": apellido, **datos})
+    respuesta.sort(key=lambda datos: (-datos["racha_ausencias"], datos["apellido"], datos["nombre"]))
+    return respuesta
+
+@router.post("/asistencia/reconstruir", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def reconstruir_asistencia(
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Encolar la reconstrucción completa de los mapas de asistencia a partir de las
+    participaciones (necesaria tras cargas masivas que no pasan por el ORM).
+    Solo accesible para administradores.
+    """
+    return job_response(encolar(db, "asistencia", {}, creado_por=current_user.id))
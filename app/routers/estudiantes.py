@@ -1,25 +1,49 @@
 # app/routers/estudiantes.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
 from ..models import Usuario, Estudiante, Tutor, RolUsuario
-from ..schemas.users import EstudianteResponse, EstudianteCreate, EstudianteUpdate
+from ..schemas.users import (
+    EstudianteResponse, EstudianteCreate, EstudianteUpdate, BatchRequest, EstudianteBatchResponse,
+    LoteValidacionRequest, LoteValidacionResponse
+)
+from ..services.validacion import validar_estudiantes
 from ..dependencies.auth import get_current_user, get_current_admin
+from ..dependencies.fields import sparse_fields, select_fields, fields_response
 
 router = APIRouter(prefix="/api/v1/estudiantes", tags=["estudiantes"])
 
+# Campos seleccionables con ?fields= y la columna de la que sale cada uno
+CAMPOS_ESTUDIANTE = {
+    "id": Estudiante.id,
+    "usuario_id": Usuario.id,
+    "nombre": Usuario.nombre,
+    "apellido": Usuario.apellido,
+    "email": Usuario.email,
+    "direccion": Estudiante.direccion,
+    "fecha_nacimiento": Estudiante.fecha_nacimiento
+}
+
+def _select_estudiante(db: Session, campos: List[str]):
+    return select_fields(db, CAMPOS_ESTUDIANTE, campos).select_from(Estudiante).join(Usuario, Estudiante.usuario_id == Usuario.id)
+
 @router.get("/", response_model=List[EstudianteResponse])
 async def get_estudiantes(
     skip: int = 0, 
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_ESTUDIANTE)),
     current_user: Usuario = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener todos los estudiantes.
     Solo accesible para administradores.
     """
+    if campos:
+        filas = _select_estudiante(db, campos).offset(skip).limit(limit).all()
+        return fields_response(filas, campos)
+
     estudiantes = db.query(Estudiante).offset(skip).limit(limit).all()
     result = []
     for estudiante in estudiantes:
@@ -39,12 +63,14 @@ async def get_estudiantes(
 @router.get("/{usuario_id}", response_model=EstudianteResponse)
 async def get_estudiante(
     usuario_id: int,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_ESTUDIANTE)),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Obtener un estudiante por ID de usuario.
     Un estudiante puede ver su propio perfil, un administrador puede ver cualquier perfil.
+    Lee del primario porque puede crear el perfil que falta.
     """
     # Verificar si el usuario actual es el mismo que se está solicitando o es un admin
     if current_user.id != usuario_id and current_user.rol != RolUsuario.ADMINISTRATIVO:
@@ -53,6 +79,11 @@ async def get_estudiante(
             detail="No tienes permiso para ver este perfil"
         )
     
+    if campos:
+        fila = _select_estudiante(db, campos).filter(Estudiante.usuario_id == usuario_id).first()
+        if fila:
+            return fields_response(fila, campos)
+    
     # Verificar si el usuario existe
     usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
     if not usuario:
@@ -94,7 +125,7 @@ async def get_estudiante(
             )
     
     # Construir la respuesta combinando datos de ambas tablas
-    return {
+    respuesta = {
         "id": estudiante.id,
         "usuario_id": usuario.id,
         "nombre": usuario.nombre,
@@ -103,6 +134,74 @@ async def get_estudiante(
         "direccion": estudiante.direccion,
         "fecha_nacimiento": estudiante.fecha_nacimiento
     }
+    if campos:
+        return fields_response(respuesta, campos)
+    return respuesta
+
+@router.post("/batch", response_model=EstudianteBatchResponse)
+async def get_estudiantes_batch(
+    batch: BatchRequest,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtener varios estudiantes por ID de usuario en una sola consulta.
+    Aplica por cada ID los mismos permisos que GET /{usuario_id}: un estudiante solo
+    recibe su propio perfil, un administrador recibe cualquiera.
+    """
+    usuario_ids = list(dict.fromkeys(batch.usuario_ids))
+    if current_user.rol == RolUsuario.ADMINISTRATIVO:
+        permitidos, sin_permiso = usuario_ids, []
+    else:
+        permitidos = [i for i in usuario_ids if i == current_user.id]
+        sin_permiso = [i for i in usuario_ids if i != current_user.id]
+
+    filas = []
+    if permitidos:
+        filas = (
+            db.query(Estudiante, Usuario)
+            .join(Usuario, Estudiante.usuario_id == Usuario.id)
+            .filter(Estudiante.usuario_id.in_(permitidos))
+            .all()
+        )
+    por_usuario = {usuario.id: (estudiante, usuario) for estudiante, usuario in filas}
+
+    items = []
+    for usuario_id in permitidos:
+        if usuario_id not in por_usuario:
+            continue
+        estudiante, usuario = por_usuario[usuario_id]
+        items.append({
+            "id": estudiante.id,
+            "usuario_id": usuario.id,
+            "nombre": usuario.nombre,
+            "apellido": usuario.apellido,
+            "email": usuario.email,
+            "direccion": estudiante.direccion,
+            "fecha_nacimiento": estudiante.fecha_nacimiento
+        })
+
+    return {
+        "items": items,
+        "no_encontrados": [i for i in permitidos if i not in por_usuario],
+        "sin_permiso": sin_permiso
+    }
+
+@router.post("/validar-lote", response_model=LoteValidacionResponse)
+async def validar_lote_estudiantes(
+    lote: LoteValidacionRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Validar un lote de filas de estudiantes antes de una carga masiva.
+    Aplica las reglas de la creación individual columna por columna y comprueba
+    usuarios, tutores y duplicados con una consulta por columna.
+    Devuelve los errores por fila (índice desde 0). No escribe nada.
+    Solo accesible para administradores.
+    """
+    validas, errores = validar_estudiantes(db, lote.filas)
+    return {"total": len(lote.filas), "validas": len(validas), "errores": errores}
 
 @router.post("/", response_model=EstudianteResponse)
 async def create_estudiante(
@@ -0,0 +1,76 @@
+# app/routers/eventos.py
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..config import settings
+from ..database import get_read_db
+from ..models import Usuario, RolUsuario
+from ..services.eventos import CANAL_ESCUELA, broadcaster, canal_curso_periodo, formatear
+from ..dependencies.auth import get_current_user_stream, get_current_admin
+from .cursos_periodo import verificar_acceso_curso_periodo
+
+router = APIRouter(prefix="/api/v1/eventos", tags=["eventos"])
+
+@router.get("/stream")
+async def stream_eventos(
+    request: Request,
+    curso_periodo_id: Optional[int] = None,
+    current_user: Usuario = Depends(get_current_user_stream),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Canal Server-Sent Events con los cambios de notas, participaciones, inscripciones
+    y boletines a medida que se confirman.
+    Con `curso_periodo_id` se reciben solo los de ese curso-periodo (administradores y
+    profesores que dictan en él); sin él, los de toda la escuela (solo administradores).
+    El token puede enviarse en la cabecera Authorization o en `access_token`.
+    """
+    if curso_periodo_id is None:
+        if current_user.rol != RolUsuario.ADMINISTRATIVO:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Se requieren permisos de administrador"
+            )
+        canal = CANAL_ESCUELA
+    else:
+        verificar_acceso_curso_periodo(db, current_user, curso_periodo_id)
+        canal = canal_curso_periodo(curso_periodo_id)
+    # La conexión puede durar horas: no retener una conexión del pool mientras tanto
+    db.close()
+
+    suscripcion = broadcaster.suscribir([canal])
+
+    async def flujo():
+        perdidos = 0
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    mensaje = await asyncio.wait_for(suscripcion.cola.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                if suscripcion.perdidos != perdidos:
+                    yield formatear("perdidos", {"cantidad": suscripcion.perdidos - perdidos})
+                    perdidos = suscripcion.perdidos
+                yield mensaje
+        finally:
+            broadcaster.cancelar(suscripcion)
+
+    return StreamingResponse(
+        flujo(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/suscripciones")
+async def get_suscripciones(current_user: Usuario = Depends(get_current_admin)):
+    """
+    Conexiones SSE abiertas en este worker, por canal.
+    Solo accesible para administradores.
+    """
+    return broadcaster.estado()
@@ -0,0 +1,79 @@
+# app/routers/horarios.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import Usuario, CursoMateria, BloqueHorario, Profesor
+from ..schemas.horarios import ValidacionHorarioRequest, ValidacionHorarioResponse
+from ..services.horarios import validar_periodo
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/horarios", tags=["horarios"])
+
+def _validar(db: Session, datos: ValidacionHorarioRequest) -> dict:
+    profesor_ids = {a.profesor_id for a in datos.asignaciones if a.profesor_id is not None}
+    if profesor_ids:
+        existentes = {fila.id for fila in db.query(Profesor.id).filter(Profesor.id.in_(profesor_ids))}
+        faltantes = sorted(profesor_ids - existentes)
+        if faltantes:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Profesores no encontrados: {faltantes}"
+            )
+    resultado = validar_periodo(db, datos.periodo_id, datos.asignaciones)
+    if resultado["faltantes"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Curso_Materia no encontrados en el periodo {datos.periodo_id}: {resultado['faltantes']}"
+        )
+    return resultado
+
+@router.post("/validar", response_model=ValidacionHorarioResponse)
+async def validar_horario(
+    datos: ValidacionHorarioRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Validar el horario de un periodo completo sin guardarlo.
+    Devuelve todos los choques de profesor y de aula en una sola respuesta.
+    Solo accesible para administradores.
+    """
+    return _validar(db, datos)
+
+@router.put("/", response_model=ValidacionHorarioResponse)
+async def asignar_horario(
+    datos: ValidacionHorarioRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Guardar los bloques de horario de las asignaciones enviadas, reemplazando los
+    anteriores de cada Curso_Materia. Si hay choques no se guarda nada (409).
+    Solo accesible para administradores.
+    """
+    resultado = _validar(db, datos)
+    if resultado["conflictos"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "mensaje": "El horario tiene choques",
+                "conflictos": jsonable_encoder(resultado["conflictos"])
+            }
+        )
+    
+    ids = [asignacion.curso_materia_id for asignacion in datos.asignaciones]
+    cursos_materia = {cm.id: cm for cm in db.query(CursoMateria).filter(CursoMateria.id.in_(ids))}
+    db.query(BloqueHorario).filter(BloqueHorario.curso_materia_id.in_(ids)).delete(synchronize_session=False)
+    for asignacion in datos.asignaciones:
+        cm = cursos_materia[asignacion.curso_materia_id]
+        if asignacion.profesor_id is not None:
+            cm.profesor_id = asignacion.profesor_id
+        if asignacion.aula:
+            cm.aula = asignacion.aula
+        db.add_all([
+            BloqueHorario(curso_materia_id=cm.id, **bloque.model_dump())
+            for bloque in asignacion.bloques
+        ])
+    db.commit()
+    return resultado
@@ -0,0 +1,59 @@
+# app/routers/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_db
+from ..models import Usuario, Job, EstadoJob
+from ..schemas.jobs import JobResponse
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+def job_response(job: Job) -> dict:
+    respuesta = JobResponse.model_validate(job).model_dump()
+    respuesta["estado"] = job.estado.value
+    return respuesta
+
+@router.get("/", response_model=List[JobResponse])
+async def get_jobs(
+    estado: Optional[str] = None,
+    tipo: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Listar trabajos en segundo plano, los más recientes primero.
+    Solo accesible para administradores.
+    """
+    consulta = db.query(Job)
+    if estado:
+        try:
+            consulta = consulta.filter(Job.estado == EstadoJob(estado))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Estado no válido. Opciones: {', '.join(e.value for e in EstadoJob)}"
+            )
+    if tipo:
+        consulta = consulta.filter(Job.tipo == tipo)
+    return [job_response(job) for job in consulta.order_by(Job.id.desc()).offset(skip).limit(limit)]
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Consultar el estado y resultado de un trabajo.
+    Solo accesible para administradores.
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trabajo no encontrado"
+        )
+    return job_response(job)
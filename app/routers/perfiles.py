@@ -0,0 +1,53 @@
+# app/routers/perfiles.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from typing import List
+from ..models import Usuario
+from ..schemas.perfiles import PerfilResumen, PerfilResponse
+from ..services import perfiles
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/perfiles", tags=["perfiles"])
+
+def _perfil(perfil_id: str) -> dict:
+    try:
+        datos = perfiles.leer(perfil_id)
+    except ValueError:
+        datos = None
+    if datos is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil no encontrado"
+        )
+    return datos
+
+@router.get("/", response_model=List[PerfilResumen])
+async def get_perfiles(current_user: Usuario = Depends(get_current_admin)):
+    """
+    Listar los perfiles de peticiones capturados, los más recientes primero.
+    Se capturan con la cabecera `X-Profile: 1` (JWT de administrador) o por muestreo,
+    si PROFILING_ENABLED está activo.
+    Solo accesible para administradores.
+    """
+    return perfiles.listar()
+
+@router.get("/{perfil_id}", response_model=PerfilResponse)
+async def get_perfil(perfil_id: str, current_user: Usuario = Depends(get_current_admin)):
+    """
+    Detalle de un perfil: funciones más costosas y línea de tiempo de las consultas SQL.
+    Solo accesible para administradores.
+    """
+    return _perfil(perfil_id)
+
+@router.get("/{perfil_id}/descarga")
+async def descargar_perfil(perfil_id: str, current_user: Usuario = Depends(get_current_admin)):
+    """
+    Descargar el volcado de pstats del perfil (se abre con `python -m pstats` o snakeviz).
+    Solo accesible para administradores.
+    """
+    _perfil(perfil_id)
+    return FileResponse(
+        perfiles.ruta(perfil_id, "prof"),
+        media_type="application/octet-stream",
+        filename=f"{perfil_id}.prof",
+    )
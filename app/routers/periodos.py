@@ -0,0 +1,126 @@
+# app/routers/periodos.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..models import Usuario, Estudiante, Periodo, RolUsuario
+from ..schemas.jobs import JobResponse
+from ..schemas.periodos import (
+    RolloverRequest, RolloverResponse, NotaArchivadaResponse, ParticipacionArchivadaResponse
+)
+from ..services import archivo
+from ..services.jobs import encolar
+from ..services.periodos import RolloverError, rollover
+from ..dependencies.auth import get_current_user, get_current_admin
+from .jobs import job_response
+
+router = APIRouter(prefix="/api/v1/periodos", tags=["periodos"])
+
+@router.post("/rollover", response_model=RolloverResponse)
+async def rollover_periodo(
+    datos: RolloverRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Clonar los cursos de un periodo en otro: curso-periodo, materias asignadas,
+    opcionalmente bloques de horario, e inscripciones.
+    Se ejecuta en una sola transacción; con `dry_run` solo devuelve los conteos.
+    Lo que ya existe en el destino no se duplica.
+    Solo accesible para administradores.
+    """
+    try:
+        return rollover(
+            db,
+            datos.periodo_origen_id,
+            datos.periodo_destino_id,
+            incluir_inscripciones=datos.incluir_inscripciones,
+            incluir_horarios=datos.incluir_horarios,
+            dry_run=datos.dry_run,
+        )
+    except RolloverError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/{periodo_id}/archivar", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def archivar_periodo(
+    periodo_id: int,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Encolar el archivo de un periodo cerrado: sus notas y participaciones pasan a
+    archivos Arrow en disco y se borran de la base. Los boletines y las consultas
+    históricas siguen funcionando leyendo esos archivos.
+    Solo accesible para administradores.
+    """
+    if not archivo.disponible():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El archivo de periodos requiere pyarrow"
+        )
+    periodo = db.query(Periodo).filter(Periodo.id == periodo_id).first()
+    if not periodo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Periodo no encontrado"
+        )
+    if periodo.is_active or periodo.archivado_en is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Solo se pueden archivar periodos cerrados que no estén ya archivados"
+        )
+    return job_response(encolar(db, "archivo", {"periodo_id": periodo_id}, creado_por=current_user.id))
+
+def _leer_archivo(db: Session, current_user: Usuario, periodo_id: int, tabla: str,
+                  estudiante_id: Optional[int], curso_materia_id: Optional[int]) -> list:
+    periodo = db.query(Periodo.archivado_en).filter(Periodo.id == periodo_id).first()
+    if not periodo or periodo.archivado_en is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Periodo archivado no encontrado"
+        )
+    if current_user.rol not in (RolUsuario.ADMINISTRATIVO, RolUsuario.PROFESOR):
+        propio = db.query(Estudiante.id).filter(Estudiante.usuario_id == current_user.id).scalar()
+        if propio is None or estudiante_id != propio:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Solo puedes consultar tu propio historial"
+            )
+    try:
+        return archivo.leer(periodo_id, tabla, estudiante_id=estudiante_id, curso_materia_id=curso_materia_id)
+    except archivo.ArchivoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+@router.get("/{periodo_id}/archivo/notas", response_model=List[NotaArchivadaResponse])
+async def get_notas_archivadas(
+    periodo_id: int,
+    estudiante_id: Optional[int] = None,
+    curso_materia_id: Optional[int] = None,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Notas de un periodo archivado, leídas del archivo en disco.
+    Un estudiante solo puede pedir las suyas (indicando su estudiante_id).
+    """
+    return _leer_archivo(db, current_user, periodo_id, "notas", estudiante_id, curso_materia_id)
+
+@router.get("/{periodo_id}/archivo/participaciones", response_model=List[ParticipacionArchivadaResponse])
+async def get_participaciones_archivadas(
+    periodo_id: int,
+    estudiante_id: Optional[int] = None,
+    curso_materia_id: Optional[int] = None,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Asistencia y participación de un periodo archivado, leídas del archivo en disco.
+    Un estudiante solo puede pedir las suyas (indicando su estudiante_id).
+    """
+    return _leer_archivo(db, current_user, periodo_id, "participaciones", estudiante_id, curso_materia_id)
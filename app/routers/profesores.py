@@ -1,25 +1,47 @@
 # app/routers/profesores.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
 from ..models import Usuario, Profesor, RolUsuario
-from ..schemas.users import ProfesorResponse, ProfesorCreate, ProfesorUpdate
+from ..schemas.users import ProfesorResponse, ProfesorCreate, ProfesorUpdate, BatchRequest, ProfesorBatchResponse
 from ..dependencies.auth import get_current_user, get_current_admin
+from ..dependencies.fields import sparse_fields, select_fields, fields_response
 
 router = APIRouter(prefix="/api/v1/profesores", tags=["profesores"])
 
+# Campos seleccionables con ?fields= y la columna de la que sale cada uno
+CAMPOS_PROFESOR = {
+    "id": Profesor.id,
+    "usuario_id": Usuario.id,
+    "nombre": Usuario.nombre,
+    "apellido": Usuario.apellido,
+    "email": Usuario.email,
+    "telefono": Profesor.telefono,
+    "carnet_identidad": Profesor.carnet_identidad,
+    "especialidad": Profesor.especialidad,
+    "nivel_academico": Profesor.nivel_academico
+}
+
+def _select_profesor(db: Session, campos: List[str]):
+    return select_fields(db, CAMPOS_PROFESOR, campos).select_from(Profesor).join(Usuario, Profesor.usuario_id == Usuario.id)
+
 @router.get("/", response_model=List[ProfesorResponse])
 async def get_profesores(
     skip: int = 0, 
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_PROFESOR)),
     current_user: Usuario = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener todos los profesores.
     Solo accesible para administradores.
     """
+    if campos:
+        filas = _select_profesor(db, campos).offset(skip).limit(limit).all()
+        return fields_response(filas, campos)
+
     profesores = db.query(Profesor).offset(skip).limit(limit).all()
     result = []
     for profesor in profesores:
@@ -41,12 +63,14 @@ async def get_profesores(
 @router.get("/{usuario_id}", response_model=ProfesorResponse)
 async def get_profesor(
     usuario_id: int,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_PROFESOR)),
     current_user: Usuario = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Obtener un profesor por ID de usuario.
     Un profesor puede ver su propio perfil, un administrador puede ver cualquier perfil.
+    Lee del primario porque puede crear el perfil que falta.
     """
     # Verificar si el usuario actual es el mismo que se está solicitando o es un admin
     if current_user.id != usuario_id and current_user.rol != RolUsuario.ADMINISTRATIVO:
@@ -55,6 +79,11 @@ async def get_profesor(
             detail="No tienes permiso para ver este perfil"
         )
     
+    if campos:
+        fila = _select_profesor(db, campos).filter(Profesor.usuario_id == usuario_id).first()
+        if fila:
+            return fields_response(fila, campos)
+    
     # Verificar si el usuario existe
     usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
     if not usuario:
@@ -82,7 +111,7 @@ async def get_profesor(
             )
     
     # Construir la respuesta combinando datos de ambas tablas
-    return {
+    respuesta = {
         "id": profesor.id,
         "usuario_id": usuario.id,
         "nombre": usuario.nombre,
@@ -93,6 +122,60 @@ async def get_profesor(
         "especialidad": profesor.especialidad,
         "nivel_academico": profesor.nivel_academico
     }
+    if campos:
+        return fields_response(respuesta, campos)
+    return respuesta
+
+@router.post("/batch", response_model=ProfesorBatchResponse)
+async def get_profesores_batch(
+    batch: BatchRequest,
+    current_user: Usuario = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtener varios profesores por ID de usuario en una sola consulta.
+    Aplica por cada ID los mismos permisos que GET /{usuario_id}: un profesor solo
+    recibe su propio perfil, un administrador recibe cualquiera.
+    """
+    usuario_ids = list(dict.fromkeys(batch.usuario_ids))
+    if current_user.rol == RolUsuario.ADMINISTRATIVO:
+        permitidos, sin_permiso = usuario_ids, []
+    else:
+        permitidos = [i for i in usuario_ids if i == current_user.id]
+        sin_permiso = [i for i in usuario_ids if i != current_user.id]
+
+    filas = []
+    if permitidos:
+        filas = (
+            db.query(Profesor, Usuario)
+            .join(Usuario, Profesor.usuario_id == Usuario.id)
+            .filter(Profesor.usuario_id.in_(permitidos))
+            .all()
+        )
+    por_usuario = {usuario.id: (profesor, usuario) for profesor, usuario in filas}
+
+    items = []
+    for usuario_id in permitidos:
+        if usuario_id not in por_usuario:
+            continue
+        profesor, usuario = por_usuario[usuario_id]
+        items.append({
+            "id": profesor.id,
+            "usuario_id": usuario.id,
+            "nombre": usuario.nombre,
+            "apellido": usuario.apellido,
+            "email": usuario.email,
+            "telefono": profesor.telefono,
+            "carnet_identidad": profesor.carnet_identidad,
+            "especialidad": profesor.especialidad,
+            "nivel_academico": profesor.nivel_academico
+        })
+
+    return {
+        "items": items,
+        "no_encontrados": [i for i in permitidos if i not in por_usuario],
+        "sin_permiso": sin_permiso
+    }
 
 @router.post("/", response_model=ProfesorResponse)
 async def create_profesor(
@@ -0,0 +1,29 @@
+# app/routers/sync.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import get_read_db
+from ..models import Usuario
+from ..schemas.sync import SyncResponse
+from ..services.sync import cambios_desde
+from ..dependencies.auth import get_current_admin
+
+router = APIRouter(prefix="/api/v1/sync", tags=["sync"])
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    desde: int = 0,
+    limite: int = 500,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Feed de cambios para la sincronización offline de la app móvil.
+    Devuelve las filas de usuarios, tutores, estudiantes y profesores creadas o
+    modificadas después de la secuencia `desde`, y los ids eliminados.
+    El cliente guarda `watermark` y lo envía como `desde` en la siguiente llamada;
+    mientras `hay_mas` sea verdadero debe seguir pidiendo. Con `desde=0` se
+    descarga todo.
+    Solo accesible para administradores.
+    """
+    return cambios_desde(db, max(desde, 0), max(1, min(limite, settings.SYNC_MAX_PAGE_SIZE)))
@@ -1,11 +1,15 @@
 # app/routers/tutores.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models import Tutor, Usuario, RolUsuario
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..models import Tutor, Usuario, RolUsuario, Estudiante
+from ..schemas.users import EstudianteResponse
 from pydantic import BaseModel
 from ..dependencies.auth import get_current_user, get_current_admin
+from ..dependencies.fields import sparse_fields, select_fields, fields_response
+from ..services.cache import entity_cache
 
 # Schemas
 class TutorBase(BaseModel):
@@ -37,38 +41,102 @@ class TutorResponse(TutorBase):
 
 router = APIRouter(prefix="/api/v1/tutores", tags=["tutores"])
 
+# Campos seleccionables con ?fields=
+CAMPOS_TUTOR = {campo: getattr(Tutor, campo) for campo in TutorResponse.model_fields}
+
 @router.get("/", response_model=List[TutorResponse])
 async def get_tutores(
     skip: int = 0, 
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_TUTOR)),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener todos los tutores.
     Accesible para todos los usuarios autenticados.
     """
+    if campos:
+        filas = select_fields(db, CAMPOS_TUTOR, campos).offset(skip).limit(limit).all()
+        return fields_response(filas, campos)
+
     tutores = db.query(Tutor).offset(skip).limit(limit).all()
     return tutores
 
 @router.get("/{tutor_id}", response_model=TutorResponse)
 async def get_tutor(
     tutor_id: int,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_TUTOR)),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener un tutor por ID.
     Accesible para todos los usuarios autenticados.
     """
-    tutor = db.query(Tutor).filter(Tutor.id == tutor_id).first()
+    if campos:
+        tutor = select_fields(db, CAMPOS_TUTOR, campos).filter(Tutor.id == tutor_id).first()
+    else:
+        # Los tutores cambian poco; la caché se invalida en todos los workers al escribir
+        tutor = entity_cache.get("tutores", tutor_id)
+        if tutor is not None:
+            return tutor
+        version = entity_cache.version()
+        tutor = db.query(Tutor).filter(Tutor.id == tutor_id).first()
     if not tutor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tutor no encontrado"
         )
     
-    return tutor
+    if campos:
+        return fields_response(tutor, campos)
+    respuesta = TutorResponse.model_validate(tutor).model_dump()
+    # Una réplica atrasada podría devolver el valor anterior a la última invalidación
+    if not db.info.get("replica"):
+        entity_cache.set("tutores", tutor_id, respuesta, version)
+    return respuesta
+
+@router.get("/{tutor_id}/estudiantes", response_model=List[EstudianteResponse])
+async def get_tutor_estudiantes(
+    tutor_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Obtener los estudiantes de un tutor, paginados.
+    Solo accesible para administradores.
+    """
+    if not db.query(exists().where(Tutor.id == tutor_id)).scalar():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tutor no encontrado"
+        )
+    
+    # Una sola consulta con join, apoyada en el índice de estudiantes.tutor_id
+    filas = (
+        db.query(Estudiante, Usuario)
+        .join(Usuario, Estudiante.usuario_id == Usuario.id)
+        .filter(Estudiante.tutor_id == tutor_id)
+        .order_by(Estudiante.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "id": estudiante.id,
+            "usuario_id": usuario.id,
+            "nombre": usuario.nombre,
+            "apellido": usuario.apellido,
+            "email": usuario.email,
+            "direccion": estudiante.direccion,
+            "fecha_nacimiento": estudiante.fecha_nacimiento
+        }
+        for estudiante, usuario in filas
+    ]
 
 @router.post("/", response_model=TutorResponse)
 async def create_tutor(
@@ -149,8 +217,8 @@ async def delete_tutor(
             detail="Tutor no encontrado"
         )
     
-    # Verificar si hay estudiantes asociados
-    if tutor.estudiantes:
+    # Verificar si hay estudiantes asociados (EXISTS, sin cargar la colección)
+    if db.query(exists().where(Estudiante.tutor_id == tutor_id)).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No se puede eliminar un tutor con estudiantes asociados"
@@ -1,33 +1,60 @@
 # app/routers/usuarios.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
 from ..models import Usuario, RolUsuario
-from ..schemas.users import UsuarioResponse, UsuarioUpdate
+from ..schemas.users import UsuarioResponse, UsuarioUpdate, LoteValidacionRequest, LoteValidacionResponse
+from ..services.validacion import validar_usuarios
 from ..dependencies.auth import get_current_user, get_current_admin
+from ..dependencies.fields import sparse_fields, select_fields, fields_response
 
 router = APIRouter(prefix="/api/v1/usuarios", tags=["usuarios"])
 
+# Campos seleccionables con ?fields= (nunca incluye la contraseña)
+CAMPOS_USUARIO = {campo: getattr(Usuario, campo) for campo in UsuarioResponse.model_fields}
+
 @router.get("/", response_model=List[UsuarioResponse])
 async def get_usuarios(
     skip: int = 0, 
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_USUARIO)),
     current_user: Usuario = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener todos los usuarios.
     Solo accesible para administradores.
     """
+    if campos:
+        filas = select_fields(db, CAMPOS_USUARIO, campos).offset(skip).limit(limit).all()
+        return fields_response(filas, campos)
+
     usuarios = db.query(Usuario).offset(skip).limit(limit).all()
     return usuarios
 
+@router.post("/validar-lote", response_model=LoteValidacionResponse)
+async def validar_lote_usuarios(
+    lote: LoteValidacionRequest,
+    current_user: Usuario = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Validar un lote de filas de usuarios (mismos campos que el registro) antes de
+    una carga masiva: formato de email, rol, emails repetidos en el lote y ya
+    registrados (una consulta IN). Devuelve los errores por fila (índice desde 0).
+    No escribe nada.
+    Solo accesible para administradores.
+    """
+    validas, errores = validar_usuarios(db, lote.filas)
+    return {"total": len(lote.filas), "validas": len(validas), "errores": errores}
+
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
 async def get_usuario(
     usuario_id: int,
+    campos: Optional[List[str]] = Depends(sparse_fields(CAMPOS_USUARIO)),
     current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtener un usuario por ID.
@@ -40,13 +67,18 @@ async def get_usuario(
             detail="No tienes permiso para ver este perfil"
         )
     
-    usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+    if campos:
+        usuario = select_fields(db, CAMPOS_USUARIO, campos).filter(Usuario.id == usuario_id).first()
+    else:
+        usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
     if not usuario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuario no encontrado"
         )
     
+    if campos:
+        return fields_response(usuario, campos)
     return usuario
 
 @router.put("/{usuario_id}", response_model=UsuarioResponse)
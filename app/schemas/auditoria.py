@@ -0,0 +1,27 @@
+# app/schemas/auditoria.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class AuditoriaResponse(BaseModel):
+    id: int
+    usuario_id: Optional[int] = None
+    accion: str
+    entidad: str
+    entidad_id: Optional[int] = None
+    cambios: Optional[dict] = None
+    creado_en: datetime
+
+    class Config:
+        from_attributes = True
+
+class MetricasAuditoriaResponse(BaseModel):
+    modo: str
+    encolados: int
+    escritos: int
+    descartados: int
+    fallidos: int
+    lotes: int
+    en_cola: int
+    capacidad: int
+    ultimo_lote_en: Optional[datetime] = None
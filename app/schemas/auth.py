@@ -1,8 +1,9 @@
 # app/schemas/auth.py
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, EmailStr, constr, field_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
+from ..models import RolUsuario
 
 # app/schemas/auth.py
 class TokenResponse(BaseModel):
@@ -18,6 +19,15 @@ class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
+# La columna Enum(RolUsuario) guarda y lee los nombres de los miembros ("ESTUDIANTE", ...)
+ROLES = tuple(RolUsuario.__members__)
+
+def validar_rol(valor: str) -> str:
+    """Regla compartida con la validación por lotes (services/validacion.py)."""
+    if valor not in ROLES:
+        raise ValueError(f"el rol debe ser uno de: {', '.join(ROLES)}")
+    return valor
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -25,6 +35,8 @@ class UserCreate(BaseModel):
     apellido: str
     rol: str
 
+    _rol = field_validator("rol")(validar_rol)
+
 class UserResponse(BaseModel):
     id: int
     email: EmailStr
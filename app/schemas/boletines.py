@@ -0,0 +1,21 @@
+# app/schemas/boletines.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class GeneracionBoletinesRequest(BaseModel):
+    curso_periodo_id: int
+    formato: str = "html"
+    regenerar: bool = False
+
+class BoletinResponse(BaseModel):
+    id: int
+    estudiante_id: int
+    curso_periodo_id: int
+    formato: str
+    sha256: str
+    tamano: int
+    generado_en: datetime
+
+    class Config:
+        from_attributes = True
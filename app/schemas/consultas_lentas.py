@@ -0,0 +1,16 @@
+# app/schemas/consultas_lentas.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, Optional
+
+class ConsultaLentaResponse(BaseModel):
+    huella: str
+    sql: str
+    cantidad: int
+    total_ms: float
+    promedio_ms: float
+    max_ms: float
+    ultima_vez: datetime
+    rutas: Dict[str, int]
+    plan: Optional[str] = None
+    plan_en: Optional[datetime] = None
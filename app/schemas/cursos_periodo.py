@@ -0,0 +1,33 @@
+# app/schemas/cursos_periodo.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class EstudianteRosterResponse(BaseModel):
+    id: int
+    nombre: str
+    apellido: str
+
+class RosterResponse(BaseModel):
+    curso_periodo_id: int
+    total: int
+    estudiantes: List[EstudianteRosterResponse]
+
+class EstadisticasRosterResponse(BaseModel):
+    rosters: int
+    estudiantes: int
+    bytes: int
+    bytes_por_estudiante: Optional[float] = None
+    nombres_internados: int
+
+class InscripcionRequest(BaseModel):
+    estudiante_id: Optional[int] = None  # un estudiante puede omitirlo para inscribirse a sí mismo
+
+class InscripcionResponse(BaseModel):
+    id: int
+    estudiante_id: int
+    curso_periodo_id: int
+    fecha_inscripcion: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,39 @@
+# app/schemas/estadisticas.py
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+class EstadisticaMateriaResponse(BaseModel):
+    curso_materia_id: int
+    curso_periodo_id: int
+    materia: str
+    cantidad: int
+    promedio: float
+    varianza: Optional[float] = None
+    desviacion: Optional[float] = None
+    tendencia: Optional[float] = None  # puntos por nota, en orden de registro
+    minimo: Optional[float] = None
+    maximo: Optional[float] = None
+    ultimo_valor: Optional[float] = None
+    ultima_fecha: Optional[date] = None
+
+class AsistenciaMateriaResponse(BaseModel):
+    curso_materia_id: int
+    curso_periodo_id: int
+    materia: str
+    clases: int
+    asistidas: int
+    ausencias: int
+    porcentaje: Optional[float] = None
+    racha_ausencias: int  # ausencias seguidas hasta la última clase
+    racha_ausencias_maxima: int
+    ultima_clase: Optional[date] = None
+
+class RachaAusenciasResponse(BaseModel):
+    estudiante_id: int
+    nombre: str
+    apellido: str
+    racha_ausencias: int
+    clases: int
+    porcentaje: Optional[float] = None
+    ultima_clase: Optional[date] = None
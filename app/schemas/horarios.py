@@ -0,0 +1,46 @@
+# app/schemas/horarios.py
+from pydantic import BaseModel, Field, model_validator
+from datetime import time
+from typing import List, Optional
+
+class BloqueHorarioBase(BaseModel):
+    dia_semana: int = Field(..., ge=1, le=7)  # 1 = lunes ... 7 = domingo
+    hora_inicio: time
+    hora_fin: time
+
+    @model_validator(mode="after")
+    def validar_rango(self):
+        if self.hora_fin <= self.hora_inicio:
+            raise ValueError("hora_fin debe ser posterior a hora_inicio")
+        return self
+
+class AsignacionHorario(BaseModel):
+    curso_materia_id: int
+    profesor_id: Optional[int] = None
+    aula: Optional[str] = None
+    bloques: List[BloqueHorarioBase]
+
+class ValidacionHorarioRequest(BaseModel):
+    periodo_id: int
+    asignaciones: List[AsignacionHorario]
+
+class BloqueReferencia(BaseModel):
+    curso_materia_id: int
+    dia_semana: int
+    hora_inicio: time
+    hora_fin: time
+    propuesto: bool
+
+class ConflictoHorario(BaseModel):
+    tipo: str  # "profesor" o "aula"
+    recurso: str
+    dia_semana: int
+    desde: time
+    hasta: time
+    bloque_a: BloqueReferencia
+    bloque_b: BloqueReferencia
+
+class ValidacionHorarioResponse(BaseModel):
+    valido: bool
+    total_bloques: int
+    conflictos: List[ConflictoHorario]
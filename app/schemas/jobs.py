@@ -0,0 +1,20 @@
+# app/schemas/jobs.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+
+class JobResponse(BaseModel):
+    id: int
+    tipo: str
+    estado: str
+    payload: dict
+    intentos: int
+    max_intentos: int
+    disponible_en: datetime
+    resultado: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    terminado_en: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
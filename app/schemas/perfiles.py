@@ -0,0 +1,32 @@
+# app/schemas/perfiles.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class ConsultaPerfil(BaseModel):
+    inicio_ms: float
+    duracion_ms: float
+    sql: str
+    executemany: bool
+    filas: Optional[int] = None
+
+class FuncionPerfil(BaseModel):
+    funcion: str
+    llamadas: int
+    propio_ms: float
+    acumulado_ms: float
+
+class PerfilResumen(BaseModel):
+    id: str
+    metodo: str
+    ruta: str
+    query: str
+    status: Optional[int] = None
+    duracion_ms: float
+    sql_total_ms: float
+    sql_consultas: int
+    creado_en: datetime
+
+class PerfilResponse(PerfilResumen):
+    sql: List[ConsultaPerfil]
+    funciones: List[FuncionPerfil]
@@ -0,0 +1,36 @@
+# app/schemas/periodos.py
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+class RolloverRequest(BaseModel):
+    periodo_origen_id: int
+    periodo_destino_id: int
+    incluir_inscripciones: bool = True
+    incluir_horarios: bool = False
+    dry_run: bool = False
+
+class RolloverResponse(BaseModel):
+    dry_run: bool
+    cursos_periodo: int
+    cursos_materia: int
+    bloques_horario: Optional[int] = None
+    inscripciones: Optional[int] = None
+
+class NotaArchivadaResponse(BaseModel):
+    id: int
+    estudiante_id: int
+    curso_materia_id: int
+    valor: float
+    fecha: date
+    descripcion: Optional[str] = None
+    rendimiento: Optional[str] = None
+
+class ParticipacionArchivadaResponse(BaseModel):
+    id: int
+    estudiante_id: int
+    curso_materia_id: int
+    asistencia: bool
+    participacion_clase: Optional[int] = None
+    fecha: date
+    observacion: Optional[str] = None
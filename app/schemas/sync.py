@@ -0,0 +1,10 @@
+# app/schemas/sync.py
+from pydantic import BaseModel
+from typing import Dict, List
+
+class SyncResponse(BaseModel):
+    desde: int
+    watermark: int
+    hay_mas: bool
+    cambios: Dict[str, List[dict]]
+    eliminados: Dict[str, List[int]]
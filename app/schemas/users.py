@@ -1,7 +1,16 @@
 # app/schemas/users.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from ..config import settings
+
+FECHA_NACIMIENTO_MINIMA = datetime(1900, 1, 1)
+
+def validar_fecha_nacimiento(valor: Optional[datetime]) -> Optional[datetime]:
+    """Regla compartida con la validación por lotes (services/validacion.py)."""
+    if valor is not None and not FECHA_NACIMIENTO_MINIMA <= valor.replace(tzinfo=None) <= datetime.utcnow():
+        raise ValueError("la fecha de nacimiento debe estar entre 1900-01-01 y hoy")
+    return valor
 
 class EstudianteResponse(BaseModel):
     id: int
@@ -35,11 +44,15 @@ class EstudianteCreate(BaseModel):
     direccion: Optional[str] = None
     fecha_nacimiento: Optional[datetime] = None
 
+    _fecha_nacimiento = field_validator("fecha_nacimiento")(validar_fecha_nacimiento)
+
 class EstudianteUpdate(BaseModel):
     tutor_id: Optional[int] = None
     direccion: Optional[str] = None
     fecha_nacimiento: Optional[datetime] = None
 
+    _fecha_nacimiento = field_validator("fecha_nacimiento")(validar_fecha_nacimiento)
+
 class ProfesorCreate(BaseModel):
     usuario_id: int
     telefono: Optional[str] = None
@@ -70,4 +83,32 @@ class UsuarioUpdate(BaseModel):
     nombre: Optional[str] = None
     apellido: Optional[str] = None
     email: Optional[str] = None
-    is_active: Optional[bool] = None
\ No newline at end of file
+    is_active: Optional[bool] = None
+
+class BatchRequest(BaseModel):
+    usuario_ids: List[int] = Field(..., min_length=1, max_length=settings.BATCH_MAX_IDS)
+
+class EstudianteBatchResponse(BaseModel):
+    items: List[EstudianteResponse]
+    no_encontrados: List[int] = []
+    sin_permiso: List[int] = []
+
+class ProfesorBatchResponse(BaseModel):
+    items: List[ProfesorResponse]
+    no_encontrados: List[int] = []
+    sin_permiso: List[int] = []
+
+class LoteValidacionRequest(BaseModel):
+    # Filas sin tipar: los errores de cada fila se informan por separado en vez de rechazar todo el lote
+    filas: List[Dict[str, Any]] = Field(..., min_length=1, max_length=settings.VALIDACION_MAX_FILAS)
+
+class ErrorFila(BaseModel):
+    fila: int
+    campo: str
+    tipo: str
+    mensaje: str
+
+class LoteValidacionResponse(BaseModel):
+    total: int
+    validas: int
+    errores: List[ErrorFila]
@@ -0,0 +1,238 @@
+# app/services/archivo.py
+"""
+Archivo frío de periodos cerrados.
+
+Las notas y participaciones de un periodo cerrado (is_active = false) se exportan
+a archivos Arrow IPC comprimidos en ARCHIVO_DIR/periodo_<id>/ (ARCHIVO_DIR/<colegio>/...
+con varios colegios) y se borran de las tablas vivas; `periodos.archivado_en` marca el periodo como archivado.
+Las estadísticas de notas (estadisticas_notas) se conservan en la base.
+
+Las lecturas históricas abren los archivos con memory-map (pyarrow.memory_map) y
+filtran con pyarrow.compute; las tablas abiertas se guardan en un LRU pequeño.
+Con ARCHIVO_COMPRESSION=none la lectura no copia datos; con zstd/lz4 los
+archivos ocupan mucho menos pero cada columna se descomprime al abrirla.
+
+pyarrow es opcional: sin él no se puede archivar ni leer el archivo.
+
+Uso:
+    python -m app.services.archivo <periodo_id> [--colegio codigo]
+"""
+import argparse
+import os
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..core.tenancy import en_colegio, tenant_actual
+from ..database import sesion_de
+from ..models import CursoMateria, CursoPeriodo, Nota, Participacion, Periodo
+from .jobs import job_handler
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+except ImportError:  # pyarrow es opcional; sin él no hay archivo frío
+    pa = None
+
+# ids por sentencia al borrar las filas exportadas
+LOTE_BORRADO = 10000
+
+# tabla -> (modelo, [(columna, tipo arrow)])
+TABLAS = {
+    "notas": (Nota, [
+        ("id", "int64"), ("estudiante_id", "int32"), ("curso_materia_id", "int32"), ("valor", "float64"),
+        ("fecha", "date32"), ("descripcion", "string"), ("rendimiento", "string"),
+    ]),
+    "participaciones": (Participacion, [
+        ("id", "int64"), ("estudiante_id", "int32"), ("curso_materia_id", "int32"), ("asistencia", "bool_"),
+        ("participacion_clase", "int32"), ("fecha", "date32"), ("observacion", "string"),
+    ]),
+}
+
+
+class ArchivoError(ValueError):
+    pass
+
+
+def disponible() -> bool:
+    return pa is not None
+
+
+def ruta_archivo(periodo_id: int, tabla: str) -> str:
+    colegio = tenant_actual.get()
+    base = settings.ARCHIVO_DIR if colegio is None else os.path.join(settings.ARCHIVO_DIR, colegio)
+    return os.path.join(base, f"periodo_{periodo_id}", f"{tabla}.arrow")
+
+
+def _esquema(columnas):
+    return pa.schema([(nombre, getattr(pa, tipo)()) for nombre, tipo in columnas])
+
+
+def _cursos_materia(periodo_id: int):
+    return (
+        select(CursoMateria.id)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .where(CursoPeriodo.periodo_id == periodo_id)
+    )
+
+
+def _exportar(db: Session, periodo_id: int, tabla: str, lote: int) -> array:
+    """Escribe las filas del periodo en un archivo temporal y lo mueve a su lugar. Devuelve sus ids."""
+    modelo, columnas = TABLAS[tabla]
+    esquema = _esquema(columnas)
+    ruta = ruta_archivo(periodo_id, tabla)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    compresion = None if settings.ARCHIVO_COMPRESSION == "none" else settings.ARCHIVO_COMPRESSION
+
+    filas = db.execute(
+        select(*[getattr(modelo, nombre) for nombre, _ in columnas])
+        .where(modelo.curso_materia_id.in_(_cursos_materia(periodo_id)))
+        .order_by(modelo.curso_materia_id, modelo.estudiante_id, modelo.id)
+        .execution_options(yield_per=lote)
+    )
+    ids = array("q")
+    with pa.OSFile(temporal, "wb") as destino:
+        with ipc.new_file(destino, esquema, options=ipc.IpcWriteOptions(compression=compresion)) as escritor:
+            for parte in filas.partitions(lote):
+                escritor.write_batch(pa.RecordBatch.from_arrays(
+                    [pa.array([fila[i] for fila in parte], type=campo.type) for i, campo in enumerate(esquema)],
+                    schema=esquema,
+                ))
+                ids.extend(fila[0] for fila in parte)  # "id" es la primera columna
+    os.replace(temporal, ruta)
+    return ids
+
+
+def _borrar_exportadas(db: Session, modelo, ids: array) -> None:
+    for inicio in range(0, len(ids), LOTE_BORRADO):
+        db.execute(delete(modelo).where(modelo.id.in_(ids[inicio:inicio + LOTE_BORRADO].tolist())))
+
+
+def archivar(db: Session, periodo_id: int, lote: int = 50000) -> dict:
+    """
+    Exporta y borra las notas y participaciones de un periodo cerrado. Los archivos
+    se escriben completos antes de borrar nada; el borrado y la marca se confirman
+    en la misma transacción, así un fallo a mitad deja el periodo sin archivar.
+    Solo se borran las filas exportadas; si se escribieron otras del periodo
+    mientras tanto no se archiva nada y hay que volver a intentarlo.
+    """
+    if not disponible():
+        raise ArchivoError("pyarrow no está instalado")
+    periodo = db.query(Periodo).filter(Periodo.id == periodo_id).with_for_update().first()
+    if periodo is None:
+        raise ArchivoError(f"Periodo {periodo_id} no encontrado")
+    if periodo.is_active:
+        raise ArchivoError("Solo se pueden archivar periodos cerrados (is_active = false)")
+    if periodo.archivado_en is not None:
+        raise ArchivoError(f"El periodo {periodo_id} ya está archivado")
+
+    resumen = {"periodo_id": periodo_id}
+    try:
+        exportadas = {}
+        for tabla in TABLAS:
+            exportadas[tabla] = _exportar(db, periodo_id, tabla, lote)
+            resumen[tabla] = len(exportadas[tabla])
+            resumen[f"{tabla}_bytes"] = os.path.getsize(ruta_archivo(periodo_id, tabla))
+        for tabla, (modelo, _) in TABLAS.items():
+            _borrar_exportadas(db, modelo, exportadas[tabla])
+            nuevas = db.execute(
+                select(func.count()).select_from(modelo)
+                .where(modelo.curso_materia_id.in_(_cursos_materia(periodo_id)))
+            ).scalar()
+            if nuevas:
+                raise ArchivoError(f"Se escribieron {nuevas} filas en {tabla} del periodo {periodo_id} "
+                                   "durante el archivado; vuelva a intentarlo")
+        periodo.archivado_en = datetime.utcnow()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return resumen
+
+
+_abiertas = OrderedDict()
+_lock = Lock()
+
+
+def abrir(periodo_id: int, tabla: str):
+    """Tabla Arrow del archivo, abierta con memory-map y guardada en un LRU."""
+    if not disponible():
+        raise ArchivoError("pyarrow no está instalado")
+    clave = (tenant_actual.get(), periodo_id, tabla)
+    with _lock:
+        if clave in _abiertas:
+            _abiertas.move_to_end(clave)
+            return _abiertas[clave]
+    ruta = ruta_archivo(periodo_id, tabla)
+    if not os.path.exists(ruta):
+        raise ArchivoError(f"No existe el archivo {tabla} del periodo {periodo_id}")
+    datos = ipc.open_file(pa.memory_map(ruta, "r")).read_all()
+    with _lock:
+        _abiertas[clave] = datos
+        while len(_abiertas) > settings.ARCHIVO_TABLAS_ABIERTAS:
+            _abiertas.popitem(last=False)
+    return datos
+
+
+def _filtrar(datos, **filtros):
+    mascara = None
+    for columna, valor in filtros.items():
+        if valor is None:
+            continue
+        condicion = pc.is_in(datos[columna], value_set=pa.array(valor, type=datos.schema.field(columna).type)) \
+            if isinstance(valor, (list, tuple, set)) else pc.equal(datos[columna], valor)
+        mascara = condicion if mascara is None else pc.and_(mascara, condicion)
+    return datos if mascara is None else datos.filter(mascara)
+
+
+def leer(periodo_id: int, tabla: str, estudiante_id: int = None, curso_materia_id: int = None) -> list:
+    return _filtrar(abrir(periodo_id, tabla), estudiante_id=estudiante_id,
+                    curso_materia_id=curso_materia_id).to_pylist()
+
+
+def agregar_asistencia(periodo_id: int, cm_ids, estudiante_ids=None) -> dict:
+    """Mismo agregado que boletines hace sobre `participaciones`, leído del archivo."""
+    datos = _filtrar(abrir(periodo_id, "participaciones"), curso_materia_id=list(cm_ids),
+                     estudiante_id=list(estudiante_ids) if estudiante_ids is not None else None)
+    datos = datos.append_column("asistida", pc.cast(datos["asistencia"], pa.int32()))
+    agregado = datos.group_by(["estudiante_id", "curso_materia_id"]).aggregate([
+        ("id", "count"), ("asistida", "sum"), ("participacion_clase", "mean"),
+    ])
+    return {
+        (fila["estudiante_id"], fila["curso_materia_id"]): {
+            "clases": fila["id_count"], "asistidas": fila["asistida_sum"] or 0,
+            "participacion": fila["participacion_clase_mean"],
+        }
+        for fila in agregado.to_pylist()
+    }
+
+
+@job_handler("archivo")
+def procesar_job_archivo(db: Session, payload: dict) -> dict:
+    return archivar(db, payload["periodo_id"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archiva las notas y participaciones de un periodo cerrado")
+    parser.add_argument("periodo_id", type=int)
+    parser.add_argument("--colegio", help="código del colegio (con TENANCY_ENABLED)")
+    args = parser.parse_args()
+    with en_colegio(args.colegio):
+        db = sesion_de(args.colegio)
+        try:
+            resumen = archivar(db, args.periodo_id)
+        except ArchivoError as e:
+            parser.exit(1, f"{e}\n")
+        finally:
+            db.close()
+    print(f"Periodo {args.periodo_id} archivado: {resumen['notas']} notas ({resumen['notas_bytes']} bytes), "
+          f"{resumen['participaciones']} participaciones ({resumen['participaciones_bytes']} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# app/services/asistencia.py
+"""
+Resúmenes de asistencia por estudiante y materia codificados como mapas de bits.
+
+La tabla `asistencia_bitmaps` guarda por (estudiante, curso_materia), y cada
+curso_materia pertenece a un solo periodo, dos mapas de bits de días contados
+desde `desde` (el inicio del periodo):
+- `clases`: el bit i indica que hubo al menos una participación el día desde + i.
+- `presentes`: el bit i indica que ese día asistió.
+Un año lectivo ocupa menos de 50 bytes por mapa. Se actualizan en la misma
+transacción que escribe las participaciones (evento after_flush), como
+estadisticas_notas.
+
+Porcentajes y filtros por rango de fechas son máscaras y `int.bit_count()` sobre
+enteros de Python; las rachas de ausencias recorren solo los bits de clase. Nada
+de esto toca `participaciones`. Las rachas se cuentan en clases: los fines de
+semana y los días sin clase de la materia no las cortan. Un día con varias
+participaciones cuenta como una clase, asistida si alguna dice que asistió.
+
+Las inserciones masivas con Core (p. ej. synthetic_data) no pasan por el ORM;
+después hay que reconstruir la tabla:
+    python -m app.services.asistencia [--colegio codigo]
+o encolar el trabajo "asistencia" (POST /api/v1/estadisticas/asistencia/reconstruir).
+Los mapas de periodos archivados se conservan al reconstruir.
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from sqlalchemy import delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from ..core.tenancy import en_colegio
+from ..database import SessionLocal, sesion_de
+from ..models import AsistenciaBitmap, CursoMateria, CursoPeriodo, Participacion, Periodo
+from .jobs import job_handler
+
+tabla = AsistenciaBitmap.__table__
+
+
+def a_entero(datos: bytes) -> int:
+    return int.from_bytes(datos or b"", "little")
+
+
+def a_bytes(valor: int) -> bytes:
+    return valor.to_bytes((valor.bit_length() + 7) // 8, "little")
+
+
+def codificar(desde, dias) -> tuple:
+    """(clases, presentes) de una secuencia de (fecha, asistencia) con el bit 0 en `desde`."""
+    clases = presentes = 0
+    for fecha, asistio in dias:
+        bit = 1 << (fecha - desde).days
+        clases |= bit
+        if asistio:
+            presentes |= bit
+    return clases, presentes
+
+
+def mascara(desde, inicio=None, fin=None):
+    """Bits de los días entre `inicio` y `fin` (inclusive); None si no hay filtro."""
+    if inicio is None and fin is None:
+        return None
+    primero = max((inicio - desde).days, 0) if inicio is not None else 0
+    if fin is None:
+        return ~((1 << primero) - 1)
+    ultimo = (fin - desde).days + 1
+    if ultimo <= primero:
+        return 0
+    return ((1 << ultimo) - 1) ^ ((1 << primero) - 1)
+
+
+def rachas(clases: int, presentes: int) -> tuple:
+    """(actual, máxima) de ausencias en clases consecutivas; la actual llega hasta la última clase."""
+    ausentes = clases & ~presentes
+    if not ausentes:
+        return 0, 0
+    actual = maxima = 0
+    while clases:
+        bit = clases & -clases
+        actual = actual + 1 if ausentes & bit else 0
+        maxima = max(maxima, actual)
+        clases ^= bit
+    return actual, maxima
+
+
+def resumen(fila, inicio=None, fin=None) -> dict:
+    """Clases, asistencias, porcentaje y rachas de una fila de asistencia_bitmaps, opcionalmente en un rango."""
+    clases, presentes = a_entero(fila.clases), a_entero(fila.presentes)
+    filtro = mascara(fila.desde, inicio, fin)
+    if filtro is not None:
+        clases &= filtro
+        presentes &= filtro
+    total, asistidas = clases.bit_count(), presentes.bit_count()
+    actual, maxima = rachas(clases, presentes)
+    return {
+        "clases": total,
+        "asistidas": asistidas,
+        "ausencias": total - asistidas,
+        "porcentaje": round(100 * asistidas / total, 1) if total else None,
+        "racha_ausencias": actual,
+        "racha_ausencias_maxima": maxima,
+        "ultima_clase": fila.desde + timedelta(days=clases.bit_length() - 1) if clases else None,
+    }
+
+
+def _inicios(conexion, curso_materia_ids) -> dict:
+    """curso_materia_id -> fecha_inicio de su periodo (o None)."""
+    return dict(conexion.execute(
+        select(CursoMateria.id, Periodo.fecha_inicio)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .join(Periodo, CursoPeriodo.periodo_id == Periodo.id)
+        .where(CursoMateria.id.in_(curso_materia_ids))
+    ).all())
+
+
+def _desde(inicio_periodo, dias) -> date:
+    fechas = [fecha for fecha, _ in dias]
+    return min(fechas + [inicio_periodo]) if inicio_periodo is not None else min(fechas)
+
+
+def _asegurar_fila(conexion, clave, desde) -> None:
+    """Crea la fila vacía si falta, sin chocar con otra transacción que la cree a la vez."""
+    fila = {"estudiante_id": clave[0], "curso_materia_id": clave[1], "desde": desde, "clases": b"", "presentes": b""}
+    dialecto = conexion.dialect.name
+    if dialecto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif dialecto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        if conexion.execute(select(tabla.c.id).where(
+            (tabla.c.estudiante_id == clave[0]) & (tabla.c.curso_materia_id == clave[1])
+        )).first() is None:
+            conexion.execute(insert(tabla), [fila])
+        return
+    conexion.execute(insert_dialecto(tabla).on_conflict_do_nothing(), [fila])
+
+
+def _combinar(conexion, clave, dias: list, inicio_periodo) -> None:
+    """Agrega días nuevos a los mapas existentes (bloqueando la fila mientras tanto)."""
+    _asegurar_fila(conexion, clave, _desde(inicio_periodo, dias))
+    filtro = (tabla.c.estudiante_id == clave[0]) & (tabla.c.curso_materia_id == clave[1])
+    fila = conexion.execute(
+        select(tabla.c.desde, tabla.c.clases, tabla.c.presentes).where(filtro).with_for_update()
+    ).one()
+    desde, clases, presentes = fila.desde, a_entero(fila.clases), a_entero(fila.presentes)
+    primero = min(fecha for fecha, _ in dias)
+    if primero < desde:
+        # Participación anterior al bit 0: se corren los mapas para hacerle lugar
+        corrimiento = (desde - primero).days
+        clases, presentes, desde = clases << corrimiento, presentes << corrimiento, primero
+    nuevas_clases, nuevos_presentes = codificar(desde, dias)
+    conexion.execute(update(tabla).where(filtro).values(
+        desde=desde, clases=a_bytes(clases | nuevas_clases), presentes=a_bytes(presentes | nuevos_presentes),
+        actualizado_en=datetime.utcnow(),
+    ))
+
+
+def recalcular(conexion, clave, inicio_periodo) -> None:
+    dias = conexion.execute(
+        select(Participacion.fecha, Participacion.asistencia)
+        .where(Participacion.estudiante_id == clave[0], Participacion.curso_materia_id == clave[1])
+    ).all()
+    filtro = (tabla.c.estudiante_id == clave[0]) & (tabla.c.curso_materia_id == clave[1])
+    if not dias:
+        conexion.execute(delete(tabla).where(filtro))
+        return
+    desde = _desde(inicio_periodo, dias)
+    clases, presentes = codificar(desde, dias)
+    _asegurar_fila(conexion, clave, desde)
+    conexion.execute(update(tabla).where(filtro).values(
+        desde=desde, clases=a_bytes(clases), presentes=a_bytes(presentes), actualizado_en=datetime.utcnow(),
+    ))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _actualizar_asistencia(session, flush_context):
+    nuevas = {}
+    recalcular_claves = set()
+    for objeto in session.new:
+        if isinstance(objeto, Participacion):
+            nuevas.setdefault((objeto.estudiante_id, objeto.curso_materia_id), []).append(
+                (objeto.fecha, objeto.asistencia is not False))  # la columna tiene default True
+    for objeto in list(session.dirty) + list(session.deleted):
+        if not isinstance(objeto, Participacion):
+            continue
+        estado = inspect(objeto)
+        recalcular_claves.add((objeto.estudiante_id, objeto.curso_materia_id))
+        # Si la participación cambió de estudiante o materia también cambia el mapa de origen
+        anterior_estudiante = estado.attrs.estudiante_id.history.deleted
+        anterior_materia = estado.attrs.curso_materia_id.history.deleted
+        if anterior_estudiante or anterior_materia:
+            recalcular_claves.add((
+                anterior_estudiante[0] if anterior_estudiante else objeto.estudiante_id,
+                anterior_materia[0] if anterior_materia else objeto.curso_materia_id,
+            ))
+    if not nuevas and not recalcular_claves:
+        return
+
+    conexion = session.connection()
+    inicios = _inicios(conexion, {cm for _, cm in list(nuevas) + list(recalcular_claves)})
+    for clave, dias in nuevas.items():
+        if clave not in recalcular_claves:
+            _combinar(conexion, clave, dias, inicios.get(clave[1]))
+    for clave in recalcular_claves:
+        recalcular(conexion, clave, inicios.get(clave[1]))
+
+
+def reconstruir(db: Session, lote: int = 5000) -> dict:
+    """
+    Recalcula toda la tabla en una pasada ordenada sobre `participaciones`. No hace commit.
+    Las filas de periodos archivados se conservan: sus participaciones ya no están en la tabla.
+    """
+    archivadas = (
+        select(CursoMateria.id)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .join(Periodo, CursoPeriodo.periodo_id == Periodo.id)
+        .where(Periodo.archivado_en.is_not(None))
+    )
+    db.execute(delete(tabla).where(tabla.c.curso_materia_id.not_in(archivadas)))
+    inicios = dict(db.execute(
+        select(CursoMateria.id, Periodo.fecha_inicio)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .join(Periodo, CursoPeriodo.periodo_id == Periodo.id)
+    ).all())
+    filas = db.execute(
+        select(Participacion.estudiante_id, Participacion.curso_materia_id, Participacion.fecha,
+               Participacion.asistencia)
+        .order_by(Participacion.estudiante_id, Participacion.curso_materia_id)
+        .execution_options(yield_per=lote)
+    )
+    ahora = datetime.utcnow()
+    buffer = []
+    resultado = {"filas": 0, "participaciones": 0, "bytes": 0}
+    for clave, grupo in groupby(filas, key=lambda fila: (fila[0], fila[1])):
+        dias = [(fila[2], fila[3]) for fila in grupo]
+        desde = _desde(inicios.get(clave[1]), dias)
+        clases, presentes = codificar(desde, dias)
+        buffer.append({"estudiante_id": clave[0], "curso_materia_id": clave[1], "desde": desde,
+                       "clases": a_bytes(clases), "presentes": a_bytes(presentes), "actualizado_en": ahora})
+        resultado["participaciones"] += len(dias)
+        resultado["bytes"] += len(buffer[-1]["clases"]) + len(buffer[-1]["presentes"])
+        if len(buffer) >= lote:
+            db.execute(insert(tabla), buffer)
+            resultado["filas"] += len(buffer)
+            buffer = []
+    if buffer:
+        db.execute(insert(tabla), buffer)
+        resultado["filas"] += len(buffer)
+    return resultado
+
+
+@job_handler("asistencia")
+def procesar_job_asistencia(db: Session, payload: dict) -> dict:
+    resultado = reconstruir(db)
+    db.commit()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye la tabla asistencia_bitmaps a partir de participaciones")
+    parser.add_argument("--colegio", help="código del colegio (con TENANCY_ENABLED)")
+    args = parser.parse_args()
+    with en_colegio(args.colegio):
+        inicio = time.perf_counter()
+        db = sesion_de(args.colegio)
+        try:
+            resultado = reconstruir(db)
+            db.commit()
+        finally:
+            db.close()
+        print(f"Asistencia reconstruida: {resultado['filas']} mapas ({resultado['bytes']} bytes) de "
+              f"{resultado['participaciones']} participaciones en {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
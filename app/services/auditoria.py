@@ -0,0 +1,196 @@
+# app/services/auditoria.py
+"""
+Registro de auditoría de usuarios, estudiantes, profesores y tutores.
+
+Los cambios se capturan con eventos de sesión (after_flush), se confirman en
+after_commit y se encolan en una cola acotada en memoria. Un hilo los escribe en
+la tabla `auditoria` con INSERT por lotes cuando se junta AUDIT_BATCH_SIZE o pasa
+AUDIT_FLUSH_INTERVAL_SECONDS, así los endpoints no pagan un viaje extra a la BD.
+
+Si la cola se llena los registros nuevos se descartan (no se bloquea la petición)
+y se cuentan en las métricas. AUDIT_MODE=sync escribe cada commit de inmediato
+(útil en pruebas); AUDIT_MODE=off desactiva el registro.
+
+Con varios colegios cada registro se encola con el colegio de la sesión y el hilo
+escribe cada lote en la base de ese colegio.
+
+Igual que con la invalidación de caché, las escrituras con insert()/update() de
+Core no pasan por el ORM y no quedan auditadas.
+"""
+import enum
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime
+from sqlalchemy import event, insert, inspect
+from ..config import settings
+from ..database import SessionLocal, engine, tenants
+from ..models import Auditoria
+
+logger = logging.getLogger("uvicorn.error")
+
+ENTIDADES_AUDITADAS = {"usuarios", "estudiantes", "profesores", "tutores"}
+CAMPOS_OCULTOS = {"password"}
+
+
+def _valor(valor):
+    if isinstance(valor, enum.Enum):
+        return valor.value
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def _cambios(objeto, accion: str) -> dict:
+    """{campo: [antes, después]} de las columnas modificadas del objeto."""
+    estado = inspect(objeto)
+    cambios = {}
+    for columna in estado.mapper.column_attrs:
+        campo = columna.key
+        if accion == "update":
+            historial = estado.attrs[campo].history
+            if not historial.has_changes():
+                continue
+            antes = historial.deleted[0] if historial.deleted else None
+            despues = historial.added[0] if historial.added else None
+        elif accion == "insert":
+            antes, despues = None, getattr(objeto, campo)
+        else:
+            antes, despues = getattr(objeto, campo), None
+        if campo in CAMPOS_OCULTOS:
+            antes = "***" if antes is not None else None
+            despues = "***" if despues is not None else None
+        cambios[campo] = [_valor(antes), _valor(despues)]
+    return cambios
+
+
+class AuditLog:
+    def __init__(self, modo: str, capacidad: int, tamano_lote: int, intervalo: float):
+        self.modo = modo
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._detener = threading.Event()
+        self._hilo = None
+        self._lock = threading.Lock()
+        self._metricas = {"encolados": 0, "escritos": 0, "descartados": 0, "fallidos": 0, "lotes": 0}
+        self._ultimo_lote_en = None
+
+    def _sumar(self, metrica: str, cantidad: int = 1) -> None:
+        with self._lock:
+            self._metricas[metrica] += cantidad
+
+    def registrar(self, registros: list, colegio: str = None) -> None:
+        if not registros or self.modo == "off":
+            return
+        if self.modo == "sync":
+            self._sumar("encolados", len(registros))
+            self._escribir(registros, colegio)
+            return
+        for registro in registros:
+            try:
+                self._cola.put_nowait((colegio, registro))
+                self._sumar("encolados")
+            except queue.Full:
+                self._sumar("descartados")
+                if self._metricas["descartados"] % 1000 == 1:
+                    logger.warning("Cola de auditoría llena: %s registros descartados", self._metricas["descartados"])
+
+    def _escribir(self, registros: list, colegio: str = None) -> None:
+        try:
+            with (engine if colegio is None else tenants.engine(colegio)).begin() as conexion:
+                conexion.execute(insert(Auditoria), registros)
+            self._sumar("escritos", len(registros))
+            self._sumar("lotes")
+            self._ultimo_lote_en = datetime.utcnow()
+        except Exception as e:
+            self._sumar("fallidos", len(registros))
+            logger.warning("No se pudo escribir un lote de %s registros de auditoría: %s", len(registros), e)
+
+    def _bucle(self) -> None:
+        lote = []
+        limite = time.monotonic() + self.intervalo
+        while True:
+            restante = limite - time.monotonic()
+            try:
+                lote.append(self._cola.get(timeout=max(restante, 0)))
+            except queue.Empty:
+                pass
+            if len(lote) >= self.tamano_lote or time.monotonic() >= limite:
+                por_colegio = {}
+                for colegio, registro in lote:
+                    por_colegio.setdefault(colegio, []).append(registro)
+                for colegio, registros in por_colegio.items():
+                    self._escribir(registros, colegio)
+                lote = []
+                limite = time.monotonic() + self.intervalo
+                if self._detener.is_set() and self._cola.empty():
+                    return
+
+    def start(self) -> None:
+        if self.modo != "async" or self._hilo is not None:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="audit-log", daemon=True)
+        self._hilo.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Detiene el hilo después de escribir lo que quede en la cola."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=timeout)
+            self._hilo = None
+
+    def metricas(self) -> dict:
+        with self._lock:
+            metricas = dict(self._metricas)
+        return {
+            "modo": self.modo,
+            **metricas,
+            "en_cola": self._cola.qsize(),
+            "capacidad": self._cola.maxsize,
+            "ultimo_lote_en": self._ultimo_lote_en,
+        }
+
+
+audit_log = AuditLog(
+    settings.AUDIT_MODE,
+    settings.AUDIT_QUEUE_SIZE,
+    settings.AUDIT_BATCH_SIZE,
+    settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _recolectar_auditoria(session, flush_context):
+    if audit_log.modo == "off":
+        return
+    registros = session.info.setdefault("auditoria", [])
+    ahora = datetime.utcnow()
+    for accion, objetos in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for objeto in objetos:
+            entidad = getattr(objeto, "__tablename__", None)
+            if entidad not in ENTIDADES_AUDITADAS:
+                continue
+            cambios = _cambios(objeto, accion)
+            if not cambios:
+                continue
+            registros.append({
+                "usuario_id": session.info.get("usuario_id"),
+                "accion": accion,
+                "entidad": entidad,
+                "entidad_id": getattr(objeto, "id", None),
+                "cambios": cambios,
+                "creado_en": ahora,
+            })
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _encolar_auditoria(session):
+    audit_log.registrar(session.info.pop("auditoria", None), session.info.get("colegio"))
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_auditoria(session):
+    session.info.pop("auditoria", None)
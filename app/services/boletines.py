@@ -0,0 +1,268 @@
+# app/services/boletines.py
+"""
+Generación de boletines (libretas de notas) por curso-periodo.
+
+Los datos de todo el curso-periodo se cargan en unas pocas consultas agregadas
+(inscritos, materias, notas y asistencia) y luego se renderiza un archivo por
+estudiante en un pool de BOLETINES_HILOS hilos; la sesión solo se usa desde el
+hilo del trabajo. Los archivos se guardan en disco direccionados por su SHA-256, así
+las descargas se sirven directamente desde el archivo y no se regeneran.
+La generación corre como trabajo "boletines" de la cola (services/jobs.py).
+"""
+import csv
+import hashlib
+import html
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models import (
+    Boletin, Curso, CursoMateria, CursoPeriodo, Materia,
+    EstadisticaNota, Participacion, Periodo, Profesor, Usuario,
+)
+from . import archivo
+from .jobs import job_handler
+from .particiones import filtro_periodo
+from .roster import roster_cache
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+except ImportError:  # reportlab es opcional; sin él no se ofrece PDF
+    canvas = None
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+
+
+def formatos_disponibles() -> list:
+    return [formato for formato in MEDIA_TYPES if formato != "pdf" or canvas is not None]
+
+
+def ruta_absoluta(ruta_relativa: str) -> str:
+    return os.path.join(settings.BOLETINES_DIR, ruta_relativa)
+
+
+# --- Carga de datos por lotes -------------------------------------------------
+
+def cargar_datos_curso_periodo(db: Session, curso_periodo_id: int, estudiante_ids=None) -> dict:
+    """Carga en 5 consultas (4 si el roster está en caché) todo lo necesario para los boletines de un curso-periodo."""
+    cabecera = (
+        db.query(CursoPeriodo.id, Curso.nombre.label("curso"), CursoPeriodo.aula, CursoPeriodo.turno,
+                 Periodo.id.label("periodo_id"), Periodo.bimestre, Periodo.anio, Periodo.fecha_inicio,
+                 Periodo.fecha_fin, Periodo.archivado_en)
+        .join(Curso, CursoPeriodo.curso_id == Curso.id)
+        .join(Periodo, CursoPeriodo.periodo_id == Periodo.id)
+        .filter(CursoPeriodo.id == curso_periodo_id)
+        .first()
+    )
+    if cabecera is None:
+        return None
+
+    materias = (
+        db.query(CursoMateria.id, Materia.nombre, Usuario.nombre.label("profesor_nombre"),
+                 Usuario.apellido.label("profesor_apellido"))
+        .join(Materia, CursoMateria.materia_id == Materia.id)
+        .outerjoin(Profesor, CursoMateria.profesor_id == Profesor.id)
+        .outerjoin(Usuario, Profesor.usuario_id == Usuario.id)
+        .filter(CursoMateria.curso_periodo_id == curso_periodo_id)
+        .order_by(Materia.nombre)
+        .all()
+    )
+    cm_ids = [materia.id for materia in materias]
+
+    roster = roster_cache.obtener(db, curso_periodo_id)
+    estudiantes = [
+        estudiante for estudiante in roster.filas()
+        if estudiante_ids is None or estudiante.id in estudiante_ids
+    ]
+
+    notas = {}
+    asistencia = {}
+    if cm_ids:
+        # Las estadísticas de notas se mantienen al escribir (services/estadisticas.py)
+        for fila in (
+            db.query(EstadisticaNota.estudiante_id, EstadisticaNota.curso_materia_id, EstadisticaNota.cantidad,
+                     EstadisticaNota.media, EstadisticaNota.minimo, EstadisticaNota.maximo)
+            .filter(EstadisticaNota.curso_materia_id.in_(cm_ids))
+        ):
+            notas[(fila[0], fila[1])] = {"cantidad": fila[2], "promedio": fila[3], "minima": fila[4], "maxima": fila[5]}
+
+        if cabecera.archivado_en is not None:
+            # Periodo archivado: la asistencia se lee del archivo frío (services/archivo.py)
+            asistencia = archivo.agregar_asistencia(cabecera.periodo_id, cm_ids, estudiante_ids)
+        else:
+            for fila in (
+                db.query(Participacion.estudiante_id, Participacion.curso_materia_id, func.count(Participacion.id),
+                         func.sum(case((Participacion.asistencia.is_(True), 1), else_=0)),
+                         func.avg(Participacion.participacion_clase))
+                .filter(Participacion.curso_materia_id.in_(cm_ids))
+                .filter(filtro_periodo(Participacion.fecha, cabecera))  # solo lee la partición del año
+                .group_by(Participacion.estudiante_id, Participacion.curso_materia_id)
+            ):
+                asistencia[(fila[0], fila[1])] = {"clases": fila[2], "asistidas": fila[3] or 0, "participacion": fila[4]}
+
+    return {
+        "cabecera": cabecera,
+        "materias": materias,
+        "estudiantes": estudiantes,
+        "notas": notas,
+        "asistencia": asistencia,
+    }
+
+
+def filas_boletin(datos: dict, estudiante_id: int) -> list:
+    filas = []
+    for materia in datos["materias"]:
+        nota = datos["notas"].get((estudiante_id, materia.id), {})
+        asis = datos["asistencia"].get((estudiante_id, materia.id), {})
+        clases = asis.get("clases", 0)
+        profesor = " ".join(p for p in (materia.profesor_nombre, materia.profesor_apellido) if p)
+        filas.append({
+            "materia": materia.nombre,
+            "profesor": profesor,
+            "cantidad_notas": nota.get("cantidad", 0),
+            "promedio": round(nota["promedio"], 2) if nota.get("promedio") is not None else None,
+            "nota_minima": nota.get("minima"),
+            "nota_maxima": nota.get("maxima"),
+            "asistencia_pct": round(100.0 * asis["asistidas"] / clases, 1) if clases else None,
+            "participacion": round(asis["participacion"], 2) if asis.get("participacion") is not None else None,
+        })
+    return filas
+
+
+# --- Renderizado --------------------------------------------------------------
+
+COLUMNAS = ["materia", "profesor", "cantidad_notas", "promedio", "nota_minima", "nota_maxima", "asistencia_pct", "participacion"]
+
+
+def _texto(valor) -> str:
+    return "" if valor is None else str(valor)
+
+
+def render_csv(cabecera, estudiante, filas) -> bytes:
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    escritor.writerow(["estudiante", f"{estudiante.nombre} {estudiante.apellido}"])
+    escritor.writerow(["curso", cabecera.curso, "bimestre", cabecera.bimestre, "anio", cabecera.anio])
+    escritor.writerow(COLUMNAS)
+    for fila in filas:
+        escritor.writerow([_texto(fila[columna]) for columna in COLUMNAS])
+    return salida.getvalue().encode("utf-8")
+
+
+def render_html(cabecera, estudiante, filas) -> bytes:
+    e = html.escape
+    cuerpo = "".join(
+        "<tr>" + "".join(f"<td>{e(_texto(fila[columna]))}</td>" for columna in COLUMNAS) + "</tr>"
+        for fila in filas
+    )
+    documento = (
+        "<!DOCTYPE html><html lang=\"es\"><head><meta charset=\"utf-8\">"
+        f"<title>Boletín {e(estudiante.nombre)} {e(estudiante.apellido)}</title></head><body>"
+        f"<h1>Boletín de calificaciones</h1>"
+        f"<p><strong>Estudiante:</strong> {e(estudiante.nombre)} {e(estudiante.apellido)}<br>"
+        f"<strong>Curso:</strong> {e(cabecera.curso)} &mdash; Bimestre {cabecera.bimestre} / {cabecera.anio}</p>"
+        "<table border=\"1\"><thead><tr>"
+        + "".join(f"<th>{e(columna)}</th>" for columna in COLUMNAS)
+        + f"</tr></thead><tbody>{cuerpo}</tbody></table></body></html>"
+    )
+    return documento.encode("utf-8")
+
+
+def render_pdf(cabecera, estudiante, filas) -> bytes:
+    salida = io.BytesIO()
+    pdf = canvas.Canvas(salida, pagesize=A4, invariant=1)
+    _, alto = A4
+    y = alto - 50
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(40, y, "Boletín de calificaciones")
+    pdf.setFont("Helvetica", 10)
+    y -= 20
+    pdf.drawString(40, y, f"Estudiante: {estudiante.nombre} {estudiante.apellido}")
+    y -= 15
+    pdf.drawString(40, y, f"Curso: {cabecera.curso} - Bimestre {cabecera.bimestre} / {cabecera.anio}")
+    y -= 25
+    for fila in filas:
+        pdf.drawString(40, y, f"{fila['materia']}: promedio {_texto(fila['promedio'])}, "
+                              f"asistencia {_texto(fila['asistencia_pct'])}%")
+        y -= 15
+        if y < 50:
+            pdf.showPage()
+            y = alto - 50
+    pdf.save()
+    return salida.getvalue()
+
+
+RENDERIZADORES = {"csv": render_csv, "html": render_html, "pdf": render_pdf}
+
+
+# --- Almacenamiento -----------------------------------------------------------
+
+def guardar_contenido(contenido: bytes, formato: str) -> tuple:
+    """Guarda el archivo direccionado por contenido y devuelve (sha256, ruta relativa)."""
+    sha = hashlib.sha256(contenido).hexdigest()
+    relativa = os.path.join(sha[:2], f"{sha}.{formato}")
+    destino = ruta_absoluta(relativa)
+    if not os.path.exists(destino):
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, destino)
+    return sha, relativa
+
+
+def generar_boletines(db: Session, curso_periodo_id: int, formato: str, regenerar: bool = False) -> dict:
+    """Genera (o reutiliza) los boletines de todos los inscritos de un curso-periodo."""
+    existentes = {
+        boletin.estudiante_id: boletin
+        for boletin in db.query(Boletin).filter(
+            Boletin.curso_periodo_id == curso_periodo_id, Boletin.formato == formato
+        )
+    }
+    datos = cargar_datos_curso_periodo(db, curso_periodo_id)
+    if datos is None:
+        raise ValueError(f"Curso_Periodo {curso_periodo_id} no encontrado")
+
+    renderizar = RENDERIZADORES[formato]
+    resumen = {"total": len(datos["estudiantes"]), "generados": 0, "omitidos": 0}
+    pendientes = []
+    for estudiante in datos["estudiantes"]:
+        boletin = existentes.get(estudiante.id)
+        if boletin is not None and not regenerar and os.path.exists(ruta_absoluta(boletin.ruta)):
+            resumen["omitidos"] += 1
+        else:
+            pendientes.append(estudiante)
+
+    def renderizar_y_guardar(estudiante) -> tuple:
+        contenido = renderizar(datos["cabecera"], estudiante, filas_boletin(datos, estudiante.id))
+        return guardar_contenido(contenido, formato) + (len(contenido),)
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.BOLETINES_HILOS)) as pool:
+        for estudiante, (sha, relativa, tamano) in zip(pendientes, pool.map(renderizar_y_guardar, pendientes)):
+            boletin = existentes.get(estudiante.id)
+            if boletin is None:
+                boletin = Boletin(estudiante_id=estudiante.id, curso_periodo_id=curso_periodo_id, formato=formato)
+                db.add(boletin)
+            boletin.sha256 = sha
+            boletin.ruta = relativa
+            boletin.tamano = tamano
+            boletin.generado_en = datetime.utcnow()
+            resumen["generados"] += 1
+    db.commit()
+    return resumen
+
+
+# --- Ejecución en segundo plano ------------------------------------------------
+
+@job_handler("boletines")
+def procesar_job_boletines(db: Session, payload: dict) -> dict:
+    return generar_boletines(db, payload["curso_periodo_id"], payload["formato"], payload.get("regenerar", False))
@@ -0,0 +1,95 @@
+# app/services/cache.py
+import threading
+import time
+from collections import OrderedDict
+from ..config import settings
+from ..core.tenancy import tenant_actual
+
+
+class EntityCache:
+    """
+    Caché en memoria del proceso, indexada por (colegio, entidad, id), con TTL y
+    límite LRU; el colegio es el de `tenant_actual` (None sin multi-colegio).
+    Solo es segura con varios workers si el bus de invalidación está activo
+    (ver app/services/invalidation.py).
+
+    Una lectura que empezó antes de una invalidación y termina después no debe
+    dejar en la caché el valor viejo: quien lee toma `version()` antes de la
+    consulta y se la pasa a `set()`, que descarta el valor si la clave (o toda la
+    entidad) se invalidó desde entonces. Se recuerdan las últimas `max_entradas`
+    invalidaciones; una versión anterior a las ya olvidadas también se descarta.
+    """
+
+    def __init__(self, max_entradas: int, ttl_segundos: int, habilitada: bool = True):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.habilitada = habilitada
+        self._entradas = OrderedDict()
+        self._contador = 0  # sube con cada invalidación
+        self._invalidaciones = OrderedDict()  # (colegio, entidad, id o None) -> contador al invalidarla
+        self._piso = 0  # las versiones menores a esto pueden haberse cruzado con una invalidación olvidada
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        """Marca a tomar antes de leer de la base el valor que se pasará a set()."""
+        with self._lock:
+            return self._contador
+
+    def get(self, entidad: str, id):
+        if not self.habilitada:
+            return None
+        clave = (tenant_actual.get(), entidad, id)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            valor, expira = entrada
+            if expira < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def set(self, entidad: str, id, valor, version: int) -> None:
+        if not self.habilitada:
+            return
+        clave = (tenant_actual.get(), entidad, id)
+        with self._lock:
+            if (version < self._piso
+                    or self._invalidaciones.get(clave, 0) > version
+                    or self._invalidaciones.get(clave[:2] + (None,), 0) > version):
+                return  # se invalidó mientras se leía
+            self._entradas[clave] = (valor, time.monotonic() + self.ttl_segundos)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidate(self, entidad: str, id=None) -> None:
+        """Elimina una entrada, o todas las de la entidad si id es None."""
+        colegio = tenant_actual.get()
+        with self._lock:
+            self._contador += 1
+            self._invalidaciones[(colegio, entidad, id)] = self._contador
+            self._invalidaciones.move_to_end((colegio, entidad, id))
+            while len(self._invalidaciones) > self.max_entradas:
+                _, olvidada = self._invalidaciones.popitem(last=False)
+                self._piso = max(self._piso, olvidada)
+            if id is not None:
+                self._entradas.pop((colegio, entidad, id), None)
+                return
+            for clave in [clave for clave in self._entradas if clave[:2] == (colegio, entidad)]:
+                del self._entradas[clave]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contador += 1
+            self._piso = self._contador
+            self._invalidaciones.clear()
+            self._entradas.clear()
+
+
+entity_cache = EntityCache(
+    settings.ENTITY_CACHE_MAX_ENTRIES,
+    settings.ENTITY_CACHE_TTL_SECONDS,
+    habilitada=settings.ENTITY_CACHE_ENABLED,
+)
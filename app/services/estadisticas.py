@@ -0,0 +1,221 @@
+# app/services/estadisticas.py
+"""
+Estadísticas de notas por estudiante y materia mantenidas de forma incremental.
+
+La tabla `estadisticas_notas` guarda por (estudiante, curso_materia): cantidad,
+suma, media y M2 de Welford (varianza), suma de i*valor_i para la tendencia,
+mínimo, máximo y la última nota. Se actualiza en la misma transacción que
+escribe las notas (evento after_flush), así leerla es O(1) y nunca hace falta un
+GROUP BY sobre `notas`.
+
+- Notas nuevas: se combinan con la fila existente con la fórmula de Chan
+  (varias notas del mismo flush en un solo UPDATE).
+- Notas modificadas o borradas: se recalcula la fila de ese estudiante y materia.
+
+Las inserciones masivas con Core (p. ej. synthetic_data) no pasan por el ORM;
+después hay que reconstruir la tabla:
+    python -m app.services.estadisticas [--colegio codigo]
+o encolar el trabajo "estadisticas" (POST /api/v1/estadisticas/reconstruir).
+"""
+import argparse
+import time
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import case, delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from ..core.tenancy import en_colegio
+from ..database import SessionLocal, sesion_de
+from ..models import CursoMateria, CursoPeriodo, EstadisticaNota, Nota, Periodo
+from .jobs import job_handler
+
+tabla = EstadisticaNota.__table__
+
+
+def acumular(notas) -> dict:
+    """Estadísticas de una secuencia de (valor, fecha) en orden de registro."""
+    cantidad, suma, media, m2, suma_iy = 0, 0.0, 0.0, 0.0, 0.0
+    minimo = maximo = ultimo_valor = ultima_fecha = None
+    for valor, fecha in notas:
+        cantidad += 1
+        suma += valor
+        delta = valor - media
+        media += delta / cantidad
+        m2 += delta * (valor - media)
+        suma_iy += cantidad * valor
+        minimo = valor if minimo is None or valor < minimo else minimo
+        maximo = valor if maximo is None or valor > maximo else maximo
+        if ultima_fecha is None or fecha >= ultima_fecha:
+            ultimo_valor, ultima_fecha = valor, fecha
+    return {
+        "cantidad": cantidad, "suma": suma, "media": media, "m2": m2, "suma_xy": suma_iy,
+        "minimo": minimo, "maximo": maximo, "ultimo_valor": ultimo_valor, "ultima_fecha": ultima_fecha,
+    }
+
+
+def varianza(fila) -> float:
+    return fila.m2 / (fila.cantidad - 1) if fila.cantidad > 1 else None
+
+
+def tendencia(fila) -> float:
+    """Pendiente de la recta de mínimos cuadrados de las notas en orden de registro (x = 1..n)."""
+    n = fila.cantidad
+    if n < 2:
+        return None
+    suma_x = n * (n + 1) / 2
+    suma_xx = n * (n + 1) * (2 * n + 1) / 6
+    return (n * fila.suma_xy - suma_x * fila.suma) / (n * suma_xx - suma_x ** 2)
+
+
+def _asegurar_filas(conexion, claves) -> None:
+    """Crea las filas en cero que falten, sin chocar con otra transacción que las cree a la vez."""
+    filas = [{"estudiante_id": e, "curso_materia_id": cm, "cantidad": 0, "suma": 0.0, "media": 0.0,
+              "m2": 0.0, "suma_xy": 0.0} for e, cm in claves]
+    dialecto = conexion.dialect.name
+    if dialecto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif dialecto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        existentes = set(conexion.execute(
+            select(tabla.c.estudiante_id, tabla.c.curso_materia_id)
+            .where(tabla.c.estudiante_id.in_({e for e, _ in claves}))
+        ).all())
+        filas = [fila for fila in filas if (fila["estudiante_id"], fila["curso_materia_id"]) not in existentes]
+        if filas:
+            conexion.execute(insert(tabla), filas)
+        return
+    conexion.execute(insert_dialecto(tabla).on_conflict_do_nothing(), filas)
+
+
+def _combinar(conexion, clave, lote: dict) -> None:
+    """Suma un lote de notas nuevas a la fila existente en un único UPDATE atómico."""
+    c = tabla.c
+    nb = float(lote["cantidad"])
+    n = c.cantidad + nb
+    delta = lote["media"] - c.media
+    es_ultima = c.ultima_fecha.is_(None) | (c.ultima_fecha <= lote["ultima_fecha"])
+    conexion.execute(
+        update(tabla)
+        .where(c.estudiante_id == clave[0], c.curso_materia_id == clave[1])
+        .values(
+            cantidad=c.cantidad + lote["cantidad"],
+            suma=c.suma + lote["suma"],
+            media=c.media + delta * nb / n,
+            m2=c.m2 + lote["m2"] + delta * delta * c.cantidad * nb / n,
+            suma_xy=c.suma_xy + c.cantidad * lote["suma"] + lote["suma_xy"],
+            minimo=case((c.minimo.is_(None) | (c.minimo > lote["minimo"]), lote["minimo"]), else_=c.minimo),
+            maximo=case((c.maximo.is_(None) | (c.maximo < lote["maximo"]), lote["maximo"]), else_=c.maximo),
+            ultimo_valor=case((es_ultima, lote["ultimo_valor"]), else_=c.ultimo_valor),
+            ultima_fecha=case((es_ultima, lote["ultima_fecha"]), else_=c.ultima_fecha),
+            actualizado_en=datetime.utcnow(),
+        )
+    )
+
+
+def recalcular(conexion, clave) -> None:
+    notas = conexion.execute(
+        select(Nota.valor, Nota.fecha)
+        .where(Nota.estudiante_id == clave[0], Nota.curso_materia_id == clave[1])
+        .order_by(Nota.id)
+    ).all()
+    filtro = (tabla.c.estudiante_id == clave[0]) & (tabla.c.curso_materia_id == clave[1])
+    if not notas:
+        conexion.execute(delete(tabla).where(filtro))
+        return
+    _asegurar_filas(conexion, [clave])
+    conexion.execute(update(tabla).where(filtro).values(**acumular(notas), actualizado_en=datetime.utcnow()))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _actualizar_estadisticas(session, flush_context):
+    nuevas = {}
+    recalcular_claves = set()
+    for objeto in session.new:
+        if isinstance(objeto, Nota):
+            nuevas.setdefault((objeto.estudiante_id, objeto.curso_materia_id), []).append(objeto)
+    for objeto in list(session.dirty) + list(session.deleted):
+        if not isinstance(objeto, Nota):
+            continue
+        estado = inspect(objeto)
+        recalcular_claves.add((objeto.estudiante_id, objeto.curso_materia_id))
+        # Si la nota cambió de estudiante o materia también cambia la fila de origen
+        anterior_estudiante = estado.attrs.estudiante_id.history.deleted
+        anterior_materia = estado.attrs.curso_materia_id.history.deleted
+        if anterior_estudiante or anterior_materia:
+            recalcular_claves.add((
+                anterior_estudiante[0] if anterior_estudiante else objeto.estudiante_id,
+                anterior_materia[0] if anterior_materia else objeto.curso_materia_id,
+            ))
+    if not nuevas and not recalcular_claves:
+        return
+
+    conexion = session.connection()
+    incrementales = {clave: notas for clave, notas in nuevas.items() if clave not in recalcular_claves}
+    if incrementales:
+        _asegurar_filas(conexion, list(incrementales))
+        for clave, notas in incrementales.items():
+            notas.sort(key=lambda nota: nota.id)
+            _combinar(conexion, clave, acumular((nota.valor, nota.fecha) for nota in notas))
+    for clave in recalcular_claves:
+        recalcular(conexion, clave)
+
+
+def reconstruir(db: Session, lote: int = 5000) -> dict:
+    """
+    Recalcula toda la tabla en una pasada ordenada sobre `notas`. No hace commit.
+    Las filas de periodos archivados se conservan: sus notas ya no están en `notas`.
+    """
+    archivadas = (
+        select(CursoMateria.id)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .join(Periodo, CursoPeriodo.periodo_id == Periodo.id)
+        .where(Periodo.archivado_en.is_not(None))
+    )
+    db.execute(delete(tabla).where(tabla.c.curso_materia_id.not_in(archivadas)))
+    filas = db.execute(
+        select(Nota.estudiante_id, Nota.curso_materia_id, Nota.valor, Nota.fecha)
+        .order_by(Nota.estudiante_id, Nota.curso_materia_id, Nota.id)
+        .execution_options(yield_per=lote)
+    )
+    ahora = datetime.utcnow()
+    buffer = []
+    resumen = {"filas": 0, "notas": 0}
+    for clave, grupo in groupby(filas, key=lambda fila: (fila[0], fila[1])):
+        estadistica = acumular((fila[2], fila[3]) for fila in grupo)
+        buffer.append({"estudiante_id": clave[0], "curso_materia_id": clave[1], **estadistica, "actualizado_en": ahora})
+        resumen["notas"] += estadistica["cantidad"]
+        if len(buffer) >= lote:
+            db.execute(insert(tabla), buffer)
+            resumen["filas"] += len(buffer)
+            buffer = []
+    if buffer:
+        db.execute(insert(tabla), buffer)
+        resumen["filas"] += len(buffer)
+    return resumen
+
+
+@job_handler("estadisticas")
+def procesar_job_estadisticas(db: Session, payload: dict) -> dict:
+    resumen = reconstruir(db)
+    db.commit()
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye la tabla estadisticas_notas a partir de notas")
+    parser.add_argument("--colegio", help="código del colegio (con TENANCY_ENABLED)")
+    args = parser.parse_args()
+    with en_colegio(args.colegio):
+        inicio = time.perf_counter()
+        db = sesion_de(args.colegio)
+        try:
+            resumen = reconstruir(db)
+            db.commit()
+        finally:
+            db.close()
+        print(f"Estadísticas reconstruidas: {resumen['filas']} filas de {resumen['notas']} notas "
+              f"en {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
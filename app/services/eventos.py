@@ -0,0 +1,200 @@
+# app/services/eventos.py
+"""
+Eventos en vivo (Server-Sent Events) para los tableros de profesores y administradores.
+
+Las escrituras de notas, participaciones, inscripciones y boletines se capturan
+con eventos de sesión y, tras el commit, se publican por el bus de invalidación
+para que lleguen a todos los workers. En cada worker un único `Broadcaster`
+reparte cada evento, serializado una sola vez, a todas las conexiones suscritas
+a su canal:
+
+- "curso_periodo:{id}": eventos de ese curso-periodo.
+- "escuela": todos los eventos (administradores).
+
+Con varios colegios cada canal existe por colegio: el Broadcaster usa
+`tenant_actual` al suscribir (el de la petición) y al difundir (el del evento).
+
+Cada suscriptor tiene una cola acotada; si un cliente lento la llena se descartan
+sus eventos más antiguos y se le avisa con un evento "perdidos".
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from sqlalchemy import event, select
+from ..config import settings
+from ..core.tenancy import tenant_actual
+from ..database import SessionLocal
+from ..models import Boletin, CursoMateria, Inscripcion, Nota, Participacion
+from .invalidation import bus
+
+CANAL_ESCUELA = "escuela"
+
+# modelo -> (tipo de evento, campos que viajan en el evento)
+CAMPOS_EVENTO = {
+    Nota: ("nota", ("estudiante_id", "curso_materia_id", "valor", "fecha")),
+    Participacion: ("participacion", ("estudiante_id", "curso_materia_id", "asistencia", "participacion_clase", "fecha")),
+    Inscripcion: ("inscripcion", ("estudiante_id", "curso_periodo_id")),
+    Boletin: ("boletin", ("estudiante_id", "curso_periodo_id", "formato", "sha256")),
+}
+
+
+def canal_curso_periodo(curso_periodo_id: int) -> str:
+    return f"curso_periodo:{curso_periodo_id}"
+
+
+class Suscripcion:
+    def __init__(self, canales: list, loop: asyncio.AbstractEventLoop, tamano_cola: int):
+        self.canales = canales
+        self.loop = loop
+        self.cola = asyncio.Queue(maxsize=tamano_cola)
+        self.perdidos = 0
+
+    def _poner(self, mensaje: str) -> None:
+        if self.cola.full():
+            self.cola.get_nowait()
+            self.perdidos += 1
+        self.cola.put_nowait(mensaje)
+
+    def entregar(self, mensaje: str) -> None:
+        # difundir() puede llamarse desde hilos del threadpool, de la cola de trabajos o del bus
+        self.loop.call_soon_threadsafe(self._poner, mensaje)
+
+
+def _clave(canal: str):
+    colegio = tenant_actual.get()
+    return canal if colegio is None else f"{colegio}:{canal}"
+
+
+class Broadcaster:
+    def __init__(self, tamano_cola: int):
+        self.tamano_cola = tamano_cola
+        self._suscripciones = {}  # canal -> set de Suscripcion
+        self._secuencia = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def suscribir(self, canales: list) -> Suscripcion:
+        suscripcion = Suscripcion([_clave(canal) for canal in canales], asyncio.get_running_loop(), self.tamano_cola)
+        with self._lock:
+            for clave in suscripcion.canales:
+                self._suscripciones.setdefault(clave, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            for canal in suscripcion.canales:
+                suscritos = self._suscripciones.get(canal)
+                if suscritos is not None:
+                    suscritos.discard(suscripcion)
+                    if not suscritos:
+                        del self._suscripciones[canal]
+
+    def difundir(self, canal: str, tipo: str, datos: dict) -> None:
+        with self._lock:
+            suscritos = list(self._suscripciones.get(_clave(canal), ()))
+        if not suscritos:
+            return
+        mensaje = formatear(tipo, datos, next(self._secuencia))
+        for suscripcion in suscritos:
+            try:
+                suscripcion.entregar(mensaje)
+            except RuntimeError:
+                self.cancelar(suscripcion)  # el loop de la conexión ya se cerró
+
+    def estado(self) -> dict:
+        """Conexiones por canal del colegio actual (todas sin multi-colegio)."""
+        colegio = tenant_actual.get()
+        prefijo = f"{colegio}:" if colegio is not None else ""
+        with self._lock:
+            return {canal[len(prefijo):]: len(suscritos) for canal, suscritos in self._suscripciones.items()
+                    if canal.startswith(prefijo)}
+
+
+def formatear(tipo: str, datos: dict, id: int = None) -> str:
+    lineas = [f"id: {id}"] if id is not None else []
+    lineas += [f"event: {tipo}", f"data: {json.dumps(datos, default=str)}"]
+    return "\n".join(lineas) + "\n\n"
+
+
+broadcaster = Broadcaster(settings.SSE_QUEUE_SIZE)
+
+
+def _al_recibir(evento: dict) -> None:
+    if evento["entidad"] != "sse":
+        return
+    datos = evento["datos"]
+    broadcaster.difundir(CANAL_ESCUELA, datos["tipo"], datos)
+    if datos.get("curso_periodo_id") is not None:
+        broadcaster.difundir(canal_curso_periodo(datos["curso_periodo_id"]), datos["tipo"], datos)
+
+
+bus.subscribe(_al_recibir)
+
+# (colegio, curso_materia_id) -> curso_periodo_id, LRU acotado; un curso_materia no cambia de curso-periodo
+_curso_periodo_de = OrderedDict()
+_curso_periodo_lock = threading.Lock()
+
+
+def _buscar_cursos_periodo(claves: set) -> dict:
+    with _curso_periodo_lock:
+        encontrados = {}
+        for clave in claves:
+            if clave in _curso_periodo_de:
+                _curso_periodo_de.move_to_end(clave)
+                encontrados[clave] = _curso_periodo_de[clave]
+        return encontrados
+
+
+def _guardar_cursos_periodo(valores: dict) -> None:
+    with _curso_periodo_lock:
+        _curso_periodo_de.update(valores)
+        while len(_curso_periodo_de) > settings.SSE_CURSO_PERIODO_CACHE_MAX_ENTRIES:
+            _curso_periodo_de.popitem(last=False)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _recolectar_eventos(session, flush_context):
+    pendientes = []
+    for accion, objetos in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for objeto in objetos:
+            definicion = CAMPOS_EVENTO.get(type(objeto))
+            if definicion is None:
+                continue
+            tipo, campos = definicion
+            datos = {"tipo": tipo, "accion": accion, "id": objeto.id}
+            datos.update({campo: getattr(objeto, campo) for campo in campos})
+            pendientes.append(datos)
+    if not pendientes:
+        return
+
+    colegio = session.info.get("colegio")
+    claves = {(colegio, datos["curso_materia_id"]) for datos in pendientes if "curso_materia_id" in datos}
+    cursos_periodo = _buscar_cursos_periodo(claves)
+    faltantes = {id for _, id in claves - cursos_periodo.keys()}
+    if faltantes:
+        nuevos = {(colegio, id): curso_periodo_id for id, curso_periodo_id in session.execute(
+            select(CursoMateria.id, CursoMateria.curso_periodo_id).where(CursoMateria.id.in_(faltantes))
+        )}
+        _guardar_cursos_periodo(nuevos)
+        cursos_periodo.update(nuevos)
+    for datos in pendientes:
+        if "curso_materia_id" in datos:
+            datos["curso_periodo_id"] = cursos_periodo.get((colegio, datos["curso_materia_id"]))
+    session.info.setdefault("eventos_sse", []).extend(pendientes)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publicar_eventos(session):
+    pendientes = session.info.pop("eventos_sse", None)
+    if pendientes:
+        # Con id, la caché de entidades solo descarta la clave ("sse", id) y no recorre todas
+        bus.publish([
+            {"entidad": "sse", "id": datos["id"], "datos": json.loads(json.dumps(datos, default=str))}
+            for datos in pendientes
+        ])
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_eventos(session):
+    session.info.pop("eventos_sse", None)
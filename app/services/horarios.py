@@ -0,0 +1,138 @@
+# app/services/horarios.py
+"""
+Detección de choques de horario entre bloques de Curso_Materia.
+
+Los bloques se agrupan por (profesor, día) y por (aula, día); cada grupo se ordena
+por hora de inicio y se recorre con un barrido que mantiene en un heap los bloques
+activos ordenados por hora de fin. Costo O(n log n + k), con k = número de choques.
+"""
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import time
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from ..models import BloqueHorario, CursoMateria, CursoPeriodo
+
+
+@dataclass(frozen=True)
+class Bloque:
+    curso_materia_id: int
+    profesor_id: Optional[int]
+    aula: Optional[str]
+    dia_semana: int
+    hora_inicio: time
+    hora_fin: time
+    propuesto: bool = False
+
+    def referencia(self) -> dict:
+        return {
+            "curso_materia_id": self.curso_materia_id,
+            "dia_semana": self.dia_semana,
+            "hora_inicio": self.hora_inicio,
+            "hora_fin": self.hora_fin,
+            "propuesto": self.propuesto,
+        }
+
+
+def _barrido(tipo: str, recurso, bloques: List[Bloque]) -> List[dict]:
+    conflictos = []
+    activos = []  # heap de (hora_fin, orden, bloque)
+    for orden, bloque in enumerate(sorted(bloques, key=lambda b: (b.hora_inicio, b.hora_fin))):
+        # Los bloques que terminan antes (o justo cuando) empieza este ya no chocan
+        while activos and activos[0][0] <= bloque.hora_inicio:
+            heapq.heappop(activos)
+        for fin, _, otro in activos:
+            conflictos.append({
+                "tipo": tipo,
+                "recurso": str(recurso),
+                "dia_semana": bloque.dia_semana,
+                "desde": bloque.hora_inicio,
+                "hasta": min(fin, bloque.hora_fin),
+                "bloque_a": otro.referencia(),
+                "bloque_b": bloque.referencia(),
+            })
+        heapq.heappush(activos, (bloque.hora_fin, orden, bloque))
+    return conflictos
+
+
+def detectar_conflictos(bloques: Iterable[Bloque]) -> List[dict]:
+    """Devuelve todos los pares de bloques que comparten profesor o aula en horas solapadas."""
+    por_profesor: Dict[tuple, List[Bloque]] = defaultdict(list)
+    por_aula: Dict[tuple, List[Bloque]] = defaultdict(list)
+    for bloque in bloques:
+        if bloque.profesor_id is not None:
+            por_profesor[(bloque.profesor_id, bloque.dia_semana)].append(bloque)
+        if bloque.aula:
+            por_aula[(bloque.aula.strip().lower(), bloque.dia_semana)].append(bloque)
+
+    conflictos = []
+    for (profesor_id, _), grupo in por_profesor.items():
+        if len(grupo) > 1:
+            conflictos.extend(_barrido("profesor", profesor_id, grupo))
+    for (aula, _), grupo in por_aula.items():
+        if len(grupo) > 1:
+            conflictos.extend(_barrido("aula", aula, grupo))
+    return conflictos
+
+
+def bloques_existentes(db: Session, periodo_id: int, excluir_curso_materia_ids=()) -> List[Bloque]:
+    """Carga en una sola consulta los bloques ya guardados del periodo."""
+    consulta = (
+        db.query(
+            BloqueHorario.curso_materia_id,
+            CursoMateria.profesor_id,
+            CursoMateria.aula,
+            CursoPeriodo.aula.label("aula_curso"),
+            BloqueHorario.dia_semana,
+            BloqueHorario.hora_inicio,
+            BloqueHorario.hora_fin,
+        )
+        .join(CursoMateria, BloqueHorario.curso_materia_id == CursoMateria.id)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .filter(CursoPeriodo.periodo_id == periodo_id)
+    )
+    if excluir_curso_materia_ids:
+        consulta = consulta.filter(BloqueHorario.curso_materia_id.notin_(list(excluir_curso_materia_ids)))
+    return [
+        Bloque(fila.curso_materia_id, fila.profesor_id, fila.aula or fila.aula_curso,
+               fila.dia_semana, fila.hora_inicio, fila.hora_fin)
+        for fila in consulta
+    ]
+
+
+def validar_periodo(db: Session, periodo_id: int, asignaciones) -> dict:
+    """
+    Valida un horario propuesto (lista de AsignacionHorario) contra sí mismo y contra
+    los bloques guardados del periodo. Las asignaciones propuestas reemplazan a los
+    bloques existentes del mismo curso_materia.
+    """
+    ids = [asignacion.curso_materia_id for asignacion in asignaciones]
+    cursos_materia = {
+        cm.id: cm
+        for cm in db.query(CursoMateria.id, CursoMateria.profesor_id, CursoMateria.aula, CursoPeriodo.aula.label("aula_curso"), CursoPeriodo.periodo_id)
+        .join(CursoPeriodo, CursoMateria.curso_periodo_id == CursoPeriodo.id)
+        .filter(CursoMateria.id.in_(ids))
+    } if ids else {}
+
+    faltantes = [i for i in ids if i not in cursos_materia or cursos_materia[i].periodo_id != periodo_id]
+
+    propuestos = []
+    for asignacion in asignaciones:
+        cm = cursos_materia.get(asignacion.curso_materia_id)
+        if cm is None:
+            continue
+        profesor_id = asignacion.profesor_id if asignacion.profesor_id is not None else cm.profesor_id
+        aula = asignacion.aula or cm.aula or cm.aula_curso
+        for b in asignacion.bloques:
+            propuestos.append(Bloque(asignacion.curso_materia_id, profesor_id, aula,
+                                     b.dia_semana, b.hora_inicio, b.hora_fin, propuesto=True))
+
+    todos = bloques_existentes(db, periodo_id, excluir_curso_materia_ids=set(ids)) + propuestos
+    conflictos = detectar_conflictos(todos)
+    return {
+        "faltantes": faltantes,
+        "valido": not conflictos and not faltantes,
+        "total_bloques": len(todos),
+        "conflictos": conflictos,
+    }
@@ -0,0 +1,82 @@
+# app/services/inscripciones.py
+"""
+Inscripción con control de cupo sin bloqueos de tabla.
+
+El cupo se reserva con un único UPDATE condicional:
+
+    UPDATE cursos_periodo SET capacidad_actual = capacidad_actual + 1
+    WHERE id = :id AND capacidad_actual < (capacidad_maxima del curso)
+
+La base de datos serializa las escrituras sobre esa fila y reevalúa el WHERE,
+así que nunca se sobrepasa el cupo aunque lleguen cientos de peticiones a la vez.
+La inscripción se inserta antes (un duplicado falla sin tocar el contador) y todo
+se confirma en la misma transacción. Un curso sin capacidad_maxima no tiene límite.
+"""
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import Session
+from ..models import Curso, CursoPeriodo, Inscripcion
+
+
+class CupoLlenoError(Exception):
+    pass
+
+
+class InscripcionDuplicadaError(Exception):
+    pass
+
+
+def _cupo():
+    return select(Curso.capacidad_maxima).where(Curso.id == CursoPeriodo.curso_id).scalar_subquery()
+
+
+def inscribir(db: Session, curso_periodo_id: int, estudiante_id: int) -> Inscripcion:
+    inscripcion = Inscripcion(estudiante_id=estudiante_id, curso_periodo_id=curso_periodo_id)
+    db.add(inscripcion)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise InscripcionDuplicadaError()
+
+    reservado = db.execute(
+        update(CursoPeriodo)
+        .where(
+            CursoPeriodo.id == curso_periodo_id,
+            CursoPeriodo.is_active.is_(True),
+            or_(_cupo().is_(None), CursoPeriodo.capacidad_actual < _cupo()),
+        )
+        .values(capacidad_actual=CursoPeriodo.capacidad_actual + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if reservado != 1:
+        db.rollback()
+        raise CupoLlenoError()
+
+    db.commit()
+    db.refresh(inscripcion)
+    return inscripcion
+
+
+def desinscribir(db: Session, curso_periodo_id: int, estudiante_id: int) -> bool:
+    inscripcion = db.query(Inscripcion).filter(
+        Inscripcion.curso_periodo_id == curso_periodo_id,
+        Inscripcion.estudiante_id == estudiante_id
+    ).first()
+    if inscripcion is None:
+        return False
+    db.delete(inscripcion)
+    try:
+        db.flush()
+    except StaleDataError:
+        db.rollback()  # otra petición la borró primero
+        return False
+    db.execute(
+        update(CursoPeriodo)
+        .where(CursoPeriodo.id == curso_periodo_id, CursoPeriodo.capacidad_actual > 0)
+        .values(capacidad_actual=CursoPeriodo.capacidad_actual - 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return True
@@ -0,0 +1,253 @@
+# app/services/invalidation.py
+"""
+Bus de invalidación de caché entre workers.
+
+Cada commit que modifica filas publica eventos {entidad, id, version}; todos los
+workers los reciben y eliminan las claves afectadas de su caché local.
+
+- PostgreSQL: NOTIFY/LISTEN sobre un canal dedicado.
+- SQLite u otros: un archivo de log compartido (una línea JSON por evento) que
+  cada worker lee periódicamente. Sirve para varios procesos en una misma máquina.
+  Al pasar CACHE_INVALIDATION_FILE_MAX_BYTES se rota a `<archivo>.1`; cada lector
+  termina de leer el archivo viejo por su descriptor abierto antes de pasar al nuevo.
+
+Con varios colegios cada evento lleva el código del colegio que lo generó, y los
+handlers corren con `tenant_actual` fijado a ese colegio.
+
+Las escrituras masivas con insert()/update() de Core no pasan por el ORM y no
+generan eventos; quien las haga debe llamar a bus.publish() por su cuenta.
+"""
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from sqlalchemy import event, text
+from ..config import settings
+from ..core.tenancy import en_colegio, tenant_actual
+from ..database import SessionLocal, engine
+from .cache import entity_cache
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class InvalidationBus(ABC):
+    def __init__(self):
+        self.origen = uuid.uuid4().hex
+        self._handlers = []
+        self._hilo = None
+        self._detener = threading.Event()
+
+    def subscribe(self, handler) -> None:
+        """Registra handler(evento) para los eventos de este y de otros workers."""
+        self._handlers.append(handler)
+
+    def _despachar(self, evento: dict) -> None:
+        with en_colegio(evento.get("colegio")):
+            for handler in self._handlers:
+                try:
+                    handler(evento)
+                except Exception as e:
+                    logger.warning("Error procesando evento de invalidación %s: %s", evento, e)
+
+    def publish(self, eventos: list) -> None:
+        if not eventos:
+            return
+        colegio = tenant_actual.get()
+        if colegio is not None:
+            eventos = [{**evento, "colegio": colegio} for evento in eventos]
+        # El worker que escribe invalida de inmediato, sin esperar el viaje de ida y vuelta
+        for evento in eventos:
+            self._despachar(evento)
+        try:
+            self._enviar([{**evento, "origen": self.origen} for evento in eventos])
+        except Exception as e:
+            logger.warning("No se pudieron publicar eventos de invalidación: %s", e)
+
+    def _recibir(self, evento: dict) -> None:
+        if evento.get("origen") != self.origen:
+            self._despachar(evento)
+
+    def start(self) -> None:
+        if self._hilo is not None:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._escuchar, name="invalidation-bus", daemon=True)
+        self._hilo.start()
+
+    def stop(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    @abstractmethod
+    def _enviar(self, eventos: list) -> None:
+        """Hace llegar los eventos a los demás workers."""
+
+    @abstractmethod
+    def _escuchar(self) -> None:
+        """Bucle del hilo que recibe los eventos de los demás workers (ver start)."""
+
+
+class NullBus(InvalidationBus):
+    """Solo invalida la caché local (un único worker)."""
+
+    def _enviar(self, eventos: list) -> None:
+        pass
+
+    def _escuchar(self) -> None:
+        pass
+
+    def start(self) -> None:
+        pass
+
+
+class PostgresBus(InvalidationBus):
+    def __init__(self, engine_bus, canal: str):
+        super().__init__()
+        self.engine = engine_bus
+        self.canal = canal
+
+    def _enviar(self, eventos: list) -> None:
+        with self.engine.connect() as conexion:
+            for evento in eventos:
+                conexion.execute(text("SELECT pg_notify(:canal, :payload)"),
+                                 {"canal": self.canal, "payload": json.dumps(evento)})
+            conexion.commit()
+
+    def _escuchar(self) -> None:
+        while not self._detener.is_set():
+            conexion = None
+            try:
+                conexion = self.engine.raw_connection()
+                dbapi = conexion.driver_connection
+                dbapi.autocommit = True
+                with dbapi.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.canal}"')
+                while not self._detener.is_set():
+                    if select.select([dbapi], [], [], 1.0) == ([], [], []):
+                        continue
+                    dbapi.poll()
+                    while dbapi.notifies:
+                        notificacion = dbapi.notifies.pop(0)
+                        self._recibir(json.loads(notificacion.payload))
+            except Exception as e:
+                logger.warning("Bus de invalidación desconectado, reintentando: %s", e)
+                time.sleep(1)
+            finally:
+                if conexion is not None:
+                    # La conexión quedó en LISTEN/autocommit: no se devuelve al pool
+                    conexion.detach()
+                    conexion.close()
+
+
+class FileBus(InvalidationBus):
+    def __init__(self, ruta: str, intervalo: float = 0.5, max_bytes: int = 10 * 1024 * 1024):
+        super().__init__()
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.max_bytes = max_bytes
+
+    def _enviar(self, eventos: list) -> None:
+        lineas = "".join(json.dumps(evento) + "\n" for evento in eventos).encode()
+        # O_APPEND hace atómicas las escrituras pequeñas entre procesos
+        fd = os.open(self.ruta, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, lineas)
+            if os.fstat(fd).st_size > self.max_bytes:
+                self._rotar(fd)
+        finally:
+            os.close(fd)
+
+    def _rotar(self, fd: int) -> None:
+        try:
+            # Si otro proceso ya rotó, la ruta apunta a un archivo nuevo: no se toca
+            if os.stat(self.ruta).st_ino == os.fstat(fd).st_ino:
+                os.replace(self.ruta, f"{self.ruta}.1")
+        except FileNotFoundError:
+            pass
+
+    def _leer(self, archivo) -> None:
+        if os.fstat(archivo.fileno()).st_size < archivo.tell():
+            archivo.seek(0)  # el archivo fue truncado a mano
+        while True:
+            posicion = archivo.tell()
+            linea = archivo.readline()
+            if not linea:
+                return
+            if not linea.endswith(b"\n"):
+                archivo.seek(posicion)  # línea a medio escribir; se lee en la siguiente vuelta
+                return
+            self._recibir(json.loads(linea))
+
+    def _escuchar(self) -> None:
+        archivo = anterior = None
+        desde_el_final = True  # al arrancar solo interesan los eventos nuevos
+        while not self._detener.wait(self.intervalo):
+            try:
+                if anterior is not None:
+                    # Una vuelta más sobre el archivo rotado, por si un escritor lo tenía abierto
+                    self._leer(anterior)
+                    anterior.close()
+                    anterior = None
+                if archivo is None:
+                    if not os.path.exists(self.ruta):
+                        desde_el_final = False
+                        continue
+                    archivo = open(self.ruta, "rb")
+                    if desde_el_final:
+                        archivo.seek(0, os.SEEK_END)
+                    desde_el_final = False
+                self._leer(archivo)
+                try:
+                    rotado = os.stat(self.ruta).st_ino != os.fstat(archivo.fileno()).st_ino
+                except FileNotFoundError:
+                    rotado = True
+                if rotado:
+                    anterior, archivo = archivo, None
+            except Exception as e:
+                logger.warning("Error leyendo el bus de invalidación: %s", e)
+        for abierto in (archivo, anterior):
+            if abierto is not None:
+                abierto.close()
+
+
+def crear_bus() -> InvalidationBus:
+    backend = settings.CACHE_INVALIDATION_BACKEND
+    if backend == "auto":
+        backend = "postgres" if engine.dialect.name == "postgresql" else "file"
+    if backend == "postgres":
+        return PostgresBus(engine, settings.CACHE_INVALIDATION_CHANNEL)
+    if backend == "file":
+        return FileBus(settings.CACHE_INVALIDATION_FILE, max_bytes=settings.CACHE_INVALIDATION_FILE_MAX_BYTES)
+    return NullBus()
+
+
+bus = crear_bus()
+bus.subscribe(lambda evento: entity_cache.invalidate(evento["entidad"], evento.get("id")))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _recolectar_cambios(session, flush_context):
+    cambios = session.info.setdefault("invalidar", set())
+    for objeto in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabla = getattr(objeto, "__tablename__", None)
+        if tabla is not None:
+            cambios.add((tabla, getattr(objeto, "id", None)))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publicar_cambios(session):
+    cambios = session.info.pop("invalidar", None)
+    if cambios:
+        version = time.time_ns()
+        bus.publish([{"entidad": tabla, "id": id, "version": version} for tabla, id in cambios])
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_cambios(session):
+    session.info.pop("invalidar", None)
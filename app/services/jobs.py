@@ -0,0 +1,244 @@
+# app/services/jobs.py
+"""
+Cola de trabajos persistente en la tabla `jobs`.
+
+Los endpoints encolan con `encolar()` y responden 202; los workers (hilos dentro
+del proceso de la API o `python -m app.worker`) toman trabajos de la tabla:
+
+- PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED, así varios workers nunca toman
+  el mismo trabajo ni se bloquean entre sí.
+- SQLite: sondeo + UPDATE condicional (WHERE estado = 'pendiente'); solo uno gana.
+
+Un trabajo que falla se reintenta con backoff exponencial hasta `max_intentos`.
+Cada JOBS_LOCK_CHECK_INTERVAL_SECONDS los workers revisan los trabajos cuyo bloqueo
+superó JOBS_LOCK_TIMEOUT_SECONDS (su worker murió): el intento ya se contó al
+tomarlos, así que vuelven a la cola con backoff o quedan fallidos si era el último.
+Con varios colegios cada uno tiene su tabla `jobs` y cada hilo las recorre por
+turno, con `tenant_actual` fijado al colegio del trabajo que ejecuta.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..core.tenancy import codigos, en_colegio
+from ..database import sesion_de
+from ..models import Job, EstadoJob
+
+logger = logging.getLogger("uvicorn.error")
+
+# tipo de trabajo -> handler(db, payload) -> resultado (dict serializable a JSON)
+_handlers: Dict[str, Callable] = {}
+
+
+def job_handler(tipo: str):
+    """Decorador que registra la función que procesa los trabajos de un tipo."""
+    def registrar(funcion):
+        _handlers[tipo] = funcion
+        return funcion
+    return registrar
+
+
+def encolar(db: Session, tipo: str, payload: dict, creado_por: int = None, max_intentos: int = None) -> Job:
+    if tipo not in _handlers:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    job = Job(
+        tipo=tipo,
+        payload=payload,
+        estado=EstadoJob.PENDIENTE,
+        intentos=0,
+        max_intentos=max_intentos or settings.JOBS_MAX_ATTEMPTS,
+        disponible_en=datetime.utcnow(),
+        creado_por=creado_por,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def concurrencia_por_tipo() -> Dict[str, int]:
+    """Lee JOBS_CONCURRENCY ("boletines=2,default=1") para todos los tipos registrados."""
+    valores = {}
+    for parte in settings.JOBS_CONCURRENCY.split(","):
+        if "=" in parte:
+            tipo, cantidad = parte.split("=", 1)
+            valores[tipo.strip()] = int(cantidad)
+    por_defecto = valores.get("default", 1)
+    return {tipo: valores.get(tipo, por_defecto) for tipo in _handlers}
+
+
+def _tomar_trabajo(db: Session, tipo: str, worker_id: str):
+    """Reserva el siguiente trabajo disponible del tipo, o devuelve None."""
+    ahora = datetime.utcnow()
+    consulta = (
+        db.query(Job)
+        .filter(Job.estado == EstadoJob.PENDIENTE, Job.tipo == tipo, Job.disponible_en <= ahora)
+        .order_by(Job.id)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        job = consulta.with_for_update(skip_locked=True).first()
+        if job is None:
+            db.rollback()
+            return None
+        job.estado = EstadoJob.EN_PROCESO
+        job.bloqueado_por = worker_id
+        job.bloqueado_en = ahora
+        job.intentos += 1
+        db.commit()
+        return job
+
+    candidato = consulta.with_entities(Job.id).first()
+    if candidato is None:
+        db.rollback()
+        return None
+    resultado = db.execute(
+        update(Job)
+        .where(Job.id == candidato.id, Job.estado == EstadoJob.PENDIENTE)
+        .values(estado=EstadoJob.EN_PROCESO, bloqueado_por=worker_id, bloqueado_en=ahora,
+                intentos=Job.intentos + 1)
+    )
+    db.commit()
+    if resultado.rowcount != 1:
+        return None  # otro worker lo tomó primero
+    return db.get(Job, candidato.id)
+
+
+def _backoff(intentos: int) -> timedelta:
+    segundos = min(settings.JOBS_BACKOFF_BASE_SECONDS * 2 ** (intentos - 1), settings.JOBS_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=segundos)
+
+
+def ejecutar(db: Session, job: Job) -> None:
+    try:
+        resultado = _handlers[job.tipo](db, job.payload or {})
+        job = db.get(Job, job.id)
+        job.estado = EstadoJob.COMPLETADO
+        job.resultado = resultado
+        job.error = None
+        job.terminado_en = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        job = db.get(Job, job.id)
+        job.error = f"{e}\n{traceback.format_exc(limit=5)}"
+        if job.intentos < job.max_intentos:
+            job.estado = EstadoJob.PENDIENTE
+            job.disponible_en = datetime.utcnow() + _backoff(job.intentos)
+            logger.warning("Job %s (%s) falló, reintento %s/%s: %s", job.id, job.tipo, job.intentos, job.max_intentos, e)
+        else:
+            job.estado = EstadoJob.FALLIDO
+            job.terminado_en = datetime.utcnow()
+            logger.error("Job %s (%s) falló definitivamente: %s", job.id, job.tipo, e)
+        job.bloqueado_por = None
+        db.commit()
+
+
+def liberar_bloqueos_vencidos(db: Session) -> int:
+    """Devuelve a la cola (o da por fallidos) los trabajos de workers que murieron a mitad de ejecución."""
+    ahora = datetime.utcnow()
+    limite = ahora - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    vencidos = (Job.estado == EstadoJob.EN_PROCESO) & (Job.bloqueado_en < limite)
+    error = "El worker no terminó el trabajo antes de JOBS_LOCK_TIMEOUT_SECONDS"
+    # intentos ya se incrementó al tomar el trabajo
+    fallidos = db.execute(
+        update(Job)
+        .where(vencidos, Job.intentos >= Job.max_intentos)
+        .values(estado=EstadoJob.FALLIDO, bloqueado_por=None, error=error, terminado_en=ahora)
+    ).rowcount
+    reencolados = db.execute(
+        update(Job)
+        .where(vencidos)
+        .values(estado=EstadoJob.PENDIENTE, bloqueado_por=None, error=error,
+                disponible_en=ahora + timedelta(seconds=settings.JOBS_BACKOFF_BASE_SECONDS))
+    ).rowcount
+    db.commit()
+    if fallidos:
+        logger.error("%s trabajos bloqueados agotaron sus intentos y quedaron fallidos", fallidos)
+    return fallidos + reencolados
+
+
+class JobWorker:
+    """Lanza, por cada tipo registrado, tantos hilos como indique JOBS_CONCURRENCY."""
+
+    def __init__(self):
+        self.id = f"{socket.gethostname()}:{os.getpid()}"
+        self._detener = threading.Event()
+        self._hilos = []
+        self._revision_lock = threading.Lock()
+        self._proxima_revision = 0.0
+
+    def _tomar_y_ejecutar(self, codigo, tipo: str, worker_id: str) -> bool:
+        with en_colegio(codigo):
+            db = sesion_de(codigo)
+            try:
+                job = _tomar_trabajo(db, tipo, worker_id)
+                if job is None:
+                    return False
+                ejecutar(db, job)
+                return True
+            finally:
+                db.close()
+
+    def _revisar_bloqueos(self) -> None:
+        # La hace un solo hilo por vuelta; los demás siguen tomando trabajos
+        if time.monotonic() < self._proxima_revision or not self._revision_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() < self._proxima_revision:
+                return
+            self._proxima_revision = time.monotonic() + settings.JOBS_LOCK_CHECK_INTERVAL_SECONDS
+            for codigo in codigos():
+                db = sesion_de(codigo)
+                try:
+                    liberados = liberar_bloqueos_vencidos(db)
+                    if liberados:
+                        logger.info("Se liberaron %s trabajos bloqueados (colegio %s)", liberados, codigo)
+                except Exception as e:
+                    logger.warning("No se pudieron liberar los bloqueos vencidos (colegio %s): %s", codigo, e)
+                finally:
+                    db.close()
+        finally:
+            self._revision_lock.release()
+
+    def _bucle(self, tipo: str, worker_id: str) -> None:
+        while not self._detener.is_set():
+            self._revisar_bloqueos()
+            hubo_trabajo = False
+            for codigo in codigos():
+                try:
+                    hubo_trabajo |= self._tomar_y_ejecutar(codigo, tipo, worker_id)
+                except Exception as e:
+                    logger.warning("Error en el worker de %s (colegio %s): %s", tipo, codigo, e)
+            if not hubo_trabajo:
+                self._detener.wait(settings.JOBS_POLL_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        self._proxima_revision = 0.0
+        self._revisar_bloqueos()
+
+        self._detener.clear()
+        for tipo, cantidad in concurrencia_por_tipo().items():
+            for i in range(cantidad):
+                hilo = threading.Thread(target=self._bucle, args=(tipo, f"{self.id}:{tipo}:{i}"),
+                                        name=f"job-{tipo}-{i}", daemon=True)
+                hilo.start()
+                self._hilos.append(hilo)
+
+    def stop(self, timeout: float = 10) -> None:
+        self._detener.set()
+        for hilo in self._hilos:
+            hilo.join(timeout=timeout)
+        self._hilos = []
+
+    def wait(self) -> None:
+        self._detener.wait()
+
+
+job_worker = JobWorker()
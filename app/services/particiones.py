@@ -0,0 +1,169 @@
+# app/services/particiones.py
+"""
+Particionado por año de `notas` y `participaciones`.
+
+En PostgreSQL ambas tablas están particionadas por RANGE (fecha), una partición
+por año (`notas_2025`, ...) más una DEFAULT para fechas fuera de rango (ver la
+migración c5d1e8f3a274). Las lecturas de un periodo agregan `filtro_periodo()`
+para que el planificador descarte las demás particiones, y un año viejo se
+desacopla con DETACH PARTITION sin reescribir nada, una vez archivados todos sus
+periodos (services/archivo.py): las reconstrucciones de estadísticas y asistencia
+solo conservan las filas de periodos archivados.
+
+Si la DEFAULT ya tiene filas del año, `crear` las pasa a la partición nueva en la
+misma transacción (PostgreSQL no deja crearla mientras la DEFAULT las tenga).
+
+Con otros motores (SQLite) las tablas son normales y estas funciones no hacen
+nada; `filtro_periodo()` sigue siendo válido como filtro.
+
+Uso:
+    python -m app.services.particiones listar
+    python -m app.services.particiones crear 2027
+    python -m app.services.particiones desacoplar 2020
+    python -m app.services.particiones --colegio norte listar
+"""
+import argparse
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from ..core.tenancy import en_colegio
+from ..database import sesion_de
+from ..models import Periodo
+
+TABLAS_PARTICIONADAS = ("notas", "participaciones")
+
+
+def rango_periodo(periodo) -> tuple:
+    """[inicio, fin) en años completos que cubre un periodo (Periodo o fila con fechas y anio)."""
+    desde = periodo.fecha_inicio.year if periodo.fecha_inicio else periodo.anio
+    hasta = periodo.fecha_fin.year if periodo.fecha_fin else periodo.anio
+    return date(desde, 1, 1), date(hasta + 1, 1, 1)
+
+
+def filtro_periodo(columna_fecha, periodo):
+    """Condición sobre la clave de partición para que una lectura de un periodo pode particiones."""
+    inicio, fin = rango_periodo(periodo)
+    return (columna_fecha >= inicio) & (columna_fecha < fin)
+
+
+def particionado(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('notas')"
+    )).first())
+
+
+def listar(db: Session) -> list:
+    if not particionado(db):
+        return []
+    return [dict(fila._mapping) for fila in db.execute(text(
+        "SELECT padre.relname AS tabla, hija.relname AS particion, "
+        "pg_get_expr(hija.relpartbound, hija.oid) AS rango, hija.reltuples::bigint AS filas_estimadas "
+        "FROM pg_inherits i "
+        "JOIN pg_class padre ON padre.oid = i.inhparent "
+        "JOIN pg_class hija ON hija.oid = i.inhrelid "
+        "WHERE padre.oid IN (to_regclass('notas'), to_regclass('participaciones')) "
+        "ORDER BY padre.relname, hija.relname"
+    ))]
+
+
+def crear(db: Session, anio: int) -> list:
+    """Crea (si faltan) las particiones del año. No hace commit."""
+    if not particionado(db):
+        return []
+    creadas = []
+    rango = {"desde": date(anio, 1, 1), "hasta": date(anio + 1, 1, 1)}
+    for tabla in TABLAS_PARTICIONADAS:
+        particion = f"{tabla}_{anio}"
+        if db.execute(text("SELECT to_regclass(:nombre)"), {"nombre": particion}).scalar():
+            continue
+        # Las filas del año que cayeron en la DEFAULT se apartan y vuelven a entrar por la tabla padre
+        db.execute(text(f"CREATE TEMP TABLE {particion}_movidas (LIKE {tabla}) ON COMMIT DROP"))
+        db.execute(text(
+            f"WITH movidas AS (DELETE FROM {tabla}_default WHERE fecha >= :desde AND fecha < :hasta RETURNING *) "
+            f"INSERT INTO {particion}_movidas SELECT * FROM movidas"
+        ), rango)
+        db.execute(text(
+            f"CREATE TABLE {particion} PARTITION OF {tabla} "
+            f"FOR VALUES FROM ('{anio}-01-01') TO ('{anio + 1}-01-01')"
+        ))
+        db.execute(text(f"INSERT INTO {tabla} SELECT * FROM {particion}_movidas"))
+        db.execute(text(f"DROP TABLE {particion}_movidas"))
+        creadas.append(particion)
+    return creadas
+
+
+def periodos_sin_archivar(db: Session, anio: int) -> list:
+    """Ids de los periodos con datos en el año que todavía no se archivaron."""
+    pendientes = []
+    for periodo in db.query(Periodo).filter(Periodo.archivado_en.is_(None)):
+        inicio, fin = rango_periodo(periodo)
+        if inicio.year <= anio < fin.year:
+            pendientes.append(periodo.id)
+    return sorted(pendientes)
+
+
+def desacoplar(db: Session, anio: int) -> list:
+    """
+    Separa las particiones del año de las tablas vivas; quedan como tablas sueltas
+    (`notas_2020`, ...) listas para archivar o borrar. No hace commit.
+    Lanza ValueError si algún periodo del año no está archivado.
+    """
+    if not particionado(db):
+        return []
+    pendientes = periodos_sin_archivar(db, anio)
+    if pendientes:
+        raise ValueError(f"Hay periodos de {anio} sin archivar: {pendientes}; archívelos antes de desacoplar")
+    desacopladas = []
+    for tabla in TABLAS_PARTICIONADAS:
+        particion = f"{tabla}_{anio}"
+        if db.execute(text("SELECT to_regclass(:nombre)"), {"nombre": particion}).scalar():
+            db.execute(text(f"ALTER TABLE {tabla} DETACH PARTITION {particion}"))
+            desacopladas.append(particion)
+    return desacopladas
+
+
+def asegurar_anio_actual(colegio: str = None) -> list:
+    """Crea las particiones del año en curso y del siguiente; se llama al arrancar."""
+    db = sesion_de(colegio)
+    try:
+        hoy = date.today()
+        creadas = crear(db, hoy.year) + crear(db, hoy.year + 1)
+        db.commit()
+        return creadas
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Particiones anuales de notas y participaciones (PostgreSQL)")
+    parser.add_argument("accion", choices=["listar", "crear", "desacoplar"])
+    parser.add_argument("anio", type=int, nargs="?")
+    parser.add_argument("--colegio", help="código del colegio (con TENANCY_ENABLED)")
+    args = parser.parse_args()
+    if args.accion != "listar" and args.anio is None:
+        parser.error("Debe indicar el año")
+
+    with en_colegio(args.colegio):
+        db = sesion_de(args.colegio)
+        try:
+            if not particionado(db):
+                print("La base de datos no tiene tablas particionadas (solo PostgreSQL tras la migración)")
+                return
+            if args.accion == "listar":
+                for fila in listar(db):
+                    print(f"{fila['particion']}: {fila['rango']} (~{fila['filas_estimadas']} filas)")
+                return
+            try:
+                resultado = crear(db, args.anio) if args.accion == "crear" else desacoplar(db, args.anio)
+            except ValueError as e:
+                parser.exit(1, f"{e}\n")
+            db.commit()
+            print(f"{args.accion}: {', '.join(resultado) or 'nada que hacer'}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
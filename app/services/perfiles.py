@@ -0,0 +1,93 @@
+# app/services/perfiles.py
+"""
+Almacén en disco de los perfiles capturados por ProfilingMiddleware.
+
+Cada perfil son dos archivos en PROFILING_DIR: `<id>.prof` (volcado de pstats,
+se abre con `python -m pstats` o snakeviz) y `<id>.json` (petición, duración,
+funciones más costosas y la línea de tiempo de SQL). Se conservan como máximo
+PROFILING_MAX_PROFILES; al guardar uno nuevo se borran los más antiguos.
+"""
+import io
+import json
+import os
+import pstats
+import re
+import uuid
+from datetime import datetime
+from ..config import settings
+
+_ID_VALIDO = re.compile(r"[0-9]{8}T[0-9]{12}-[0-9a-f]{8}")
+
+
+def nuevo_id() -> str:
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+
+def ruta(perfil_id: str, extension: str) -> str:
+    if not _ID_VALIDO.fullmatch(perfil_id):
+        raise ValueError("Identificador de perfil inválido")
+    return os.path.join(settings.PROFILING_DIR, f"{perfil_id}.{extension}")
+
+
+def _funciones(perfil, limite: int) -> list:
+    estadisticas = pstats.Stats(perfil, stream=io.StringIO())
+    filas = []
+    for (archivo, linea, funcion), (_, llamadas, propio, acumulado, _) in estadisticas.stats.items():
+        filas.append({
+            "funcion": f"{archivo}:{linea}({funcion})",
+            "llamadas": llamadas,
+            "propio_ms": round(propio * 1000, 3),
+            "acumulado_ms": round(acumulado * 1000, 3),
+        })
+    filas.sort(key=lambda fila: fila["acumulado_ms"], reverse=True)
+    return filas[:limite]
+
+
+def guardar(perfil_id: str, perfil, datos: dict) -> None:
+    """Escribe el perfil (cProfile.Profile ya detenido) y sus metadatos, y poda los antiguos."""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    perfil.dump_stats(ruta(perfil_id, "prof"))
+    datos = {"id": perfil_id, **datos, "funciones": _funciones(perfil, settings.PROFILING_TOP_FUNCTIONS)}
+    temporal = ruta(perfil_id, "json") + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, default=str)
+    os.replace(temporal, ruta(perfil_id, "json"))
+    _podar()
+
+
+def _ids() -> list:
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    return sorted(
+        nombre[:-5] for nombre in os.listdir(settings.PROFILING_DIR)
+        if nombre.endswith(".json") and _ID_VALIDO.fullmatch(nombre[:-5])
+    )
+
+
+def _podar() -> None:
+    ids = _ids()
+    for perfil_id in ids[:max(0, len(ids) - settings.PROFILING_MAX_PROFILES)]:
+        for extension in ("json", "prof"):
+            try:
+                os.remove(ruta(perfil_id, extension))
+            except FileNotFoundError:
+                pass
+
+
+def leer(perfil_id: str) -> dict:
+    """Metadatos completos de un perfil; None si no existe."""
+    try:
+        with open(ruta(perfil_id, "json"), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def listar() -> list:
+    """Perfiles guardados, del más reciente al más antiguo, sin la línea de tiempo ni las funciones."""
+    resumen = []
+    for perfil_id in reversed(_ids()):
+        datos = leer(perfil_id)
+        if datos is not None:
+            resumen.append({clave: valor for clave, valor in datos.items() if clave not in ("sql", "funciones")})
+    return resumen
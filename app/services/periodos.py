@@ -0,0 +1,124 @@
+# app/services/periodos.py
+"""
+Paso de periodo (rollover): clona los curso-periodo de un periodo en otro, con sus
+materias asignadas, opcionalmente sus bloques de horario y las inscripciones.
+
+Todo se hace con unos pocos INSERT ... SELECT en una sola transacción, sin traer
+filas a Python. Los curso-periodo se emparejan por curso y las materias por
+(curso, materia), así volver a ejecutarlo solo agrega lo que falte.
+En modo simulación se ejecuta igual y se hace rollback, de modo que los conteos
+son exactos.
+"""
+from datetime import datetime
+from sqlalchemy import and_, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+from ..models import BloqueHorario, CursoMateria, CursoPeriodo, Inscripcion, Periodo
+
+
+class RolloverError(ValueError):
+    pass
+
+
+def _validar(db: Session, origen_id: int, destino_id: int) -> None:
+    if origen_id == destino_id:
+        raise RolloverError("El periodo de origen y el de destino deben ser distintos")
+    encontrados = {id for (id,) in db.query(Periodo.id).filter(Periodo.id.in_([origen_id, destino_id]))}
+    for id in (origen_id, destino_id):
+        if id not in encontrados:
+            raise RolloverError(f"Periodo {id} no encontrado")
+    for periodo_id in (origen_id, destino_id):
+        duplicado = (
+            db.query(CursoPeriodo.curso_id)
+            .filter(CursoPeriodo.periodo_id == periodo_id)
+            .group_by(CursoPeriodo.curso_id)
+            .having(func.count(CursoPeriodo.id) > 1)
+            .first()
+        )
+        if duplicado:
+            raise RolloverError(
+                f"El periodo {periodo_id} tiene más de un curso_periodo para el curso {duplicado[0]}"
+            )
+
+
+def rollover(db: Session, origen_id: int, destino_id: int, incluir_inscripciones: bool = True,
+             incluir_horarios: bool = False, dry_run: bool = False) -> dict:
+    _validar(db, origen_id, destino_id)
+    ahora = datetime.utcnow()
+    viejo = aliased(CursoPeriodo)
+    nuevo = aliased(CursoPeriodo)
+    # Empareja cada curso_periodo del origen con el del mismo curso en el destino
+    pareja = and_(viejo.periodo_id == origen_id, nuevo.periodo_id == destino_id, nuevo.curso_id == viejo.curso_id)
+    resumen = {}
+
+    try:
+        existente = aliased(CursoPeriodo)
+        resumen["cursos_periodo"] = db.execute(
+            insert(CursoPeriodo).from_select(
+                ["curso_id", "periodo_id", "aula", "turno", "capacidad_actual", "is_active"],
+                select(viejo.curso_id, literal(destino_id), viejo.aula, viejo.turno, literal(0), literal(True))
+                .where(viejo.periodo_id == origen_id)
+                .where(~exists().where(existente.periodo_id == destino_id, existente.curso_id == viejo.curso_id))
+            )
+        ).rowcount
+
+        cm_viejo = aliased(CursoMateria)
+        cm_existente = aliased(CursoMateria)
+        resumen["cursos_materia"] = db.execute(
+            insert(CursoMateria).from_select(
+                ["materia_id", "curso_periodo_id", "profesor_id", "horario", "aula", "modalidad"],
+                select(cm_viejo.materia_id, nuevo.id, cm_viejo.profesor_id, cm_viejo.horario, cm_viejo.aula,
+                       cm_viejo.modalidad)
+                .join(viejo, cm_viejo.curso_periodo_id == viejo.id)
+                .join(nuevo, pareja)
+                .where(~exists().where(cm_existente.curso_periodo_id == nuevo.id,
+                                       cm_existente.materia_id == cm_viejo.materia_id))
+            )
+        ).rowcount
+
+        if incluir_horarios:
+            cm_nuevo = aliased(CursoMateria)
+            bloque_existente = aliased(BloqueHorario)
+            resumen["bloques_horario"] = db.execute(
+                insert(BloqueHorario).from_select(
+                    ["curso_materia_id", "dia_semana", "hora_inicio", "hora_fin"],
+                    select(cm_nuevo.id, BloqueHorario.dia_semana, BloqueHorario.hora_inicio, BloqueHorario.hora_fin)
+                    .join(cm_viejo, BloqueHorario.curso_materia_id == cm_viejo.id)
+                    .join(viejo, cm_viejo.curso_periodo_id == viejo.id)
+                    .join(nuevo, pareja)
+                    .join(cm_nuevo, and_(cm_nuevo.curso_periodo_id == nuevo.id, cm_nuevo.materia_id == cm_viejo.materia_id))
+                    .where(~exists().where(bloque_existente.curso_materia_id == cm_nuevo.id))
+                )
+            ).rowcount
+
+        if incluir_inscripciones:
+            inscripcion_existente = aliased(Inscripcion)
+            resumen["inscripciones"] = db.execute(
+                insert(Inscripcion).from_select(
+                    ["estudiante_id", "curso_periodo_id", "fecha_inscripcion"],
+                    select(Inscripcion.estudiante_id, nuevo.id, literal(ahora))
+                    .join(viejo, Inscripcion.curso_periodo_id == viejo.id)
+                    .join(nuevo, pareja)
+                    .where(~exists().where(inscripcion_existente.curso_periodo_id == nuevo.id,
+                                           inscripcion_existente.estudiante_id == Inscripcion.estudiante_id))
+                )
+            ).rowcount
+            # capacidad_actual refleja los inscritos de cada curso_periodo del destino
+            db.execute(
+                update(CursoPeriodo)
+                .where(CursoPeriodo.periodo_id == destino_id)
+                .values(capacidad_actual=(
+                    select(func.count(Inscripcion.id))
+                    .where(Inscripcion.curso_periodo_id == CursoPeriodo.id)
+                    .scalar_subquery()
+                ))
+            )
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"dry_run": dry_run, **resumen}
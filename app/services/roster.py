@@ -0,0 +1,249 @@
+# app/services/roster.py
+"""
+Caché de listas de alumnos (roster) por curso-periodo.
+
+Cada roster guarda los ids de estudiante y de usuario en arrays de enteros y los
+nombres como índices a una tabla de cadenas internadas compartida entre todos los
+rosters, en lugar de objetos del ORM: unos 20 bytes por estudiante. La tabla se
+reconstruye con los nombres de los rosters vivos cuando supera el doble de los
+que estos referencian, así no crece con los rosters ya desalojados.
+
+Cada curso-periodo tiene una versión local que sube cuando cambian sus
+inscripciones (eventos de sesión publicados por el bus de invalidación, así
+todos los workers se enteran); un roster construido con una versión anterior
+se descarta. Un cambio en `usuarios` (p. ej. un nombre) descarta solo los
+rosters que incluyen a ese usuario.
+Con varios colegios la clave es (colegio, curso_periodo_id).
+Como en el resto de cachés, las escrituras con Core no generan eventos.
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..core.tenancy import tenant_actual
+from ..database import SessionLocal
+from ..models import Estudiante, Inscripcion, Usuario
+from .invalidation import bus
+
+EstudianteRoster = namedtuple("EstudianteRoster", "id nombre apellido")
+
+
+class TablaNombres:
+    """Tabla de cadenas internadas: cada nombre distinto se guarda una sola vez."""
+
+    def __init__(self):
+        self._nombres = []
+        self._indices = {}
+        self._lock = threading.Lock()
+
+    def indice(self, nombre: str) -> int:
+        with self._lock:
+            indice = self._indices.get(nombre)
+            if indice is None:
+                indice = self._indices[nombre] = len(self._nombres)
+                self._nombres.append(nombre)
+            return indice
+
+    def __getitem__(self, indice: int) -> str:
+        return self._nombres[indice]
+
+    def __len__(self) -> int:
+        return len(self._nombres)
+
+
+class Roster:
+    """Estudiantes inscritos en un curso-periodo, ordenados por apellido y nombre."""
+
+    __slots__ = ("curso_periodo_id", "version", "ids", "nombres", "apellidos", "_ids_ordenados",
+                 "_usuarios_ordenados", "_tabla")
+
+    def __init__(self, curso_periodo_id: int, version: tuple, filas, tabla: TablaNombres):
+        self.curso_periodo_id = curso_periodo_id
+        self.version = version
+        self.ids = array("i")
+        self.nombres = array("i")
+        self.apellidos = array("i")
+        usuarios = []
+        for estudiante_id, usuario_id, nombre, apellido in filas:
+            self.ids.append(estudiante_id)
+            usuarios.append(usuario_id)
+            self.nombres.append(tabla.indice(nombre))
+            self.apellidos.append(tabla.indice(apellido))
+        self._ids_ordenados = array("i", sorted(self.ids))
+        self._usuarios_ordenados = array("i", sorted(usuarios))
+        self._tabla = tabla
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, estudiante_id: int) -> bool:
+        return _buscar(self._ids_ordenados, estudiante_id)
+
+    def incluye_usuario(self, usuario_id: int) -> bool:
+        return _buscar(self._usuarios_ordenados, usuario_id)
+
+    def con_tabla(self, tabla: TablaNombres) -> "Roster":
+        """Copia del roster con sus nombres internados en otra tabla."""
+        copia = object.__new__(Roster)
+        copia.curso_periodo_id, copia.version = self.curso_periodo_id, self.version
+        copia.ids = self.ids
+        copia._ids_ordenados = self._ids_ordenados
+        copia._usuarios_ordenados = self._usuarios_ordenados
+        copia.nombres = array("i", (tabla.indice(self._tabla[indice]) for indice in self.nombres))
+        copia.apellidos = array("i", (tabla.indice(self._tabla[indice]) for indice in self.apellidos))
+        copia._tabla = tabla
+        return copia
+
+    def nombre(self, posicion: int) -> str:
+        return self._tabla[self.nombres[posicion]]
+
+    def apellido(self, posicion: int) -> str:
+        return self._tabla[self.apellidos[posicion]]
+
+    def filas(self):
+        """Itera EstudianteRoster(id, nombre, apellido) en orden de lista."""
+        tabla = self._tabla
+        for estudiante_id, nombre, apellido in zip(self.ids, self.nombres, self.apellidos):
+            yield EstudianteRoster(estudiante_id, tabla[nombre], tabla[apellido])
+
+    def nbytes(self) -> int:
+        """Bytes de los arrays propios del roster (sin la tabla de nombres compartida)."""
+        arrays = (self.ids, self.nombres, self.apellidos, self._ids_ordenados, self._usuarios_ordenados)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+def _buscar(ordenados: array, valor: int) -> bool:
+    posicion = bisect_left(ordenados, valor)
+    return posicion < len(ordenados) and ordenados[posicion] == valor
+
+
+class RosterCache:
+    def __init__(self, max_entradas: int):
+        self.max_entradas = max_entradas
+        self.tabla = TablaNombres()
+        self._rosters = OrderedDict()
+        self._versiones = {}
+        self._generacion = 0
+        self._cambios_usuarios = 0  # sube con cada evento de usuarios; descarta las cargas en curso
+        self._lock = threading.Lock()
+
+    def obtener(self, db: Session, curso_periodo_id: int) -> Roster:
+        clave = (tenant_actual.get(), curso_periodo_id)
+        with self._lock:
+            version = self._version(clave)
+            cambios_usuarios = self._cambios_usuarios
+            roster = self._rosters.get(clave)
+            if roster is not None and roster.version == version:
+                self._rosters.move_to_end(clave)
+                return roster
+
+        filas = (
+            db.query(Estudiante.id, Estudiante.usuario_id, Usuario.nombre, Usuario.apellido)
+            .join(Inscripcion, Inscripcion.estudiante_id == Estudiante.id)
+            .join(Usuario, Estudiante.usuario_id == Usuario.id)
+            .filter(Inscripcion.curso_periodo_id == curso_periodo_id)
+            .order_by(Usuario.apellido, Usuario.nombre)
+        )
+        roster = Roster(curso_periodo_id, version, filas, self.tabla)
+
+        with self._lock:
+            # Si las inscripciones o algún usuario cambiaron mientras se cargaba, no se guarda
+            if self._version(clave) == version and self._cambios_usuarios == cambios_usuarios:
+                self._rosters[clave] = roster
+                self._rosters.move_to_end(clave)
+                while len(self._rosters) > self.max_entradas:
+                    self._rosters.popitem(last=False)
+            self._compactar_tabla()
+        return roster
+
+    def _version(self, clave: tuple) -> tuple:
+        return self._generacion, self._versiones.get(clave, 0)
+
+    def invalidar(self, curso_periodo_id: int) -> None:
+        clave = (tenant_actual.get(), curso_periodo_id)
+        with self._lock:
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+            self._rosters.pop(clave, None)
+
+    def invalidar_usuario(self, usuario_id: int) -> None:
+        """Descarta los rosters del colegio actual que incluyen al usuario."""
+        colegio = tenant_actual.get()
+        with self._lock:
+            self._cambios_usuarios += 1
+            for clave in [clave for clave, roster in self._rosters.items()
+                          if clave[0] == colegio and roster.incluye_usuario(usuario_id)]:
+                self._versiones[clave] = self._versiones.get(clave, 0) + 1
+                del self._rosters[clave]
+            self._compactar_tabla()
+
+    def _compactar_tabla(self) -> None:
+        # Llamar con el lock tomado. Los lectores de los rosters viejos conservan la tabla vieja
+        referencias = sum(2 * len(roster) for roster in self._rosters.values())
+        if len(self.tabla) <= max(2 * referencias, 1024):
+            return
+        tabla = TablaNombres()
+        for clave, roster in list(self._rosters.items()):
+            self._rosters[clave] = roster.con_tabla(tabla)
+        self.tabla = tabla
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generacion += 1
+            self._rosters.clear()
+            self.tabla = TablaNombres()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            rosters = list(self._rosters.values())
+        estudiantes = sum(len(roster) for roster in rosters)
+        nbytes = sum(roster.nbytes() for roster in rosters)
+        return {
+            "rosters": len(rosters),
+            "estudiantes": estudiantes,
+            "bytes": nbytes,
+            "bytes_por_estudiante": round(nbytes / estudiantes, 1) if estudiantes else None,
+            "nombres_internados": len(self.tabla),
+        }
+
+
+roster_cache = RosterCache(settings.ROSTER_CACHE_MAX_ENTRIES)
+
+
+def _al_recibir(evento: dict) -> None:
+    if evento["entidad"] == "roster" and evento.get("id") is not None:
+        roster_cache.invalidar(evento["id"])
+    elif evento["entidad"] == "usuarios":
+        if evento.get("id") is not None:
+            roster_cache.invalidar_usuario(evento["id"])
+        else:
+            roster_cache.clear()
+
+
+bus.subscribe(_al_recibir)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _recolectar_inscripciones(session, flush_context):
+    cursos_periodo = session.info.setdefault("roster", set())
+    for objeto in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(objeto, Inscripcion):
+            cursos_periodo.add(objeto.curso_periodo_id)
+            # Si se movió de curso-periodo también cambia el roster de origen
+            cursos_periodo.update(inspect(objeto).attrs.curso_periodo_id.history.deleted or ())
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publicar_inscripciones(session):
+    cursos_periodo = session.info.pop("roster", None)
+    if cursos_periodo:
+        version = time.time_ns()
+        bus.publish([{"entidad": "roster", "id": id, "version": version} for id in cursos_periodo])
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_inscripciones(session):
+    session.info.pop("roster", None)
@@ -0,0 +1,137 @@
+# app/services/sync.py
+"""
+Feed de cambios para la sincronización incremental de la app móvil (GET /api/v1/sync).
+
+Cada fila de usuarios, tutores, estudiantes y profesores lleva `cambio_seq`, un
+número de una secuencia global que se asigna al confirmar la transacción que la
+creó o modificó. Los borrados dejan una marca en `sync_tombstones` con su propia
+secuencia. El cliente guarda la última secuencia recibida (watermark) y pide
+solo lo posterior; los índices sobre `cambio_seq` hacen que el costo sea
+proporcional a los cambios.
+
+La secuencia se reserva en before_commit con un UPDATE sobre la fila única de
+`sync_secuencia`: el bloqueo de esa fila dura hasta el commit, así el orden de la
+secuencia es el orden de confirmación y un cliente no puede saltarse una
+transacción que confirmó tarde.
+
+Las escrituras con Core (p. ej. synthetic_data) no reciben secuencia;
+secuenciar_pendientes() se la asigna después.
+"""
+from datetime import datetime
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models import Estudiante, Profesor, SyncSecuencia, SyncTombstone, Tutor, Usuario
+
+# entidad -> (modelo, columnas que viajan al cliente)
+ENTIDADES = {
+    "usuarios": (Usuario, ["id", "nombre", "apellido", "email", "rol", "is_active", "created_at", "updated_at"]),
+    "tutores": (Tutor, ["id", "nombre", "apellido", "relacion_estudiante", "ocupacion", "lugar_trabajo",
+                        "correo", "telefono", "updated_at"]),
+    "estudiantes": (Estudiante, ["id", "usuario_id", "tutor_id", "direccion", "fecha_nacimiento", "updated_at"]),
+    "profesores": (Profesor, ["id", "usuario_id", "telefono", "carnet_identidad", "especialidad",
+                              "nivel_academico", "updated_at"]),
+}
+MODELOS = {modelo: entidad for entidad, (modelo, _) in ENTIDADES.items()}
+
+
+def _reservar(conexion, cantidad: int) -> int:
+    """Reserva `cantidad` números de la secuencia y devuelve el primero."""
+    contador = SyncSecuencia.__table__
+    if conexion.execute(
+        update(contador).where(contador.c.id == 1).values(valor=contador.c.valor + cantidad)
+    ).rowcount == 0:
+        conexion.execute(insert(contador).values(id=1, valor=cantidad))
+    return conexion.execute(select(contador.c.valor).where(contador.c.id == 1)).scalar() - cantidad + 1
+
+
+def secuenciar_pendientes(db: Session) -> int:
+    """Asigna secuencia (base + id) a las filas que no la tienen. No hace commit."""
+    total = 0
+    for modelo, _ in ENTIDADES.values():
+        tabla = modelo.__table__
+        maximo = db.execute(select(tabla.c.id).order_by(tabla.c.id.desc()).limit(1)).scalar()
+        if maximo is None:
+            continue
+        base = _reservar(db.connection(), maximo) - 1
+        total += db.execute(
+            update(tabla).where(tabla.c.cambio_seq.is_(None)).values(cambio_seq=base + tabla.c.id)
+        ).rowcount
+    return total
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _recolectar_cambios_sync(session, flush_context):
+    cambios = session.info.setdefault("sync", {})
+    for objeto in list(session.new) + list(session.dirty):
+        entidad = MODELOS.get(type(objeto))
+        if entidad is not None and (objeto in session.new or session.is_modified(objeto)):
+            cambios.setdefault((entidad, objeto.id), "upsert")
+    for objeto in session.deleted:
+        entidad = MODELOS.get(type(objeto))
+        if entidad is not None:
+            cambios[(entidad, objeto.id)] = "delete"
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _asignar_secuencia(session):
+    # before_commit corre antes del flush final del commit; se fuerza aquí para ver todos los cambios
+    session.flush()
+    cambios = session.info.pop("sync", None)
+    if not cambios:
+        return
+    conexion = session.connection()
+    seq = _reservar(conexion, len(cambios))
+    ahora = datetime.utcnow()
+    tombstones = []
+    for (entidad, id), accion in sorted(cambios.items()):
+        if accion == "delete":
+            tombstones.append({"entidad": entidad, "entidad_id": id, "cambio_seq": seq, "eliminado_en": ahora})
+        else:
+            tabla = ENTIDADES[entidad][0].__table__
+            conexion.execute(update(tabla).where(tabla.c.id == id).values(cambio_seq=seq))
+        seq += 1
+    if tombstones:
+        conexion.execute(insert(SyncTombstone), tombstones)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_cambios_sync(session):
+    session.info.pop("sync", None)
+
+
+def cambios_desde(db: Session, desde: int, limite: int) -> dict:
+    """Cambios con secuencia > desde, como máximo `limite`, en orden de secuencia."""
+    candidatos = []
+    for entidad, (modelo, columnas) in ENTIDADES.items():
+        filas = (
+            db.query(*[getattr(modelo, columna) for columna in columnas], modelo.cambio_seq)
+            .filter(modelo.cambio_seq > desde)
+            .order_by(modelo.cambio_seq)
+            .limit(limite + 1)
+        )
+        candidatos.extend((fila.cambio_seq, entidad, fila._asdict()) for fila in filas)
+    for tombstone in (
+        db.query(SyncTombstone.cambio_seq, SyncTombstone.entidad, SyncTombstone.entidad_id)
+        .filter(SyncTombstone.cambio_seq > desde)
+        .order_by(SyncTombstone.cambio_seq)
+        .limit(limite + 1)
+    ):
+        candidatos.append((tombstone.cambio_seq, None, tombstone))
+    candidatos.sort(key=lambda candidato: candidato[0])
+
+    pagina = candidatos[:limite]
+    cambios = {entidad: [] for entidad in ENTIDADES}
+    eliminados = {entidad: [] for entidad in ENTIDADES}
+    for _, entidad, datos in pagina:
+        if entidad is None:
+            eliminados[datos.entidad].append(datos.entidad_id)
+        else:
+            cambios[entidad].append(datos)
+    return {
+        "desde": desde,
+        "watermark": pagina[-1][0] if pagina else desde,
+        "hay_mas": len(candidatos) > limite,
+        "cambios": cambios,
+        "eliminados": eliminados,
+    }
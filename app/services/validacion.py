@@ -0,0 +1,186 @@
+# app/services/validacion.py
+"""
+Validación por lotes de filas de usuarios y estudiantes para cargas masivas.
+
+Valida columna por columna en vez de construir un modelo pydantic por fila:
+los valores con la forma habitual (str, int, emails ASCII simples, fechas
+ISO sin zona) se aceptan con comprobaciones baratas, y solo los demás pasan por
+el TypeAdapter de pydantic del mismo tipo del esquema, así las reglas y los
+mensajes de error son los de UserCreate / EstudianteCreate. Después se revisan
+duplicados dentro del lote y contra la base con un IN por columna.
+
+Cada error es {"fila", "campo", "tipo", "mensaje"}; una fila con errores no se
+devuelve entre las válidas.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from email_validator import SPECIAL_USE_DOMAIN_NAMES
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy.orm import Session
+from ..models import Estudiante, Tutor, Usuario
+from ..schemas.auth import validar_rol
+from ..schemas.users import validar_fecha_nacimiento
+
+LOTE_IN = 5000  # valores por consulta IN
+
+# Emails que email-validator acepta sin cambios salvo el dominio en minúsculas
+_EMAIL_SIMPLE = re.compile(
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@((?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63})"
+)
+_FECHA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?")
+_LENTO = object()
+
+
+@lru_cache(maxsize=None)
+def _adaptador(tipo):
+    return TypeAdapter(tipo)
+
+
+def _email_rapido(valor):
+    if type(valor) is not str or len(valor) > 254:
+        return _LENTO
+    m = _EMAIL_SIMPLE.fullmatch(valor)
+    if not m or valor.index("@") > 64:
+        return _LENTO
+    dominio = m.group(1).lower()
+    if "xn--" in dominio or any(dominio == d or dominio.endswith("." + d) for d in SPECIAL_USE_DOMAIN_NAMES):
+        return _LENTO
+    return valor[:len(valor) - len(dominio)] + dominio
+
+
+def _str_rapido(valor):
+    return valor if type(valor) is str else _LENTO
+
+
+def _int_rapido(valor):
+    return valor if type(valor) is int else _LENTO
+
+
+def _fecha_rapida(valor):
+    if valor is None or type(valor) is datetime:
+        return valor
+    if type(valor) is str and _FECHA_ISO.fullmatch(valor):
+        try:
+            return datetime.fromisoformat(valor)
+        except ValueError:
+            pass
+    return _LENTO
+
+
+# campo -> (tipo del esquema, obligatorio, comprobación rápida, regla adicional)
+CAMPOS_USUARIO = {
+    "email": (EmailStr, True, _email_rapido, None),
+    "password": (str, True, _str_rapido, None),
+    "nombre": (str, True, _str_rapido, None),
+    "apellido": (str, True, _str_rapido, None),
+    "rol": (str, True, _str_rapido, validar_rol),
+}
+CAMPOS_ESTUDIANTE = {
+    "usuario_id": (int, True, _int_rapido, None),
+    "tutor_id": (int, True, _int_rapido, None),
+    "direccion": (Optional[str], False, lambda v: v if v is None else _str_rapido(v), None),
+    "fecha_nacimiento": (Optional[datetime], False, _fecha_rapida, validar_fecha_nacimiento),
+}
+
+
+class _Resultado:
+    def __init__(self):
+        self.errores = []
+        self.con_error = set()
+
+    def error(self, fila: int, campo: str, tipo: str, mensaje: str) -> None:
+        self.errores.append({"fila": fila, "campo": campo, "tipo": tipo, "mensaje": mensaje})
+        self.con_error.add(fila)
+
+
+def _validar_columnas(filas: list, campos: dict, resultado: _Resultado) -> dict:
+    """Valida y normaliza cada columna; devuelve {campo: [valores]} alineado con `filas`."""
+    columnas = {}
+    for campo, (tipo, obligatorio, rapido, regla) in campos.items():
+        valores = [fila.get(campo, _LENTO) if obligatorio else fila.get(campo) for fila in filas]
+        limpios = [rapido(valor) if valor is not _LENTO else _LENTO for valor in valores]
+        for i, limpio in enumerate(limpios):
+            if limpio is not _LENTO:
+                continue
+            if valores[i] is _LENTO:
+                resultado.error(i, campo, "missing", "Field required")
+                continue
+            try:
+                limpios[i] = _adaptador(tipo).validate_python(valores[i])
+            except ValidationError as e:
+                detalle = e.errors()[0]
+                resultado.error(i, campo, detalle["type"], detalle["msg"])
+        if regla is not None:
+            for i, limpio in enumerate(limpios):
+                if limpio is _LENTO:
+                    continue
+                try:
+                    regla(limpio)
+                except ValueError as e:
+                    resultado.error(i, campo, "value_error", f"Value error, {e}")
+        columnas[campo] = limpios
+    return columnas
+
+
+def _repetidos(columna: list, campo: str, resultado: _Resultado, mensaje: str) -> None:
+    primera = {}
+    for i, valor in enumerate(columna):
+        if valor is _LENTO or valor is None:
+            continue
+        if valor in primera:
+            resultado.error(i, campo, "duplicado", f"{mensaje} (fila {primera[valor]})")
+        else:
+            primera[valor] = i
+
+
+def _existentes(db: Session, columna_modelo, valores) -> set:
+    valores = list({valor for valor in valores if valor is not _LENTO and valor is not None})
+    encontrados = set()
+    for inicio in range(0, len(valores), LOTE_IN):
+        encontrados.update(
+            valor for (valor,) in db.query(columna_modelo).filter(columna_modelo.in_(valores[inicio:inicio + LOTE_IN]))
+        )
+    return encontrados
+
+
+def _filas_validas(filas: list, columnas: dict, resultado: _Resultado) -> list:
+    return [
+        {campo: columnas[campo][i] for campo in columnas}
+        for i in range(len(filas)) if i not in resultado.con_error
+    ]
+
+
+def validar_usuarios(db: Session, filas: list) -> tuple:
+    """Mismas reglas que UserCreate más email único (en el lote y en la base). Devuelve (válidas, errores)."""
+    resultado = _Resultado()
+    columnas = _validar_columnas(filas, CAMPOS_USUARIO, resultado)
+    emails = columnas["email"]
+    _repetidos(emails, "email", resultado, "Email repetido en el lote")
+    registrados = _existentes(db, Usuario.email, emails)
+    for i, email in enumerate(emails):
+        if email in registrados:
+            resultado.error(i, "email", "duplicado", "El email ya está registrado")
+    return _filas_validas(filas, columnas, resultado), sorted(resultado.errores, key=lambda e: e["fila"])
+
+
+def validar_estudiantes(db: Session, filas: list) -> tuple:
+    """Mismas reglas que EstudianteCreate y que POST /estudiantes. Devuelve (válidas, errores)."""
+    resultado = _Resultado()
+    columnas = _validar_columnas(filas, CAMPOS_ESTUDIANTE, resultado)
+    usuario_ids = columnas["usuario_id"]
+    _repetidos(usuario_ids, "usuario_id", resultado, "usuario_id repetido en el lote")
+    usuarios = _existentes(db, Usuario.id, usuario_ids)
+    ya_estudiantes = _existentes(db, Estudiante.usuario_id, usuario_ids)
+    tutores = _existentes(db, Tutor.id, columnas["tutor_id"])
+    for i, (usuario_id, tutor_id) in enumerate(zip(usuario_ids, columnas["tutor_id"])):
+        if usuario_id is not _LENTO:
+            if usuario_id in ya_estudiantes:
+                resultado.error(i, "usuario_id", "duplicado", "Ya existe un estudiante con ese usuario_id")
+            elif usuario_id not in usuarios:
+                resultado.error(i, "usuario_id", "no_encontrado", "Usuario no encontrado")
+        if tutor_id is not _LENTO and tutor_id not in tutores:
+            resultado.error(i, "tutor_id", "no_encontrado", "Tutor no encontrado")
+    return _filas_validas(filas, columnas, resultado), sorted(resultado.errores, key=lambda e: e["fila"])
@@ -0,0 +1,128 @@
+# app/stress_enrollment.py
+"""
+Prueba de carga de inscripciones concurrentes contra un mismo curso.
+
+Crea un curso con cupo limitado, lanza en paralelo una inscripción por estudiante
+(más algunos reintentos duplicados) y verifica que no haya sobrecupo:
+inscritos == capacidad_actual <= capacidad_maxima. Al final borra lo creado.
+
+Usa la base configurada en DATABASE_URL y estudiantes ya existentes
+(p. ej. generados con app.synthetic_data). Pensada para PostgreSQL; con SQLite
+las escrituras se serializan y pueden aparecer errores "database is locked".
+
+Uso:
+    python -m app.stress_enrollment --estudiantes 2000 --capacidad 500 --hilos 64
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from sqlalchemy import delete, func
+from .database import SessionLocal
+from .models import Curso, CursoPeriodo, Estudiante, Inscripcion, Periodo
+from .services.inscripciones import CupoLlenoError, InscripcionDuplicadaError, inscribir
+
+
+def _preparar(capacidad: int) -> dict:
+    db = SessionLocal()
+    try:
+        sufijo = f"{time.time_ns()}"
+        curso = Curso(nombre="Prueba de carga", sigla=f"CARGA-{sufijo}", capacidad_maxima=capacidad)
+        periodo = Periodo(bimestre=1, anio=date.today().year, descripcion=f"Prueba de carga {sufijo}")
+        db.add_all([curso, periodo])
+        db.flush()
+        curso_periodo = CursoPeriodo(curso_id=curso.id, periodo_id=periodo.id, capacidad_actual=0)
+        db.add(curso_periodo)
+        db.commit()
+        return {"curso_id": curso.id, "periodo_id": periodo.id, "curso_periodo_id": curso_periodo.id}
+    finally:
+        db.close()
+
+
+def _limpiar(ids: dict) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(Inscripcion).where(Inscripcion.curso_periodo_id == ids["curso_periodo_id"]))
+        db.execute(delete(CursoPeriodo).where(CursoPeriodo.id == ids["curso_periodo_id"]))
+        db.execute(delete(Periodo).where(Periodo.id == ids["periodo_id"]))
+        db.execute(delete(Curso).where(Curso.id == ids["curso_id"]))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _intentar(curso_periodo_id: int, estudiante_id: int) -> str:
+    db = SessionLocal()
+    try:
+        inscribir(db, curso_periodo_id, estudiante_id)
+        return "inscritos"
+    except CupoLlenoError:
+        return "sin_cupo"
+    except InscripcionDuplicadaError:
+        return "duplicados"
+    except Exception:
+        db.rollback()
+        return "errores"
+    finally:
+        db.close()
+
+
+def ejecutar(estudiantes: int, capacidad: int, hilos: int, duplicados: float, semilla: int, conservar: bool) -> bool:
+    db = SessionLocal()
+    try:
+        ids_estudiantes = [id for (id,) in db.query(Estudiante.id).order_by(Estudiante.id).limit(estudiantes)]
+    finally:
+        db.close()
+    if len(ids_estudiantes) < estudiantes:
+        print(f"Solo hay {len(ids_estudiantes)} estudiantes; genera más con python -m app.synthetic_data")
+        return False
+
+    rng = random.Random(semilla)
+    intentos = ids_estudiantes + rng.sample(ids_estudiantes, int(len(ids_estudiantes) * duplicados))
+    rng.shuffle(intentos)
+
+    ids = _preparar(capacidad)
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            resultados = Counter(pool.map(lambda e: _intentar(ids["curso_periodo_id"], e), intentos))
+        duracion = time.perf_counter() - inicio
+
+        db = SessionLocal()
+        try:
+            inscritos = db.query(func.count(Inscripcion.id)).filter(
+                Inscripcion.curso_periodo_id == ids["curso_periodo_id"]).scalar()
+            capacidad_actual = db.query(CursoPeriodo.capacidad_actual).filter(
+                CursoPeriodo.id == ids["curso_periodo_id"]).scalar()
+        finally:
+            db.close()
+    finally:
+        if not conservar:
+            _limpiar(ids)
+
+    print(f"{len(intentos)} intentos con {hilos} hilos en {duracion:.2f}s ({len(intentos) / duracion:.0f} inscripciones/s)")
+    print(", ".join(f"{clave}: {valor}" for clave, valor in sorted(resultados.items())))
+    print(f"Inscritos en la BD: {inscritos}, capacidad_actual: {capacidad_actual}, cupo: {capacidad}")
+    correcto = inscritos == capacidad_actual <= capacidad and inscritos == resultados["inscritos"]
+    print("OK: sin sobrecupo" if correcto else "FALLO: el contador no coincide o hay sobrecupo")
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de inscripciones concurrentes")
+    parser.add_argument("--estudiantes", type=int, default=1000)
+    parser.add_argument("--capacidad", type=int, default=300)
+    parser.add_argument("--hilos", type=int, default=32)
+    parser.add_argument("--duplicados", type=float, default=0.1, help="fracción de intentos repetidos")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--conservar", action="store_true", help="no borrar el curso de prueba al terminar")
+    args = parser.parse_args()
+    sys.exit(0 if ejecutar(args.estudiantes, args.capacidad, args.hilos, args.duplicados,
+                           args.semilla, args.conservar) else 1)
+
+
+if __name__ == "__main__":
+    main()
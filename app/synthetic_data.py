@@ -0,0 +1,405 @@
+# app/synthetic_data.py
+"""
+Generador de datos sintéticos para pruebas de carga y entornos de staging.
+
+A diferencia de seed_data.py, genera volúmenes configurables (colegios, tutores,
+estudiantes, profesores, estructura académica, notas y asistencia) con una
+semilla determinista e inserciones masivas.
+Todas las cuentas comparten un único hash de contraseña precalculado.
+
+Uso:
+    python -m app.synthetic_data --colegios 10 --estudiantes 50000 --semilla 42
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+from .database import SessionLocal
+from .models import (
+    Usuario, Estudiante, Profesor, Administrativo, Tutor, RolUsuario, Materia, Curso, Periodo,
+    CursoPeriodo, CursoMateria, Inscripcion, Nota, Participacion,
+)
+from .core.security import get_password_hash
+from .services.asistencia import reconstruir as reconstruir_asistencia
+from .services.estadisticas import reconstruir as reconstruir_estadisticas
+from .services.sync import secuenciar_pendientes
+
+NOMBRES = [
+    "Juan", "María", "José", "Ana", "Luis", "Carmen", "Carlos", "Rosa", "Jorge", "Lucía",
+    "Miguel", "Elena", "Pedro", "Sofía", "Diego", "Valeria", "Andrés", "Camila", "Fernando", "Gabriela",
+]
+APELLIDOS = [
+    "Pérez", "González", "Rodríguez", "Martínez", "López", "García", "Fernández", "Mamani",
+    "Quispe", "Flores", "Vargas", "Rojas", "Gutiérrez", "Torres", "Choque", "Romero",
+]
+RELACIONES = ["padre", "madre", "tío", "tía", "abuelo", "abuela", "hermano", "hermana"]
+OCUPACIONES = ["Ingeniero", "Comerciante", "Docente", "Médico", "Abogado", "Contador", "Chofer", None]
+ESPECIALIDADES = ["Matemáticas", "Lenguaje", "Ciencias Naturales", "Historia", "Física", "Química", "Inglés"]
+NIVELES_ACADEMICOS = ["Licenciatura", "Maestría", "Doctorado"]
+MATERIAS = ["Matemáticas", "Lenguaje", "Ciencias Naturales", "Ciencias Sociales", "Física", "Química",
+            "Inglés", "Educación Física", "Música", "Artes Plásticas", "Biología", "Filosofía"]
+TURNOS = ["mañana", "tarde"]
+
+
+@dataclass
+class Escala:
+    colegios: int = 1
+    tutores: int = 500
+    estudiantes: int = 1000
+    profesores: int = 50
+    administrativos: int = 2
+    cursos: int = 20
+    materias: int = 8
+    periodos: int = 1
+    anio: int = 2025
+    notas_por_materia: int = 3
+    dias_asistencia: int = 10
+    semilla: int = 42
+    lote: int = 5000
+    password: str = "password123"
+
+    def __post_init__(self):
+        # Los colegios, tutores y cursos se reparten con módulo / randrange: no pueden ser cero
+        for campo in ("colegios", "tutores", "cursos", "lote"):
+            if getattr(self, campo) < 1:
+                raise ValueError(f"{campo} debe ser al menos 1")
+        for campo in ("estudiantes", "profesores", "administrativos", "materias", "periodos",
+                      "notas_por_materia", "dias_asistencia"):
+            if getattr(self, campo) < 0:
+                raise ValueError(f"{campo} no puede ser negativo")
+
+
+def _insertar_por_lotes(db: Session, tabla, filas, lote: int) -> int:
+    """Inserta las filas con executemany en bloques de tamaño fijo."""
+    total = 0
+    buffer = []
+    for fila in filas:
+        buffer.append(fila)
+        if len(buffer) >= lote:
+            db.execute(insert(tabla), buffer)
+            total += len(buffer)
+            buffer = []
+    if buffer:
+        db.execute(insert(tabla), buffer)
+        total += len(buffer)
+    return total
+
+
+def _siguiente_id(db: Session, modelo) -> int:
+    return (db.query(func.max(modelo.id)).scalar() or 0) + 1
+
+
+def _sincronizar_secuencias(db: Session, tablas) -> None:
+    """En PostgreSQL los ids se asignan explícitamente, así que hay que avanzar las secuencias."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for tabla in tablas:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabla}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {tabla}), 1))"
+        ))
+
+
+def _usuarios(rng, escala, primer_id, cantidad, rol, prefijo, password_hash, ahora):
+    for i in range(cantidad):
+        colegio = i % escala.colegios + 1
+        yield {
+            "id": primer_id + i,
+            "nombre": rng.choice(NOMBRES),
+            "apellido": rng.choice(APELLIDOS),
+            "email": f"{prefijo}{primer_id + i}@colegio{colegio}.edu.bo",
+            "password": password_hash,
+            "rol": rol,
+            "created_at": ahora,
+            "updated_at": ahora,
+            "is_active": True,
+        }
+
+
+def generar_tutores(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    primer_id = _siguiente_id(db, Tutor)
+    ctx["tutores"] = range(primer_id, primer_id + escala.tutores)
+
+    def filas():
+        for i in range(escala.tutores):
+            tutor_id = primer_id + i
+            ocupacion = rng.choice(OCUPACIONES)
+            yield {
+                "id": tutor_id,
+                "nombre": rng.choice(NOMBRES),
+                "apellido": rng.choice(APELLIDOS),
+                "relacion_estudiante": rng.choice(RELACIONES),
+                "ocupacion": ocupacion,
+                "lugar_trabajo": f"Empresa {rng.randint(1, 500)}" if ocupacion else None,
+                "correo": f"tutor{tutor_id}@colegio{i % escala.colegios + 1}.edu.bo",
+                "telefono": f"7{rng.randint(0, 9999999):07d}",
+            }
+
+    return _insertar_por_lotes(db, Tutor.__table__, filas(), escala.lote)
+
+
+def generar_estudiantes(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    primer_usuario = _siguiente_id(db, Usuario)
+    primer_id = _siguiente_id(db, Estudiante)
+    _insertar_por_lotes(
+        db, Usuario.__table__,
+        _usuarios(rng, escala, primer_usuario, escala.estudiantes, RolUsuario.ESTUDIANTE,
+                  "estudiante", ctx["password_hash"], ctx["ahora"]),
+        escala.lote,
+    )
+    ctx["estudiantes"] = range(primer_id, primer_id + escala.estudiantes)
+
+    tutores = ctx["tutores"]
+    nacimiento_base = datetime(2005, 1, 1)
+
+    def filas():
+        for i in range(escala.estudiantes):
+            yield {
+                "id": primer_id + i,
+                "usuario_id": primer_usuario + i,
+                "tutor_id": tutores[rng.randrange(len(tutores))],
+                "direccion": f"Calle {rng.randint(1, 999)} #{rng.randint(1, 2000)}",
+                "fecha_nacimiento": nacimiento_base + timedelta(days=rng.randint(0, 365 * 12)),
+            }
+
+    return _insertar_por_lotes(db, Estudiante.__table__, filas(), escala.lote)
+
+
+def generar_profesores(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    primer_usuario = _siguiente_id(db, Usuario)
+    primer_id = _siguiente_id(db, Profesor)
+    _insertar_por_lotes(
+        db, Usuario.__table__,
+        _usuarios(rng, escala, primer_usuario, escala.profesores, RolUsuario.PROFESOR,
+                  "profesor", ctx["password_hash"], ctx["ahora"]),
+        escala.lote,
+    )
+    ctx["profesores"] = range(primer_id, primer_id + escala.profesores)
+
+    def filas():
+        for i in range(escala.profesores):
+            yield {
+                "id": primer_id + i,
+                "usuario_id": primer_usuario + i,
+                "telefono": f"6{rng.randint(0, 9999999):07d}",
+                "carnet_identidad": f"{primer_id + i:08d}",
+                "especialidad": rng.choice(ESPECIALIDADES),
+                "nivel_academico": rng.choice(NIVELES_ACADEMICOS),
+            }
+
+    return _insertar_por_lotes(db, Profesor.__table__, filas(), escala.lote)
+
+
+def generar_administrativos(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    primer_usuario = _siguiente_id(db, Usuario)
+    primer_id = _siguiente_id(db, Administrativo)
+    _insertar_por_lotes(
+        db, Usuario.__table__,
+        _usuarios(rng, escala, primer_usuario, escala.administrativos, RolUsuario.ADMINISTRATIVO,
+                  "admin", ctx["password_hash"], ctx["ahora"]),
+        escala.lote,
+    )
+    filas = ({"id": primer_id + i, "usuario_id": primer_usuario + i} for i in range(escala.administrativos))
+    return _insertar_por_lotes(db, Administrativo.__table__, filas, escala.lote)
+
+
+def generar_estructura_academica(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    """Materias, cursos, periodos (bimestres), cursos por periodo y materias por curso."""
+    total = 0
+    primera_materia = _siguiente_id(db, Materia)
+    materias = range(primera_materia, primera_materia + escala.materias)
+    total += _insertar_por_lotes(db, Materia.__table__, (
+        {"id": materia_id, "nombre": MATERIAS[i % len(MATERIAS)] + (f" {i // len(MATERIAS) + 1}" if i >= len(MATERIAS) else ""),
+         "horas_semanales": rng.randint(2, 6), "is_active": True}
+        for i, materia_id in enumerate(materias)
+    ), escala.lote)
+
+    primer_curso = _siguiente_id(db, Curso)
+    total += _insertar_por_lotes(db, Curso.__table__, (
+        {"id": primer_curso + i, "nombre": f"Curso {i + 1}", "sigla": f"C{primer_curso + i}",
+         "nivel": f"{i % 6 + 1}° secundaria", "capacidad_maxima": (escala.estudiantes + escala.cursos - 1) // escala.cursos + 5,
+         "is_active": True}
+        for i in range(escala.cursos)
+    ), escala.lote)
+
+    primer_periodo = _siguiente_id(db, Periodo)
+    periodos = []
+    for b in range(escala.periodos):
+        inicio = date(escala.anio, 2, 1) + timedelta(days=70 * b)
+        periodos.append({"id": primer_periodo + b, "bimestre": b % 4 + 1, "anio": escala.anio + b // 4,
+                         "fecha_inicio": inicio, "fecha_fin": inicio + timedelta(days=65), "is_active": True})
+    total += _insertar_por_lotes(db, Periodo.__table__, periodos, escala.lote)
+
+    primer_cp = _siguiente_id(db, CursoPeriodo)
+    primer_cm = _siguiente_id(db, CursoMateria)
+    profesores = ctx.get("profesores") or [None]
+    cursos_periodo, cursos_materia = [], []
+    ctx["cursos_periodo"] = {}  # (indice de curso, indice de periodo) -> (cp_id, [cm_id...], fecha_inicio)
+    for p, periodo in enumerate(periodos):
+        for c in range(escala.cursos):
+            cp_id = primer_cp + len(cursos_periodo)
+            cursos_periodo.append({"id": cp_id, "curso_id": primer_curso + c, "periodo_id": periodo["id"],
+                                   "aula": f"A{c + 1}", "turno": TURNOS[c % 2], "capacidad_actual": 0,
+                                   "is_active": True})
+            cm_ids = []
+            for materia_id in materias:
+                cm_id = primer_cm + len(cursos_materia)
+                cursos_materia.append({"id": cm_id, "materia_id": materia_id, "curso_periodo_id": cp_id,
+                                       "profesor_id": profesores[rng.randrange(len(profesores))],
+                                       "aula": f"A{c + 1}", "modalidad": "presencial"})
+                cm_ids.append(cm_id)
+            ctx["cursos_periodo"][(c, p)] = (cp_id, cm_ids, periodo["fecha_inicio"])
+    total += _insertar_por_lotes(db, CursoPeriodo.__table__, cursos_periodo, escala.lote)
+    total += _insertar_por_lotes(db, CursoMateria.__table__, cursos_materia, escala.lote)
+    return total
+
+
+def _curso_de(escala: Escala, indice_estudiante: int) -> int:
+    return indice_estudiante % escala.cursos
+
+
+def generar_inscripciones(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    estudiantes = ctx["estudiantes"]
+    ahora = ctx["ahora"]
+    filas = (
+        {"estudiante_id": estudiante_id, "curso_periodo_id": ctx["cursos_periodo"][(_curso_de(escala, i), p)][0],
+         "fecha_inscripcion": ahora}
+        for p in range(escala.periodos)
+        for i, estudiante_id in enumerate(estudiantes)
+    )
+    total = _insertar_por_lotes(db, Inscripcion.__table__, filas, escala.lote)
+    # capacidad_actual refleja los inscritos de cada curso-periodo
+    for (c, p), (cp_id, _, _) in ctx["cursos_periodo"].items():
+        inscritos = len(range(c, len(estudiantes), escala.cursos))
+        db.execute(CursoPeriodo.__table__.update().where(CursoPeriodo.id == cp_id).values(capacidad_actual=inscritos))
+    return total
+
+
+def generar_notas(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    def filas():
+        for p in range(escala.periodos):
+            for i, estudiante_id in enumerate(ctx["estudiantes"]):
+                _, cm_ids, inicio = ctx["cursos_periodo"][(_curso_de(escala, i), p)]
+                base = rng.gauss(70, 12)  # cada estudiante tiene un nivel propio
+                for cm_id in cm_ids:
+                    for n in range(escala.notas_por_materia):
+                        valor = max(0.0, min(100.0, round(rng.gauss(base, 8), 1)))
+                        yield {"estudiante_id": estudiante_id, "curso_materia_id": cm_id, "valor": valor,
+                               "fecha": inicio + timedelta(days=7 + n * 14),
+                               "descripcion": f"Evaluación {n + 1}",
+                               "rendimiento": "alto" if valor >= 80 else "medio" if valor >= 51 else "bajo"}
+
+    return _insertar_por_lotes(db, Nota.__table__, filas(), escala.lote)
+
+
+def generar_participaciones(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    def filas():
+        for p in range(escala.periodos):
+            for i, estudiante_id in enumerate(ctx["estudiantes"]):
+                _, cm_ids, inicio = ctx["cursos_periodo"][(_curso_de(escala, i), p)]
+                probabilidad = rng.uniform(0.75, 0.99)
+                for cm_id in cm_ids:
+                    for d in range(escala.dias_asistencia):
+                        asistio = rng.random() < probabilidad
+                        yield {"estudiante_id": estudiante_id, "curso_materia_id": cm_id, "asistencia": asistio,
+                               "participacion_clase": rng.randint(0, 10) if asistio else 0,
+                               "fecha": inicio + timedelta(days=d), "observacion": None}
+
+    return _insertar_por_lotes(db, Participacion.__table__, filas(), escala.lote)
+
+
+def generar_estadisticas(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    # Las notas se insertaron con Core, sin pasar por el mantenimiento incremental
+    return reconstruir_estadisticas(db, escala.lote)["filas"]
+
+
+def generar_asistencia(db: Session, rng: random.Random, escala: Escala, ctx: dict) -> int:
+    # Igual que las notas: las participaciones se insertaron con Core
+    return reconstruir_asistencia(db, escala.lote)["filas"]
+
+
+# Pasos del generador en orden de dependencias. Cada paso recibe el contexto
+# compartido con los rangos de ids generados por los pasos anteriores.
+GENERADORES = [
+    ("tutores", generar_tutores),
+    ("estudiantes", generar_estudiantes),
+    ("profesores", generar_profesores),
+    ("administrativos", generar_administrativos),
+    ("estructura_academica", generar_estructura_academica),
+    ("inscripciones", generar_inscripciones),
+    ("notas", generar_notas),
+    ("estadisticas", generar_estadisticas),
+    ("participaciones", generar_participaciones),
+    ("asistencia", generar_asistencia),
+]
+
+TABLAS = [
+    "tutores", "usuarios", "estudiantes", "profesores", "administrativos", "materias", "cursos",
+    "periodos", "cursos_periodo", "cursos_materia", "inscripciones", "notas", "estadisticas_notas",
+    "participaciones", "asistencia_bitmaps",
+]
+
+
+def generar(escala: Escala, db: Session = None) -> dict:
+    """
+    Genera el conjunto de datos completo en una sola transacción.
+    Devuelve la cantidad de filas insertadas por paso.
+    """
+    propia = db is None
+    db = db or SessionLocal()
+    rng = random.Random(escala.semilla)
+    ctx = {
+        "password_hash": get_password_hash(escala.password),
+        "ahora": datetime.utcnow(),
+    }
+    resumen = {}
+    try:
+        for nombre, paso in GENERADORES:
+            inicio = time.perf_counter()
+            resumen[nombre] = paso(db, rng, escala, ctx)
+            print(f"{nombre}: {resumen[nombre]} filas en {time.perf_counter() - inicio:.2f}s")
+        _sincronizar_secuencias(db, TABLAS)
+        # Las filas insertadas con Core entran al feed /sync
+        secuenciar_pendientes(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if propia:
+            db.close()
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para pruebas de carga")
+    parser.add_argument("--colegios", type=int, default=Escala.colegios)
+    parser.add_argument("--tutores", type=int, default=Escala.tutores)
+    parser.add_argument("--estudiantes", type=int, default=Escala.estudiantes)
+    parser.add_argument("--profesores", type=int, default=Escala.profesores)
+    parser.add_argument("--administrativos", type=int, default=Escala.administrativos)
+    parser.add_argument("--cursos", type=int, default=Escala.cursos)
+    parser.add_argument("--materias", type=int, default=Escala.materias)
+    parser.add_argument("--periodos", type=int, default=Escala.periodos, help="bimestres a generar")
+    parser.add_argument("--anio", type=int, default=Escala.anio)
+    parser.add_argument("--notas-por-materia", type=int, default=Escala.notas_por_materia)
+    parser.add_argument("--dias-asistencia", type=int, default=Escala.dias_asistencia)
+    parser.add_argument("--semilla", type=int, default=Escala.semilla)
+    parser.add_argument("--lote", type=int, default=Escala.lote)
+    parser.add_argument("--password", default=Escala.password)
+    args = parser.parse_args()
+    try:
+        escala = Escala(**vars(args))
+    except ValueError as e:
+        parser.error(str(e))
+
+    inicio = time.perf_counter()
+    resumen = generar(escala)
+    print(f"Datos sintéticos generados: {sum(resumen.values())} filas en {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# app/worker.py
+"""
+Proceso de workers de la cola de trabajos, independiente de la API.
+
+Uso:
+    python -m app.worker
+
+Útil con JOBS_WORKER_ENABLED=false en la API para separar las tareas pesadas
+de los procesos que atienden peticiones.
+"""
+import logging
+import signal
+from .services import archivo, asistencia, boletines, estadisticas  # noqa: F401  registra los handlers de trabajos
+from .services.jobs import job_worker, concurrencia_por_tipo
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    job_worker.start()
+    print(f"Worker {job_worker.id} procesando: {concurrencia_por_tipo()}")
+    signal.signal(signal.SIGTERM, lambda *_: job_worker.stop(timeout=0))
+    try:
+        job_worker.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        job_worker.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# app.config exige estas variables; los tests no tocan una base real
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'test_aula.db')}")
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("PROJECT_NAME", "Aula Digital")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
@@ -0,0 +1,45 @@
+import asyncio
+from app.core.tenancy import en_colegio
+from app.services.eventos import Broadcaster, canal_curso_periodo
+
+
+def _recibidos(suscripcion) -> list:
+    mensajes = []
+    while not suscripcion.cola.empty():
+        mensajes.append(suscripcion.cola.get_nowait())
+    return mensajes
+
+
+def test_suscripcion_por_colegio_recibe_sus_eventos():
+    async def escenario():
+        broadcaster = Broadcaster(tamano_cola=10)
+        canal = canal_curso_periodo(1)
+        with en_colegio("norte"):
+            suscripcion = broadcaster.suscribir([canal])
+            assert broadcaster.estado() == {canal: 1}
+            broadcaster.difundir(canal, "nota", {"valor": 80})
+        with en_colegio("sur"):
+            broadcaster.difundir(canal, "nota", {"valor": 10})
+            assert broadcaster.estado() == {}
+        await asyncio.sleep(0)  # entregar() usa call_soon_threadsafe
+        mensajes = _recibidos(suscripcion)
+        assert len(mensajes) == 1 and '"valor": 80' in mensajes[0]
+
+        broadcaster.cancelar(suscripcion)
+        with en_colegio("norte"):
+            assert broadcaster.estado() == {}
+
+    asyncio.run(escenario())
+
+
+def test_suscripcion_sin_colegio_usa_el_canal_tal_cual():
+    async def escenario():
+        broadcaster = Broadcaster(tamano_cola=10)
+        suscripcion = broadcaster.suscribir(["escuela"])
+        broadcaster.difundir("escuela", "boletin", {"id": 1})
+        await asyncio.sleep(0)
+        assert len(_recibidos(suscripcion)) == 1
+        broadcaster.cancelar(suscripcion)
+        assert broadcaster.estado() == {}
+
+    asyncio.run(escenario())